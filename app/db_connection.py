@@ -1,18 +1,152 @@
 import os
+from functools import partial
 
+from fastapi import Depends, Request
 from sqlalchemy import create_engine
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
 from sqlalchemy.orm import declarative_base, sessionmaker
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+
+from app.utils import query_stats
+from app.utils.pool_stats import PoolStats, instrumented_pool_class
+from app.utils.replicas import ReplicaRouter, parse_replica_urls, wants_primary
 
 DEV_DATABASE_URL = os.getenv("DEV_DATABASE_URL")
-engine = create_engine(DEV_DATABASE_URL)
+DEV_ASYNC_DATABASE_URL = os.getenv("DEV_ASYNC_DATABASE_URL")
+# comma separated, read-only routes spread over these when set
+DEV_DATABASE_REPLICA_URLS = os.getenv("DEV_DATABASE_REPLICA_URLS", "")
+
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "5"))
+DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", "10"))
+DB_POOL_TIMEOUT = float(os.getenv("DB_POOL_TIMEOUT", "30"))
+DB_POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE", "1800"))
+DB_POOL_PRE_PING = os.getenv("DB_POOL_PRE_PING", "true").lower() in ("1", "true", "yes")
+REPLICA_MAX_LAG = float(os.getenv("REPLICA_MAX_LAG", "5"))
+REPLICA_CHECK_INTERVAL = float(os.getenv("REPLICA_CHECK_INTERVAL", "5"))
+REPLICA_CONNECT_TIMEOUT = int(os.getenv("REPLICA_CONNECT_TIMEOUT", "2"))
+READ_YOUR_WRITES_WINDOW = float(os.getenv("READ_YOUR_WRITES_WINDOW", "5"))
+
+
+def get_async_database_url(url):
+    """Return ``url`` with its driver swapped for asyncpg."""
+    return make_url(url).set(drivername="postgresql+asyncpg")
+
+
+def get_pool_options():
+    return {
+        "pool_size": DB_POOL_SIZE,
+        "max_overflow": DB_MAX_OVERFLOW,
+        "pool_timeout": DB_POOL_TIMEOUT,
+        "pool_recycle": DB_POOL_RECYCLE,
+        "pool_pre_ping": DB_POOL_PRE_PING,
+    }
+
+
+engine_pool_stats = PoolStats()
+async_engine_pool_stats = PoolStats()
+
+engine = create_engine(
+    DEV_DATABASE_URL,
+    poolclass=instrumented_pool_class(QueuePool, engine_pool_stats),
+    **get_pool_options(),
+)
+async_engine = create_async_engine(
+    DEV_ASYNC_DATABASE_URL or get_async_database_url(DEV_DATABASE_URL),
+    poolclass=instrumented_pool_class(AsyncAdaptedQueuePool, async_engine_pool_stats),
+    **get_pool_options(),
+)
+engine_pool_stats.attach(engine)
+async_engine_pool_stats.attach(async_engine.sync_engine)
+query_stats.attach(engine)
+query_stats.attach(async_engine.sync_engine)
+
+replica_engines = {}
+replica_pool_stats = {}
+for name, url in parse_replica_urls(DEV_DATABASE_REPLICA_URLS).items():
+    replica_pool_stats[name] = PoolStats()
+    replica_engines[name] = create_engine(
+        url,
+        poolclass=instrumented_pool_class(QueuePool, replica_pool_stats[name]),
+        # a replica that went away should cost a request little
+        connect_args={"connect_timeout": REPLICA_CONNECT_TIMEOUT},
+        **get_pool_options(),
+    )
+    replica_pool_stats[name].attach(replica_engines[name])
+    query_stats.attach(replica_engines[name])
+
+replica_router = ReplicaRouter(
+    engine, replica_engines, REPLICA_MAX_LAG, REPLICA_CHECK_INTERVAL
+)
 
 SessionLocal = sessionmaker(autocommit=False, autoflush=True, bind=engine)
+AsyncSessionLocal = async_sessionmaker(
+    bind=async_engine, autoflush=True, expire_on_commit=False
+)
 Base = declarative_base()
 
 
 def get_db_session():
     db = SessionLocal()
     try:
-        return db
+        yield db
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        db.close()
+
+
+def get_db_session_factory():
+    """Session factory for responses that outlive the request dependencies.
+
+    Dependencies with ``yield`` are closed before a streamed body is sent, so
+    streaming routes open (and close) their own session from this factory.
+    """
+    return SessionLocal
+
+
+def get_read_db_session_factory(request: Request):
+    """Sessions for read-only routes, bound to a replica when one is usable.
+
+    A client that wrote within ``READ_YOUR_WRITES_WINDOW`` reads from the
+    primary, so it sees its own writes. ``db.info["replica"]`` names the
+    replica a session reads from.
+    """
+    if wants_primary(request.cookies):
+        return SessionLocal
+    bind, replica = replica_router.read_target()
+    if replica is None:
+        return SessionLocal
+    return partial(SessionLocal, bind=bind, info={"replica": replica})
+
+
+def get_read_db_session(session_factory=Depends(get_read_db_session_factory)):
+    db = session_factory()
+    try:
+        yield db
+    except Exception:
+        db.rollback()
+        raise
     finally:
         db.close()
+
+
+async def get_async_db_session():
+    async with AsyncSessionLocal() as db:
+        try:
+            yield db
+        except Exception:
+            await db.rollback()
+            raise
+
+
+def get_pool_statistics():
+    return {
+        "sync": engine_pool_stats.snapshot(engine.pool),
+        "async": async_engine_pool_stats.snapshot(async_engine.sync_engine.pool),
+        **{
+            name: replica_pool_stats[name].snapshot(replica.pool)
+            for name, replica in replica_engines.items()
+        },
+    }
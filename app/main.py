@@ -1,11 +1,85 @@
+import asyncio
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
+from fastapi.responses import JSONResponse, ORJSONResponse
 import logging
 import logging.config
-from app.routers import category_routes
+import os
+from app.db_connection import READ_YOUR_WRITES_WINDOW, SessionLocal, replica_router
+from app.routers import (
+    admin_routes,
+    category_routes,
+    category_async_routes,
+    metrics_routes,
+    product_routes,
+    search_routes,
+    stock_routes,
+)
+from app.utils.metrics import MetricsMiddleware
+from app.utils.logging_utils import parse_sampling, start_queued_logging
+from app.utils.query_stats import QueryStatsMiddleware
+from app.utils.replicas import ReadYourWritesMiddleware
+from app.utils.stock import RESERVATION_SWEEP_INTERVAL, sweep_expired_reservations
+
+LOG_QUEUE_ENABLED = os.getenv("LOG_QUEUE_ENABLED", "true").lower() in (
+    "1",
+    "true",
+    "yes",
+)
+LOG_SAMPLING = os.getenv("LOG_SAMPLING", "")
 
 logging.config.fileConfig("logging.conf", disable_existing_loggers=False)
+if LOG_QUEUE_ENABLED:
+    start_queued_logging(("", "app"), parse_sampling(LOG_SAMPLING))
 
 logger = logging.getLogger(__name__)
 
-app = FastAPI()
+ORJSON_RESPONSES = os.getenv("ORJSON_RESPONSES", "false").lower() in (
+    "1",
+    "true",
+    "yes",
+)
+# /api/admin shows pool, cache and replica topology without any access
+# control. Only enable it where the proxy keeps that path internal.
+ADMIN_ENDPOINTS_ENABLED = os.getenv("ADMIN_ENDPOINTS_ENABLED", "false").lower() in (
+    "1",
+    "true",
+    "yes",
+)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # every worker sweeps; the sweep skips reservations another one holds
+    sweeper = None
+    if RESERVATION_SWEEP_INTERVAL > 0:
+        sweeper = asyncio.create_task(
+            sweep_expired_reservations(SessionLocal, RESERVATION_SWEEP_INTERVAL)
+        )
+    try:
+        yield
+    finally:
+        if sweeper is not None:
+            sweeper.cancel()
+
+
+app = FastAPI(
+    default_response_class=ORJSONResponse if ORJSON_RESPONSES else JSONResponse,
+    lifespan=lifespan,
+)
+app.add_middleware(QueryStatsMiddleware)
+app.add_middleware(MetricsMiddleware)
+if replica_router.replicas:
+    app.add_middleware(ReadYourWritesMiddleware, window=READ_YOUR_WRITES_WINDOW)
 app.include_router(category_routes.router, prefix="/api/category", tags=["Category"])
+app.include_router(
+    category_async_routes.router,
+    prefix="/api/async/category",
+    tags=["Category (async)"],
+)
+app.include_router(product_routes.router, prefix="/api/product", tags=["Product"])
+app.include_router(search_routes.router, prefix="/api/search", tags=["Search"])
+app.include_router(stock_routes.router, prefix="/api/stock", tags=["Stock"])
+if ADMIN_ENDPOINTS_ENABLED:
+    app.include_router(admin_routes.router, prefix="/api/admin", tags=["Admin"])
+app.include_router(metrics_routes.router)
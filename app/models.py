@@ -2,6 +2,7 @@ from .db_connection import Base
 from sqlalchemy import (
     Column,
     Integer,
+    BigInteger,
     String,
     Boolean,
     Text,
@@ -9,11 +10,14 @@ from sqlalchemy import (
     Enum,
     ForeignKey,
     CheckConstraint,
+    Computed,
+    Index,
     UniqueConstraint,
     DECIMAL,
     Float,
 )
-from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.dialects.postgresql import TSRANGE, TSVECTOR, UUID
+from sqlalchemy.orm import deferred, relationship
 import sqlalchemy
 
 
@@ -26,12 +30,29 @@ class Category(Base):
     is_active = Column(Boolean, nullable=False, default=False, server_default="False")
     level = Column(Integer, nullable=False, default="100", server_default="100")
     parent_id = Column(Integer, ForeignKey("category.id"), nullable=True)
+    # only read by search, so not loaded with the rest of the row
+    search_vector = deferred(
+        Column(
+            TSVECTOR,
+            Computed("to_tsvector('english', name)", persisted=True),
+        )
+    )
 
     __table_args__ = (
         CheckConstraint("LENGTH(name) > 0", name="category_name_length_check"),
         CheckConstraint("LENGTH(slug) > 0", name="category_slug_length_check"),
         UniqueConstraint("name", "level", name="uq_category_name_level"),
         UniqueConstraint("slug", name="uq_category_slug"),
+        Index("ix_category_parent_id", "parent_id"),
+        Index("ix_category_is_active_id", "is_active", "id"),
+        Index("ix_category_level_name", "level", "name"),
+        Index("ix_category_search_vector", "search_vector", postgresql_using="gin"),
+        Index(
+            "ix_category_name_trgm",
+            "name",
+            postgresql_using="gin",
+            postgresql_ops={"name": "gin_trgm_ops"},
+        ),
     )
 
 
@@ -65,6 +86,21 @@ class Product(Base):
     )
     category_id = Column(Integer, ForeignKey("category.id"), nullable=False)
     seasonal_event = Column(Integer, ForeignKey("seasonal_event.id"), nullable=True)
+    search_vector = deferred(
+        Column(
+            TSVECTOR,
+            Computed(
+                "setweight(to_tsvector('english', name), 'A') || "
+                "setweight(to_tsvector('english', coalesce(description, '')), 'B')",
+                persisted=True,
+            ),
+        )
+    )
+
+    category = relationship("Category")
+    product_lines = relationship(
+        "ProductLine", back_populates="product", order_by="ProductLine.order"
+    )
 
     __table_args__ = (
         CheckConstraint("LENGTH(name) > 0", name="product_name_length_check"),
@@ -72,6 +108,20 @@ class Product(Base):
         UniqueConstraint("name", name="uq_product_name"),
         UniqueConstraint("slug", name="uq_product_slug"),
         UniqueConstraint("pid", name="uq_product_pid"),
+        Index("ix_product_category_id", "category_id", "id"),
+        Index(
+            "ix_product_seasonal_event",
+            "seasonal_event",
+            "id",
+            postgresql_where=sqlalchemy.text("seasonal_event IS NOT NULL"),
+        ),
+        Index("ix_product_search_vector", "search_vector", postgresql_using="gin"),
+        Index(
+            "ix_product_name_trgm",
+            "name",
+            postgresql_using="gin",
+            postgresql_ops={"name": "gin_trgm_ops"},
+        ),
     )
 
 
@@ -94,6 +144,17 @@ class ProductLine(Base):
     )
     product_id = Column(Integer, ForeignKey("product.id"), nullable=False)
 
+    product = relationship("Product", back_populates="product_lines")
+    product_images = relationship(
+        "ProductImage", back_populates="product_line", order_by="ProductImage.order"
+    )
+    attribute_values = relationship(
+        "AttributeValue",
+        secondary="product_attribute_value",
+        order_by="AttributeValue.id",
+        viewonly=True,
+    )
+
     __table_args__ = (
         CheckConstraint(
             "price >= 0 AND price <= 999.99", name="product_line_max_value"
@@ -104,7 +165,9 @@ class ProductLine(Base):
         UniqueConstraint(
             "order", "product_id", name="uq_product_line_order_product_id"
         ),
+        CheckConstraint("stock_qty >= 0", name="product_line_stock_qty_check"),
         UniqueConstraint("sku", name="uq_product_line_sku"),
+        Index("ix_product_line_product_id", "product_id"),
     )
 
 
@@ -117,6 +180,8 @@ class ProductImage(Base):
     order = Column(Integer, nullable=False)
     product_line_id = Column(Integer, ForeignKey("product_line.id"), nullable=False)
 
+    product_line = relationship("ProductLine", back_populates="product_images")
+
     __table_args__ = (
         CheckConstraint(
             '"order" >= 1 AND "order" <= 20', name="product_image_order_range"
@@ -126,6 +191,7 @@ class ProductImage(Base):
         ),
         CheckConstraint("LENGTH(url) > 0", name="product_image_url_length"),
         UniqueConstraint("alternative_text", name="uq_product_image_alt"),
+        Index("ix_product_image_product_line_id", "product_line_id"),
     )
 
 
@@ -136,10 +202,20 @@ class Seasonal(Base):
     start_date = Column(DateTime, nullable=False)
     end_date = Column(DateTime, nullable=False)
     name = Column(String(100), nullable=False)
+    # the event runs from start_date up to, not including, end_date
+    active_during = Column(
+        TSRANGE,
+        Computed("tsrange(start_date, end_date, '[)')", persisted=True),
+    )
 
     __table_args__ = (
         CheckConstraint("LENGTH(name) > 0", name="seasonal_event_name_length"),
         UniqueConstraint("name", name="uq_seasonal_event_name"),
+        Index(
+            "ix_seasonal_event_active_during",
+            "active_during",
+            postgresql_using="gist",
+        ),
     )
 
 
@@ -177,6 +253,8 @@ class AttributeValue(Base):
     attribute_value = Column(String(100), nullable=False)
     attribute_id = Column(Integer, ForeignKey("attribute.id"), nullable=False)
 
+    attribute = relationship("Attribute")
+
     __table_args__ = (
         CheckConstraint(
             "LENGTH(attribute_value) > 0", name="attribute_value_name_length_check"
@@ -196,6 +274,7 @@ class ProductAttributeValue(Base):
 
     __table_args__ = (
         UniqueConstraint("attribute_value_id", name="uq_product_attribute_value"),
+        Index("ix_product_attribute_value_product_line_id", "product_line_id"),
     )
 
 
@@ -211,3 +290,63 @@ class ProductProductType(Base):
             "product_type_id", "product_id", name="uq_product_id_product_type_id"
         ),
     )
+
+
+class CatalogVersion(Base):
+    __tablename__ = "catalog_version"
+
+    name = Column(String(50), primary_key=True, nullable=False)
+    version = Column(BigInteger, nullable=False, default=0, server_default="0")
+    updated_at = Column(
+        DateTime(timezone=True),
+        nullable=False,
+        server_default=sqlalchemy.text("CURRENT_TIMESTAMP"),
+    )
+
+
+class StockReservation(Base):
+    __tablename__ = "stock_reservation"
+
+    id = Column(
+        UUID(as_uuid=True),
+        primary_key=True,
+        nullable=False,
+        server_default=sqlalchemy.text("uuid_generate_v4()"),
+    )
+    status = Column(
+        Enum(
+            "held", "committed", "released", "expired", name="reservation_status_enum"
+        ),
+        nullable=False,
+        server_default="held",
+    )
+    created_at = Column(
+        DateTime(timezone=True),
+        nullable=False,
+        server_default=sqlalchemy.text("CURRENT_TIMESTAMP"),
+    )
+    expires_at = Column(DateTime(timezone=True), nullable=False)
+    closed_at = Column(DateTime(timezone=True), nullable=True)
+
+    __table_args__ = (
+        # what the expiry sweep scans
+        Index(
+            "ix_stock_reservation_held_expires_at",
+            "expires_at",
+            postgresql_where=sqlalchemy.text("status = 'held'"),
+        ),
+    )
+
+
+class StockReservationLine(Base):
+    __tablename__ = "stock_reservation_line"
+
+    reservation_id = Column(
+        UUID(as_uuid=True), ForeignKey("stock_reservation.id"), primary_key=True
+    )
+    product_line_id = Column(Integer, ForeignKey("product_line.id"), primary_key=True)
+    quantity = Column(Integer, nullable=False)
+
+    __table_args__ = (
+        CheckConstraint("quantity > 0", name="stock_reservation_line_quantity_check"),
+    )
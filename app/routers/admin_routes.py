@@ -0,0 +1,28 @@
+from fastapi import APIRouter
+from app.db_connection import get_pool_statistics, replica_router
+from app.schemas.admin_schema import (
+    CacheStatsReturn,
+    PoolStatsReturn,
+    ReplicaStatusReturn,
+)
+from app.utils.category_cache import category_cache
+from typing import Dict
+
+
+router = APIRouter()
+
+
+@router.get("/pool", response_model=Dict[str, PoolStatsReturn])
+def get_pool_stats():
+    return get_pool_statistics()
+
+
+@router.get("/cache", response_model=Dict[str, CacheStatsReturn])
+def get_cache_stats():
+    return {"category": category_cache.stats()}
+
+
+@router.get("/replicas", response_model=Dict[str, ReplicaStatusReturn])
+def get_replica_status():
+    replica_router.refresh()
+    return replica_router.status()
@@ -0,0 +1,180 @@
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
+from app.schemas.category_schema import (
+    CategoryReturn,
+    CategoryDeleteReturn,
+    CategoryCreate,
+    CategoryUpdate,
+)
+from app.db_connection import get_async_db_session
+from app.models import Category
+from sqlalchemy import select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.routers.category_routes import (
+    CATEGORY_PAGE_DEFAULT_LIMIT,
+    CATEGORY_PAGE_MAX_LIMIT,
+)
+from app.utils.category_utils import (
+    CATEGORY_ORDERINGS,
+    CATEGORY_RETURN_COLUMNS,
+    filter_categories,
+    raise_for_category_integrity_error,
+)
+from app.utils.category_tree_cache import category_tree_cache
+from app.utils.category_cache import invalidate_category
+from app.utils.pagination import apply_keyset, decode_cursor, encode_cursor
+import logging
+from typing import List, Literal, Optional
+
+
+router = APIRouter()
+logger = logging.getLogger("app")
+
+
+@router.post("/", response_model=CategoryReturn, status_code=201)
+async def create_category(
+    category_data: CategoryCreate, db: AsyncSession = Depends(get_async_db_session)
+):
+    try:
+        new_category = Category(**category_data.model_dump())
+        db.add(new_category)
+        await db.commit()
+        await db.refresh(new_category)
+        category_tree_cache.invalidate()
+        invalidate_category(new_category.id, new_category.slug)
+
+        return new_category
+
+    except IntegrityError as e:
+        await db.rollback()
+        raise_for_category_integrity_error(e)
+        logger.error(f"Unexpected error while creating category: {e}")
+        raise HTTPException(status_code=500, detail="Internal server error")
+    except HTTPException as http_exc:
+        logger.error(f"Error while creating category: {http_exc}")
+        raise
+    except Exception as e:
+        await db.rollback()
+        logger.error(f"Unexpected error while creating category: {e}")
+        raise HTTPException(status_code=500, detail="Internal server error")
+
+
+# get
+@router.get("/", response_model=List[CategoryReturn])
+async def get_categories(
+    response: Response,
+    limit: int = Query(CATEGORY_PAGE_DEFAULT_LIMIT, ge=1, le=CATEGORY_PAGE_MAX_LIMIT),
+    cursor: Optional[str] = None,
+    order_by: Literal["id", "level_name"] = "id",
+    is_active: Optional[bool] = None,
+    level: Optional[int] = None,
+    parent_id: Optional[int] = None,
+    db: AsyncSession = Depends(get_async_db_session),
+):
+    try:
+        columns = CATEGORY_ORDERINGS[order_by]
+        cursor_values = decode_cursor(cursor, order_by, columns) if cursor else None
+
+        query = filter_categories(
+            select(*CATEGORY_RETURN_COLUMNS), is_active, level, parent_id
+        )
+        result = await db.execute(
+            apply_keyset(query, columns, cursor_values).limit(limit + 1)
+        )
+        categories = result.all()
+
+        if len(categories) > limit:
+            categories = categories[:limit]
+            last = categories[-1]
+            response.headers["X-Next-Cursor"] = encode_cursor(
+                order_by, [getattr(last, column.key) for column in columns]
+            )
+        return categories
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Unexpected error while retrieving categories: {e}")
+        raise HTTPException(status_code=500, detail="Internal server error")
+
+
+@router.get("/slug/{category_slug}", response_model=CategoryReturn)
+async def get_category_by_slug(
+    category_slug: str, db: AsyncSession = Depends(get_async_db_session)
+):
+    try:
+        result = await db.execute(
+            select(*CATEGORY_RETURN_COLUMNS)
+            .filter(Category.slug == category_slug)
+            .limit(1)
+        )
+        category = result.first()
+
+        if not category:
+            raise HTTPException(status_code=404, detail="Category does not exist")
+
+        return category
+
+    except HTTPException:
+        raise
+
+    except Exception as e:
+        logger.error(f"Unexpected error while retrieving categories: {e}")
+        raise HTTPException(status_code=500, detail="Internal server error")
+
+
+@router.put("/{category_id}", response_model=CategoryReturn, status_code=201)
+async def update_category(
+    category_id: int,
+    category_data: CategoryUpdate,
+    db: AsyncSession = Depends(get_async_db_session),
+):
+    try:
+        category = await db.get(Category, category_id)
+
+        if not category:
+            raise HTTPException(status_code=404, detail="Category not found")
+        previous_slug = category.slug
+        for key, value in category_data.model_dump().items():
+            setattr(category, key, value)
+
+        await db.commit()
+        await db.refresh(category)
+        category_tree_cache.invalidate()
+        invalidate_category(category_id, previous_slug, category.slug)
+        return category
+    except IntegrityError as e:
+        await db.rollback()
+        raise_for_category_integrity_error(e)
+        logger.error(f"Unexpected error while updating category: {e}")
+        raise HTTPException(status_code=500, detail="Internal server error")
+    except HTTPException:
+        raise
+    except Exception as e:
+        await db.rollback()
+        logger.error(f"Unexpected error while updating category: {e}")
+        raise HTTPException(status_code=500, detail="Internal server error")
+
+
+@router.delete("/{category_id}", response_model=CategoryDeleteReturn)
+async def delete_category(
+    category_id: int, db: AsyncSession = Depends(get_async_db_session)
+):
+    try:
+        category = await db.get(Category, category_id)
+
+        if not category:
+            raise HTTPException(status_code=404, detail="Category not found")
+
+        await db.delete(category)
+        await db.commit()
+        category_tree_cache.invalidate()
+        invalidate_category(category_id, category.slug)
+
+        return category
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        await db.rollback()
+        logger.error(f"Unexpected error while deleting category: {e}")
+        raise HTTPException(status_code=500, detail="Internal server error")
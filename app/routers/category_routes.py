@@ -1,36 +1,116 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from fastapi.responses import StreamingResponse
 from app.schemas.category_schema import (
     CategoryReturn,
     CategoryDeleteReturn,
     CategoryCreate,
     CategoryUpdate,
+    CategoryBulkCreate,
+    CategoryBulkReturn,
+    CategoryTreeNode,
+    CategoryWithDepth,
+    category_rows_adapter,
+)
+from app.db_connection import (
+    get_db_session,
+    get_read_db_session,
+    get_read_db_session_factory,
 )
-from app.db_connection import get_db_session, SessionLocal
 from app.models import Category
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
-from app.utils.category_utils import check_existing_category
+from app.utils.category_utils import (
+    CATEGORY_ORDERINGS,
+    CATEGORY_RETURN_COLUMNS,
+    filter_categories,
+    find_conflicting_categories,
+    plan_bulk_categories,
+    raise_for_category_integrity_error,
+    stream_categories,
+    write_category_chunk,
+)
+from app.utils.category_tree import (
+    ancestor_rows,
+    build_tree,
+    category_id_for_slug,
+    descendant_rows,
+)
+from app.utils.category_tree_cache import category_to_node, category_tree_cache
+from app.utils.category_cache import (
+    get_cached_category_by_id,
+    get_cached_category_by_slug,
+    invalidate_category,
+)
+from app.utils.catalog_version import category_version
+from app.utils.http_cache import (
+    content_etag,
+    is_not_modified,
+    validator_headers,
+    version_etag,
+)
+from app.utils.pagination import apply_keyset, decode_cursor, encode_cursor
 import logging
-from typing import List
+import os
+from typing import List, Literal, Optional
 
 
 router = APIRouter()
-db = SessionLocal()
 logger = logging.getLogger("app")
 
+CATEGORY_PAGE_DEFAULT_LIMIT = int(os.getenv("CATEGORY_PAGE_DEFAULT_LIMIT", "100"))
+CATEGORY_PAGE_MAX_LIMIT = int(os.getenv("CATEGORY_PAGE_MAX_LIMIT", "500"))
+CATEGORY_TREE_DEFAULT_DEPTH = int(os.getenv("CATEGORY_TREE_DEFAULT_DEPTH", "5"))
+CATEGORY_TREE_MAX_DEPTH = int(os.getenv("CATEGORY_TREE_MAX_DEPTH", "20"))
+CATEGORY_TREE_CACHE_ENABLED = os.getenv(
+    "CATEGORY_TREE_CACHE_ENABLED", "true"
+).lower() in ("1", "true", "yes")
+CATEGORY_FAST_SERIALIZATION = os.getenv(
+    "CATEGORY_FAST_SERIALIZATION", "false"
+).lower() in ("1", "true", "yes")
+CATEGORY_CACHE_CONTROL = os.getenv("CATEGORY_CACHE_CONTROL", "no-cache")
+CATEGORY_BULK_CHUNK_SIZE = int(os.getenv("CATEGORY_BULK_CHUNK_SIZE", "500"))
+CATEGORY_EXPORT_BATCH_SIZE = int(os.getenv("CATEGORY_EXPORT_BATCH_SIZE", "1000"))
+
+EXPORT_MEDIA_TYPES = {
+    "ndjson": "application/x-ndjson",
+    "json": "application/json",
+}
+
+
+def get_tree_cache():
+    return category_tree_cache if CATEGORY_TREE_CACHE_ENABLED else None
+
+
+def patch_tree_cache(db: Session, category=None, deleted_id=None):
+    # The write is already committed, so failing to patch the cache must not
+    # fail the request: drop the cache and let the next read reload it.
+    try:
+        upserted = category_to_node(category) if category is not None else None
+        category_tree_cache.apply_write(db, upserted=upserted, deleted_id=deleted_id)
+    except Exception as e:
+        logger.error(f"Error while updating category tree cache: {e}")
+        category_tree_cache.invalidate()
+
 
 @router.post("/", response_model=CategoryReturn, status_code=201)
 def create_category(
     category_data: CategoryCreate, db: Session = Depends(get_db_session)
 ):
     try:
-        check_existing_category(db, category_data)
         new_category = Category(**category_data.model_dump())
         db.add(new_category)
         db.commit()
         db.refresh(new_category)
+        patch_tree_cache(db, category=new_category)
+        invalidate_category(new_category.id, new_category.slug)
 
         return new_category
 
+    except IntegrityError as e:
+        db.rollback()
+        raise_for_category_integrity_error(e)
+        logger.error(f"Unexpected error while creating category: {e}")
+        raise HTTPException(status_code=500, detail="Internal server error")
     except HTTPException as http_exc:
         logger.error(f"Error while retrieving category bu slug: {http_exc}")
         raise
@@ -40,25 +120,129 @@ def create_category(
         raise HTTPException(status_code=500, detail="Internal server error")
 
 
+@router.post("/bulk", response_model=CategoryBulkReturn)
+def bulk_create_categories(
+    bulk_data: CategoryBulkCreate, db: Session = Depends(get_db_session)
+):
+    try:
+        items = bulk_data.items
+        existing = find_conflicting_categories(db, items)
+        writes, conflicts = plan_bulk_categories(items, existing, bulk_data.on_conflict)
+
+        results = list(conflicts.values())
+        for start in range(0, len(writes), CATEGORY_BULK_CHUNK_SIZE):
+            chunk = writes[start : start + CATEGORY_BULK_CHUNK_SIZE]
+            results.extend(write_category_chunk(db, chunk, bulk_data.on_conflict))
+        db.commit()
+        category_tree_cache.invalidate()
+        for result in results:
+            invalidate_category(result.get("id"), result["slug"])
+
+        results.sort(key=lambda result: result["index"])
+        statuses = [result["status"] for result in results]
+        return {
+            "created": statuses.count("created"),
+            "updated": statuses.count("updated"),
+            "failed": statuses.count("conflict") + statuses.count("error"),
+            "results": results,
+        }
+
+    except Exception as e:
+        db.rollback()
+        logger.error(f"Unexpected error while bulk creating categories: {e}")
+        raise HTTPException(status_code=500, detail="Internal server error")
+
+
 # get
 @router.get("/", response_model=List[CategoryReturn])
-def get_categories(db: Session = Depends(get_db_session)):
+def get_categories(
+    request: Request,
+    response: Response,
+    limit: int = Query(CATEGORY_PAGE_DEFAULT_LIMIT, ge=1, le=CATEGORY_PAGE_MAX_LIMIT),
+    cursor: Optional[str] = None,
+    order_by: Literal["id", "level_name"] = "id",
+    is_active: Optional[bool] = None,
+    level: Optional[int] = None,
+    parent_id: Optional[int] = None,
+    db: Session = Depends(get_read_db_session),
+):
     try:
-        categories = db.query(Category).all()
+        state = category_version.state(db)
+        headers = validator_headers(
+            version_etag("category", state.version),
+            CATEGORY_CACHE_CONTROL,
+            state.updated_at,
+        )
+        if is_not_modified(request, headers["ETag"], state.updated_at):
+            return Response(status_code=304, headers=headers)
+        response.headers.update(headers)
+
+        columns = CATEGORY_ORDERINGS[order_by]
+        cursor_values = decode_cursor(cursor, order_by, columns) if cursor else None
+
+        query = filter_categories(
+            db.query(*CATEGORY_RETURN_COLUMNS), is_active, level, parent_id
+        )
+        categories = apply_keyset(query, columns, cursor_values).limit(limit + 1).all()
+
+        if len(categories) > limit:
+            categories = categories[:limit]
+            last = categories[-1]
+            response.headers["X-Next-Cursor"] = encode_cursor(
+                order_by, [getattr(last, column.key) for column in columns]
+            )
+        if CATEGORY_FAST_SERIALIZATION:
+            # Skip per-row model validation: the rows already have the
+            # response shape, so they go straight to JSON bytes.
+            return Response(
+                content=category_rows_adapter.dump_json(
+                    [row._asdict() for row in categories]
+                ),
+                media_type="application/json",
+                headers={
+                    key: value
+                    for key, value in response.headers.items()
+                    if key != "content-length"
+                },
+            )
         return categories
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Unexpected error while retriving categories: {e}")
         raise HTTPException(status_code=500, detail="Internal server error")
 
 
+@router.get("/export")
+def export_categories(
+    export_format: Literal["ndjson", "json"] = Query("ndjson", alias="format"),
+    session_factory=Depends(get_read_db_session_factory),
+):
+    return StreamingResponse(
+        stream_categories(session_factory, export_format, CATEGORY_EXPORT_BATCH_SIZE),
+        media_type=EXPORT_MEDIA_TYPES[export_format],
+    )
+
+
 @router.get("/slug/{category_slug}", response_model=CategoryReturn)
-def get_category_by_slug(category_slug: str, db: Session = Depends(get_db_session)):
+def get_category_by_slug(
+    category_slug: str,
+    request: Request,
+    response: Response,
+    db: Session = Depends(get_db_session),
+):
     try:
-        category = db.query(Category).filter(Category.slug == category_slug).first()
+        category = get_cached_category_by_slug(db, category_slug)
 
         if not category:
             raise HTTPException(status_code=404, detail="Category does not exist")
 
+        # the lookup may come from the slug cache, so tag the content itself
+        headers = validator_headers(content_etag(category), CATEGORY_CACHE_CONTROL)
+        if is_not_modified(request, headers["ETag"]):
+            return Response(status_code=304, headers=headers)
+        response.headers.update(headers)
+
         return category
 
     except HTTPException:
@@ -69,6 +253,115 @@ def get_category_by_slug(category_slug: str, db: Session = Depends(get_db_sessio
         raise HTTPException(status_code=500, detail="Internal server error")
 
 
+@router.get("/{category_id}/tree", response_model=CategoryTreeNode)
+def get_category_tree(
+    category_id: int,
+    max_depth: int = Query(
+        CATEGORY_TREE_DEFAULT_DEPTH, ge=1, le=CATEGORY_TREE_MAX_DEPTH
+    ),
+    db: Session = Depends(get_db_session),
+):
+    try:
+        rows = descendant_rows(db, category_id, max_depth, get_tree_cache())
+        tree = build_tree(rows)
+
+        if tree is None:
+            raise HTTPException(status_code=404, detail="Category not found")
+
+        return tree
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Unexpected error while retrieving category tree: {e}")
+        raise HTTPException(status_code=500, detail="Internal server error")
+
+
+@router.get("/slug/{category_slug}/tree", response_model=CategoryTreeNode)
+def get_category_tree_by_slug(
+    category_slug: str,
+    max_depth: int = Query(
+        CATEGORY_TREE_DEFAULT_DEPTH, ge=1, le=CATEGORY_TREE_MAX_DEPTH
+    ),
+    db: Session = Depends(get_db_session),
+):
+    try:
+        cache = get_tree_cache()
+        category_id = category_id_for_slug(db, category_slug, cache)
+
+        if category_id is None:
+            raise HTTPException(status_code=404, detail="Category does not exist")
+
+        return build_tree(descendant_rows(db, category_id, max_depth, cache))
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Unexpected error while retrieving category tree: {e}")
+        raise HTTPException(status_code=500, detail="Internal server error")
+
+
+@router.get("/{category_id}/descendants", response_model=List[CategoryWithDepth])
+def get_category_descendants(
+    category_id: int,
+    max_depth: int = Query(
+        CATEGORY_TREE_DEFAULT_DEPTH, ge=1, le=CATEGORY_TREE_MAX_DEPTH
+    ),
+    db: Session = Depends(get_db_session),
+):
+    try:
+        rows = descendant_rows(db, category_id, max_depth, get_tree_cache())
+
+        if not rows:
+            raise HTTPException(status_code=404, detail="Category not found")
+
+        return [row for row in rows if row["depth"] > 0]
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Unexpected error while retrieving category descendants: {e}")
+        raise HTTPException(status_code=500, detail="Internal server error")
+
+
+@router.get("/{category_id}/ancestors", response_model=List[CategoryWithDepth])
+def get_category_ancestors(
+    category_id: int,
+    max_depth: int = Query(CATEGORY_TREE_MAX_DEPTH, ge=1, le=CATEGORY_TREE_MAX_DEPTH),
+    db: Session = Depends(get_db_session),
+):
+    try:
+        rows = ancestor_rows(db, category_id, max_depth, get_tree_cache())
+
+        if not rows:
+            raise HTTPException(status_code=404, detail="Category not found")
+
+        return [row for row in rows if row["depth"] > 0]
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Unexpected error while retrieving category ancestors: {e}")
+        raise HTTPException(status_code=500, detail="Internal server error")
+
+
+@router.get("/{category_id}", response_model=CategoryReturn)
+def get_category(category_id: int, db: Session = Depends(get_db_session)):
+    try:
+        category = get_cached_category_by_id(db, category_id)
+
+        if not category:
+            raise HTTPException(status_code=404, detail="Category not found")
+
+        return category
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Unexpected error while retrieving category: {e}")
+        raise HTTPException(status_code=500, detail="Internal server error")
+
+
 @router.put("/{category_id}", response_model=CategoryReturn, status_code=201)
 def updateCategory(
     category_id: int,
@@ -80,12 +373,20 @@ def updateCategory(
 
         if not category:
             raise HTTPException(status_code=404, detail="Category not found")
+        previous_slug = category.slug
         for key, value in category_data.model_dump().items():
             setattr(category, key, value)
 
         db.commit()
         db.refresh(category)
+        patch_tree_cache(db, category=category)
+        invalidate_category(category_id, previous_slug, category.slug)
         return category
+    except IntegrityError as e:
+        db.rollback()
+        raise_for_category_integrity_error(e)
+        logger.error(f"Unexpected error while updating category: {e}")
+        raise HTTPException(status_code=500, detail="Internal server error")
     except HTTPException as http_exc:
         raise
     except Exception as e:
@@ -103,6 +404,8 @@ def delete_category(category_id: int, db: Session = Depends(get_db_session)):
 
         db.delete(category)
         db.commit()
+        patch_tree_cache(db, deleted_id=category_id)
+        invalidate_category(category_id, category.slug)
 
         return category
 
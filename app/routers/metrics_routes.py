@@ -0,0 +1,13 @@
+from fastapi import APIRouter
+from fastapi.responses import PlainTextResponse
+from app.utils.metrics import CONTENT_TYPE, current_metrics, render_metrics
+
+
+router = APIRouter()
+
+
+# async so it runs on the event loop thread, next to the middleware that
+# updates the counters
+@router.get("/metrics", response_class=PlainTextResponse, include_in_schema=False)
+async def get_metrics():
+    return PlainTextResponse(render_metrics(current_metrics()), media_type=CONTENT_TYPE)
@@ -0,0 +1,99 @@
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
+from app.schemas.product_schema import ProductReturn
+from app.db_connection import get_db_session
+from app.models import Product
+from sqlalchemy.orm import Session
+from app.utils.pagination import apply_keyset, decode_cursor, encode_cursor
+from app.utils.product_utils import product_detail_query
+from app.utils.seasonal_events import active_event_cache
+import logging
+import os
+from typing import List, Optional
+
+
+router = APIRouter()
+logger = logging.getLogger("app")
+
+PRODUCT_PAGE_DEFAULT_LIMIT = int(os.getenv("PRODUCT_PAGE_DEFAULT_LIMIT", "50"))
+PRODUCT_PAGE_MAX_LIMIT = int(os.getenv("PRODUCT_PAGE_MAX_LIMIT", "200"))
+
+PRODUCT_ORDERING = (Product.id,)
+
+
+def paginate_products(query, response: Response, limit: int, cursor_values):
+    products = (
+        apply_keyset(query, PRODUCT_ORDERING, cursor_values).limit(limit + 1).all()
+    )
+    if len(products) > limit:
+        products = products[:limit]
+        response.headers["X-Next-Cursor"] = encode_cursor("id", [products[-1].id])
+    return products
+
+
+@router.get("/category/{category_id}", response_model=List[ProductReturn])
+def get_products_by_category(
+    category_id: int,
+    response: Response,
+    limit: int = Query(PRODUCT_PAGE_DEFAULT_LIMIT, ge=1, le=PRODUCT_PAGE_MAX_LIMIT),
+    cursor: Optional[str] = None,
+    is_active: Optional[bool] = None,
+    db: Session = Depends(get_db_session),
+):
+    try:
+        cursor_values = (
+            decode_cursor(cursor, "id", PRODUCT_ORDERING) if cursor else None
+        )
+
+        query = product_detail_query(db).filter(Product.category_id == category_id)
+        if is_active is not None:
+            query = query.filter(Product.is_active == is_active)
+        return paginate_products(query, response, limit, cursor_values)
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Unexpected error while retriving products: {e}")
+        raise HTTPException(status_code=500, detail="Internal server error")
+
+
+@router.get("/seasonal/active", response_model=List[ProductReturn])
+def get_products_in_active_events(
+    response: Response,
+    limit: int = Query(PRODUCT_PAGE_DEFAULT_LIMIT, ge=1, le=PRODUCT_PAGE_MAX_LIMIT),
+    cursor: Optional[str] = None,
+    is_active: Optional[bool] = None,
+    db: Session = Depends(get_db_session),
+):
+    try:
+        cursor_values = (
+            decode_cursor(cursor, "id", PRODUCT_ORDERING) if cursor else None
+        )
+
+        event_ids = active_event_cache.get(db)
+        if not event_ids:
+            return []
+
+        query = product_detail_query(db).filter(Product.seasonal_event.in_(event_ids))
+        if is_active is not None:
+            query = query.filter(Product.is_active == is_active)
+        return paginate_products(query, response, limit, cursor_values)
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Unexpected error while retriving seasonal products: {e}")
+        raise HTTPException(status_code=500, detail="Internal server error")
+
+
+@router.get("/{product_slug}", response_model=ProductReturn)
+def get_product_by_slug(product_slug: str, db: Session = Depends(get_db_session)):
+    try:
+        product = product_detail_query(db).filter(Product.slug == product_slug).first()
+
+        if not product:
+            raise HTTPException(status_code=404, detail="Product does not exist")
+
+        return product
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Unexpected error while retriving product: {e}")
+        raise HTTPException(status_code=500, detail="Internal server error")
@@ -0,0 +1,55 @@
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
+from app.schemas.search_schema import SearchResult
+from app.db_connection import get_read_db_session
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+from app.utils.pagination import apply_keyset, decode_cursor, encode_cursor
+from app.utils.search import search_ordering, search_results, set_similarity_threshold
+import logging
+import os
+from typing import List, Optional
+
+
+router = APIRouter()
+logger = logging.getLogger("app")
+
+SEARCH_PAGE_DEFAULT_LIMIT = int(os.getenv("SEARCH_PAGE_DEFAULT_LIMIT", "20"))
+SEARCH_PAGE_MAX_LIMIT = int(os.getenv("SEARCH_PAGE_MAX_LIMIT", "100"))
+SEARCH_QUERY_MAX_LENGTH = int(os.getenv("SEARCH_QUERY_MAX_LENGTH", "200"))
+
+
+@router.get("/", response_model=List[SearchResult])
+def search(
+    response: Response,
+    q: str = Query(..., min_length=1, max_length=SEARCH_QUERY_MAX_LENGTH),
+    limit: int = Query(SEARCH_PAGE_DEFAULT_LIMIT, ge=1, le=SEARCH_PAGE_MAX_LIMIT),
+    cursor: Optional[str] = None,
+    is_active: Optional[bool] = None,
+    db: Session = Depends(get_read_db_session),
+):
+    try:
+        q = q.strip()
+        if not q:
+            raise HTTPException(status_code=422, detail="Search query is empty")
+
+        results = search_results(q, is_active)
+        columns = search_ordering(results)
+        cursor_values = decode_cursor(cursor, "rank", columns) if cursor else None
+
+        set_similarity_threshold(db)
+        rows = db.execute(
+            apply_keyset(select(results), columns, cursor_values).limit(limit + 1)
+        ).all()
+
+        if len(rows) > limit:
+            rows = rows[:limit]
+            last = rows[-1]
+            response.headers["X-Next-Cursor"] = encode_cursor(
+                "rank", [-last.score, last.kind, last.id]
+            )
+        return rows
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Unexpected error while searching: {e}")
+        raise HTTPException(status_code=500, detail="Internal server error")
@@ -0,0 +1,80 @@
+from fastapi import APIRouter, Depends, HTTPException
+from app.schemas.stock_schema import ReservationCreate, ReservationReturn
+from app.db_connection import get_db_session
+from sqlalchemy.orm import Session
+from app.utils.stock import (
+    commit_reservation,
+    get_reservation,
+    release_reservation,
+    reserve_stock,
+)
+import logging
+import os
+from uuid import UUID
+
+
+router = APIRouter()
+logger = logging.getLogger("app")
+
+RESERVATION_TTL = int(os.getenv("RESERVATION_TTL", "600"))
+RESERVATION_MAX_TTL = int(os.getenv("RESERVATION_MAX_TTL", "3600"))
+
+
+@router.post("/reservations", response_model=ReservationReturn, status_code=201)
+def create_reservation(
+    reservation_data: ReservationCreate, db: Session = Depends(get_db_session)
+):
+    try:
+        lines = {}
+        for line in reservation_data.lines:
+            lines[line.sku] = lines.get(line.sku, 0) + line.quantity
+        ttl_seconds = min(
+            reservation_data.ttl_seconds or RESERVATION_TTL, RESERVATION_MAX_TTL
+        )
+
+        return reserve_stock(db, lines, ttl_seconds)
+    except HTTPException:
+        raise
+    except Exception as e:
+        db.rollback()
+        logger.error(f"Unexpected error while reserving stock: {e}")
+        raise HTTPException(status_code=500, detail="Internal server error")
+
+
+@router.get("/reservations/{reservation_id}", response_model=ReservationReturn)
+def get_stock_reservation(reservation_id: UUID, db: Session = Depends(get_db_session)):
+    try:
+        return get_reservation(db, reservation_id)
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Unexpected error while retrieving reservation: {e}")
+        raise HTTPException(status_code=500, detail="Internal server error")
+
+
+@router.post("/reservations/{reservation_id}/commit", response_model=ReservationReturn)
+def commit_stock_reservation(
+    reservation_id: UUID, db: Session = Depends(get_db_session)
+):
+    try:
+        return commit_reservation(db, reservation_id)
+    except HTTPException:
+        raise
+    except Exception as e:
+        db.rollback()
+        logger.error(f"Unexpected error while committing reservation: {e}")
+        raise HTTPException(status_code=500, detail="Internal server error")
+
+
+@router.post("/reservations/{reservation_id}/release", response_model=ReservationReturn)
+def release_stock_reservation(
+    reservation_id: UUID, db: Session = Depends(get_db_session)
+):
+    try:
+        return release_reservation(db, reservation_id)
+    except HTTPException:
+        raise
+    except Exception as e:
+        db.rollback()
+        logger.error(f"Unexpected error while releasing reservation: {e}")
+        raise HTTPException(status_code=500, detail="Internal server error")
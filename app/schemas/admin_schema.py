@@ -0,0 +1,37 @@
+from pydantic import BaseModel
+from typing import List, Optional
+
+
+class LatencyHistogramReturn(BaseModel):
+    buckets_ms: List[float]
+    counts: List[int]
+    count: int
+    sum_ms: float
+    max_ms: float
+
+
+class PoolStatsReturn(BaseModel):
+    pool_class: str
+    size: int
+    checked_in: int
+    checked_out: int
+    overflow: int
+    max_overflow: Optional[int] = None
+    timeout: float
+    checkout_timeouts: int
+    checkout_wait: LatencyHistogramReturn
+    connect_latency: LatencyHistogramReturn
+
+
+class CacheStatsReturn(BaseModel):
+    backend: str
+    hits: int
+    negative_hits: int
+    misses: int
+    hit_ratio: float
+
+
+class ReplicaStatusReturn(BaseModel):
+    healthy: Optional[bool] = None
+    lag_seconds: Optional[float] = None
+    error: Optional[str] = None
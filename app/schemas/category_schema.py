@@ -1,5 +1,8 @@
-from pydantic import BaseModel, StringConstraints
-from typing import Annotated, Optional
+from pydantic import BaseModel, Field, StringConstraints, TypeAdapter
+from typing import Annotated, List, Literal, Optional
+from typing_extensions import TypedDict
+
+CATEGORY_BULK_MAX_ITEMS = 5000
 
 
 class CategoryBase(BaseModel):
@@ -25,3 +28,47 @@ class CategoryDeleteReturn(BaseModel):
 
 class CategoryReturn(CategoryBase):
     id: int
+
+
+class CategoryBulkCreate(BaseModel):
+    items: Annotated[
+        List[CategoryCreate], Field(min_length=1, max_length=CATEGORY_BULK_MAX_ITEMS)
+    ]
+    on_conflict: Literal["skip", "update"] = "skip"
+
+
+class CategoryBulkItemResult(BaseModel):
+    index: int
+    slug: str
+    status: Literal["created", "updated", "conflict", "error"]
+    id: Optional[int] = None
+    detail: Optional[str] = None
+
+
+class CategoryBulkReturn(BaseModel):
+    created: int
+    updated: int
+    failed: int
+    results: List[CategoryBulkItemResult]
+
+
+class CategoryWithDepth(CategoryReturn):
+    depth: int
+
+
+class CategoryTreeNode(CategoryWithDepth):
+    children: List["CategoryTreeNode"] = []
+
+
+class CategoryRow(TypedDict):
+    """Plain row shape of ``CategoryReturn`` for serializing without models."""
+
+    id: int
+    name: str
+    slug: str
+    is_active: bool
+    level: int
+    parent_id: Optional[int]
+
+
+category_rows_adapter = TypeAdapter(List[CategoryRow])
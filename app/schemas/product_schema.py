@@ -0,0 +1,51 @@
+from datetime import datetime
+from decimal import Decimal
+from pydantic import BaseModel
+from typing import List, Literal, Optional
+from uuid import UUID
+
+
+class AttributeReturn(BaseModel):
+    id: int
+    name: str
+    description: Optional[str] = None
+
+
+class AttributeValueReturn(BaseModel):
+    id: int
+    attribute_value: str
+    attribute: AttributeReturn
+
+
+class ProductImageReturn(BaseModel):
+    id: int
+    alternative_text: str
+    url: str
+    order: int
+
+
+class ProductLineReturn(BaseModel):
+    id: int
+    price: Decimal
+    sku: UUID
+    stock_qty: int
+    is_active: bool
+    order: int
+    weight: float
+    product_images: List[ProductImageReturn] = []
+    attribute_values: List[AttributeValueReturn] = []
+
+
+class ProductReturn(BaseModel):
+    id: int
+    pid: UUID
+    name: str
+    slug: str
+    description: Optional[str] = None
+    is_digital: bool
+    is_active: bool
+    stock_status: Literal["oos", "is", "obo"]
+    category_id: int
+    created_at: datetime
+    updated_at: datetime
+    product_lines: List[ProductLineReturn] = []
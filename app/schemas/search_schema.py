@@ -0,0 +1,10 @@
+from pydantic import BaseModel
+from typing import Literal
+
+
+class SearchResult(BaseModel):
+    kind: Literal["category", "product"]
+    id: int
+    name: str
+    slug: str
+    score: float
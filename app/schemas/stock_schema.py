@@ -0,0 +1,25 @@
+from datetime import datetime
+from pydantic import BaseModel, Field
+from typing import Annotated, List, Literal, Optional
+from uuid import UUID
+
+RESERVATION_MAX_LINES = 100
+
+
+class ReservationLine(BaseModel):
+    sku: UUID
+    quantity: Annotated[int, Field(gt=0)]
+
+
+class ReservationCreate(BaseModel):
+    lines: Annotated[
+        List[ReservationLine], Field(min_length=1, max_length=RESERVATION_MAX_LINES)
+    ]
+    ttl_seconds: Optional[Annotated[int, Field(gt=0)]] = None
+
+
+class ReservationReturn(BaseModel):
+    id: UUID
+    status: Literal["held", "committed", "released", "expired"]
+    expires_at: datetime
+    lines: List[ReservationLine]
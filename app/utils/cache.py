@@ -0,0 +1,169 @@
+import threading
+import time
+from collections import OrderedDict
+
+import orjson
+
+MISSING = object()
+
+
+class LRUCache:
+    """Bounded in-process cache with a per-entry time to live."""
+
+    def __init__(self, max_size: int = 10000):
+        self.max_size = max_size
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return MISSING
+            value, expires_at = entry
+            if expires_at <= time.monotonic():
+                del self._entries[key]
+                return MISSING
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key, value, ttl: float):
+        with self._lock:
+            self._entries[key] = (value, time.monotonic() + ttl)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def delete(self, *keys):
+        with self._lock:
+            for key in keys:
+                self._entries.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+class RedisCache:
+    """Cache backend over any client with the redis-py get/set/delete API.
+
+    Values are stored as JSON so every worker can read what another one wrote.
+    """
+
+    def __init__(self, client, prefix: str):
+        self.client = client
+        self.prefix = prefix
+
+    def get(self, key):
+        raw = self.client.get(self.prefix + key)
+        if raw is None:
+            return MISSING
+        return orjson.loads(raw)
+
+    def set(self, key, value, ttl: float):
+        self.client.set(self.prefix + key, orjson.dumps(value), px=int(ttl * 1000))
+
+    def delete(self, *keys):
+        if keys:
+            self.client.delete(*(self.prefix + key for key in keys))
+
+    def clear(self):
+        keys = list(self.client.scan_iter(match=self.prefix + "*"))
+        if keys:
+            self.client.delete(*keys)
+
+
+def build_cache_backend(backend: str, prefix: str, max_size: int, redis_url=None):
+    if backend == "memory":
+        return LRUCache(max_size)
+    if backend == "redis":
+        try:
+            import redis
+        except ImportError as e:
+            raise RuntimeError("The redis cache backend needs the redis package") from e
+        return RedisCache(redis.Redis.from_url(redis_url), prefix)
+    raise ValueError(f"Unknown cache backend: {backend}")
+
+
+class ReadThroughCache:
+    """Read-through cache that also remembers misses for a shorter time.
+
+    A loader returning ``None`` means "does not exist"; that answer is cached
+    for ``negative_ttl`` so repeated lookups of unknown keys stay cheap.
+
+    A key invalidated while its value is being loaded is not filled with
+    that value, which may predate the write that invalidated it. Only this
+    worker's invalidations are seen; other workers rely on the TTL.
+    """
+
+    def __init__(self, backend, ttl: float, negative_ttl: float):
+        self.backend = backend
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl
+        self._lock = threading.Lock()
+        # key -> [loads in flight, invalidations since the first one started]
+        self._loading = {}
+        self.hits = 0
+        self.negative_hits = 0
+        self.misses = 0
+
+    def get_or_load(self, key, loader):
+        value = self.backend.get(key)
+        if value is not MISSING:
+            with self._lock:
+                self.hits += 1
+                if value is None:
+                    self.negative_hits += 1
+            return value
+
+        with self._lock:
+            self.misses += 1
+            loading = self._loading.setdefault(key, [0, 0])
+            loading[0] += 1
+            generation = loading[1]
+        try:
+            value = loader()
+        except BaseException:
+            with self._lock:
+                self._finish_load(key, loading)
+            raise
+
+        with self._lock:
+            self._finish_load(key, loading)
+            # set under the lock, so an invalidation either sees the value
+            # and deletes it or makes this check fail
+            if loading[1] == generation:
+                self.backend.set(
+                    key, value, self.ttl if value is not None else self.negative_ttl
+                )
+        return value
+
+    def _finish_load(self, key, loading):
+        loading[0] -= 1
+        if loading[0] == 0:
+            del self._loading[key]
+
+    def invalidate(self, *keys):
+        with self._lock:
+            for key in keys:
+                if key in self._loading:
+                    self._loading[key][1] += 1
+        self.backend.delete(*keys)
+
+    def clear(self):
+        with self._lock:
+            for loading in self._loading.values():
+                loading[1] += 1
+        self.backend.clear()
+
+    def stats(self):
+        with self._lock:
+            hits, negative_hits, misses = self.hits, self.negative_hits, self.misses
+        lookups = hits + misses
+        return {
+            "backend": type(self.backend).__name__,
+            "hits": hits,
+            "negative_hits": negative_hits,
+            "misses": misses,
+            "hit_ratio": hits / lookups if lookups else 0.0,
+        }
@@ -0,0 +1,500 @@
+"""Bulk import of supplier catalog feeds.
+
+Each feed is a CSV (with a header row) or JSONL file, streamed in chunks
+with ``COPY`` into a temporary staging table and then merged into its
+catalog table with one set-based upsert::
+
+    python -m app.utils.catalog_import \\
+        --products products.csv --product-lines lines.jsonl \\
+        --product-images images.csv --attribute-values values.csv \\
+        --product-attribute-values line_values.csv
+
+Rows refer to each other by natural key: a product by ``slug``, a product
+line by ``sku``, an attribute by ``name``. An optional column left empty
+takes its default on a new row and keeps its value on an existing one.
+``stock_qty`` is only read for new product lines: afterwards stock moves
+with reservations, and a supplier figure would overwrite stock they hold.
+
+The whole import runs in one transaction, so a feed that fails leaves the
+catalog as it was. It also keeps every merged row locked until the end,
+including the product lines stock reservations decrement, so reservations
+on those lines wait for the import to finish. Run it off peak.
+"""
+
+import argparse
+import csv
+import io
+import json
+import logging
+import os
+import time
+from itertools import islice
+
+from app.models import (
+    Attribute,
+    AttributeValue,
+    Category,
+    Product,
+    ProductAttributeValue,
+    ProductImage,
+    ProductLine,
+)
+from sqlalchemy import (
+    BigInteger,
+    Boolean,
+    Column,
+    Float,
+    Identity,
+    Integer,
+    MetaData,
+    Numeric,
+    Table,
+    Text,
+    and_,
+    cast,
+    create_engine,
+    exists,
+    false,
+    func,
+    literal,
+    literal_column,
+    or_,
+    select,
+    text,
+    true,
+    tuple_,
+)
+from sqlalchemy.dialects.postgresql import UUID, insert
+from sqlalchemy.orm import Session
+
+logger = logging.getLogger("app")
+
+IMPORT_CHUNK_ROWS = int(os.getenv("IMPORT_CHUNK_ROWS", "50000"))
+
+staging_metadata = MetaData()
+
+
+def _staging_table(name, *columns):
+    # typed, so COPY rejects a malformed value with its line number; checks
+    # and lengths are left to the merge, which skips rows that break them
+    return Table(
+        f"staging_{name}",
+        staging_metadata,
+        Column("row_number", BigInteger, Identity(always=True)),
+        *columns,
+        prefixes=["TEMPORARY"],
+        postgresql_on_commit="DROP",
+    )
+
+
+staging_product = _staging_table(
+    "product",
+    Column("slug", Text),
+    Column("name", Text),
+    Column("description", Text),
+    Column("category", Text),
+    Column("is_active", Boolean),
+    Column("is_digital", Boolean),
+    Column("stock_status", Text),
+)
+staging_product_line = _staging_table(
+    "product_line",
+    Column("sku", UUID(as_uuid=True)),
+    Column("product", Text),
+    Column("price", Numeric),
+    Column("stock_qty", Integer),
+    Column("is_active", Boolean),
+    Column("order", Integer),
+    Column("weight", Float),
+)
+staging_product_image = _staging_table(
+    "product_image",
+    Column("alternative_text", Text),
+    Column("sku", UUID(as_uuid=True)),
+    Column("url", Text),
+    Column("order", Integer),
+)
+staging_attribute_value = _staging_table(
+    "attribute_value",
+    Column("attribute", Text),
+    Column("value", Text),
+)
+staging_product_attribute_value = _staging_table(
+    "product_attribute_value",
+    Column("sku", UUID(as_uuid=True)),
+    Column("attribute", Text),
+)
+
+
+def staging_columns(table):
+    return [column.name for column in table.columns if column.name != "row_number"]
+
+
+def _latest(source, *keys):
+    """One row of ``source`` per ``keys``, the last one in the feed."""
+    columns = [source.c[key] for key in keys]
+    return (
+        select(source)
+        .distinct(*columns)
+        .order_by(*columns, source.c.row_number.desc())
+        .subquery()
+    )
+
+
+def _upsert(
+    table, source, constraint, keys, optional=None, insert_only=(), touch=None
+):
+    """Upsert every ``source`` row on ``constraint``, skipping unchanged rows.
+
+    ``optional`` maps the columns a feed may leave empty to their default
+    for new rows, an existing row keeps its current value instead.
+    ``insert_only`` columns are never updated.
+
+    Selects ``(valid, inserted, updated)``: the rows the source kept after
+    its checks, and how many of those were written.
+    """
+    source = source.cte("source")
+    optional = optional or {}
+    columns = [column.name for column in source.columns]
+    existing = table.__table__.alias("existing")
+    filled = select(
+        *(
+            func.coalesce(
+                source.c[column],
+                existing.c[column],
+                *([optional[column]] if optional[column] is not None else []),
+            ).label(column)
+            if column in optional
+            else source.c[column]
+            for column in columns
+        )
+    ).select_from(
+        source.outerjoin(
+            existing, and_(*(existing.c[key] == source.c[key] for key in keys))
+        )
+    )
+    # without a WHERE, the parser would read ON CONFLICT as another join's ON
+    filled = filled.where(true())
+    statement = insert(table).from_select(columns, filled)
+    updated = [
+        column for column in columns if column not in keys + list(insert_only)
+    ]
+    current = tuple_(*(table.__table__.c[column] for column in updated))
+    incoming = tuple_(*(statement.excluded[column] for column in updated))
+    merged = (
+        statement.on_conflict_do_update(
+            constraint=constraint,
+            set_={
+                **{column: statement.excluded[column] for column in updated},
+                **(touch or {}),
+            },
+            # an unchanged row is not rewritten, most of a nightly feed is
+            where=current.is_distinct_from(incoming),
+        )
+        .returning(literal_column("xmax = 0", Boolean).label("inserted"))
+        .cte("merged")
+    )
+    return select(
+        select(func.count()).select_from(source).scalar_subquery().label("valid"),
+        func.count().filter(merged.c.inserted).label("inserted"),
+        func.count().filter(~merged.c.inserted).label("updated"),
+    ).select_from(merged)
+
+
+def merge_products():
+    staged = _latest(_latest(staging_product, "slug"), "name")
+    source = (
+        select(
+            staged.c.slug,
+            staged.c.name,
+            staged.c.description,
+            Category.id.label("category_id"),
+            staged.c.is_active,
+            staged.c.is_digital,
+            cast(staged.c.stock_status, Product.stock_status.type).label(
+                "stock_status"
+            ),
+        )
+        .join(Category, Category.slug == staged.c.category)
+        .where(
+            func.length(staged.c.slug).between(1, 220),
+            func.length(staged.c.name).between(1, 200),
+            or_(
+                staged.c.stock_status.is_(None),
+                staged.c.stock_status.in_(Product.stock_status.type.enums),
+            ),
+            # the name is unique too, and may belong to another product
+            ~exists().where(
+                Product.name == staged.c.name, Product.slug != staged.c.slug
+            ),
+        )
+    )
+    return _upsert(
+        Product,
+        source,
+        "uq_product_slug",
+        keys=["slug"],
+        optional={
+            "description": None,
+            "is_active": false(),
+            "is_digital": false(),
+            "stock_status": cast("oos", Product.stock_status.type),
+        },
+        touch={"updated_at": func.now()},
+    )
+
+
+def merge_product_lines():
+    staged = _latest(_latest(staging_product_line, "sku"), "product", "order")
+    source = (
+        select(
+            staged.c.sku,
+            Product.id.label("product_id"),
+            func.round(staged.c.price, 2).label("price"),
+            staged.c.stock_qty,
+            staged.c.is_active,
+            staged.c["order"],
+            staged.c.weight,
+        )
+        .join(Product, Product.slug == staged.c.product)
+        .where(
+            staged.c.sku.is_not(None),
+            staged.c.weight.is_not(None),
+            func.round(staged.c.price, 2).between(0, 999.99),
+            staged.c["order"].between(1, 20),
+            func.coalesce(staged.c.stock_qty, 0) >= 0,
+            # the order is unique per product, and may be taken by another line
+            ~exists().where(
+                ProductLine.product_id == Product.id,
+                ProductLine.order == staged.c["order"],
+                ProductLine.sku != staged.c.sku,
+            ),
+        )
+    )
+    return _upsert(
+        ProductLine,
+        source,
+        "uq_product_line_sku",
+        keys=["sku"],
+        optional={"stock_qty": literal(0), "is_active": false()},
+        # net of the stock reservations hold, which the feed knows nothing of
+        insert_only=["stock_qty"],
+    )
+
+
+def merge_product_images():
+    staged = _latest(staging_product_image, "alternative_text")
+    source = (
+        select(
+            staged.c.alternative_text,
+            staged.c.url,
+            staged.c["order"],
+            ProductLine.id.label("product_line_id"),
+        )
+        .join(ProductLine, ProductLine.sku == staged.c.sku)
+        .where(
+            func.length(staged.c.alternative_text).between(1, 100),
+            func.length(staged.c.url).between(1, 100),
+            staged.c["order"].between(1, 20),
+        )
+    )
+    return _upsert(
+        ProductImage, source, "uq_product_image_alt", keys=["alternative_text"]
+    )
+
+
+def merge_attribute_values():
+    staged = _latest(staging_attribute_value, "attribute")
+    source = (
+        select(
+            Attribute.id.label("attribute_id"),
+            staged.c.value.label("attribute_value"),
+        )
+        .join(Attribute, Attribute.name == staged.c.attribute)
+        .where(func.length(staged.c.value).between(1, 100))
+    )
+    return _upsert(
+        AttributeValue,
+        source,
+        "uq_attribute_value_attribute_id",
+        keys=["attribute_id"],
+    )
+
+
+def merge_product_attribute_values():
+    staged = _latest(staging_product_attribute_value, "attribute")
+    source = (
+        select(
+            AttributeValue.id.label("attribute_value_id"),
+            ProductLine.id.label("product_line_id"),
+        )
+        .select_from(staged)
+        .join(ProductLine, ProductLine.sku == staged.c.sku)
+        .join(Attribute, Attribute.name == staged.c.attribute)
+        .join(AttributeValue, AttributeValue.attribute_id == Attribute.id)
+    )
+    return _upsert(
+        ProductAttributeValue,
+        source,
+        "uq_product_attribute_value",
+        keys=["attribute_value_id"],
+    )
+
+
+# in merge order, each feed refers only to rows merged before it
+FEEDS = {
+    "products": (staging_product, merge_products),
+    "product_lines": (staging_product_line, merge_product_lines),
+    "product_images": (staging_product_image, merge_product_images),
+    "attribute_values": (staging_attribute_value, merge_attribute_values),
+    "product_attribute_values": (
+        staging_product_attribute_value,
+        merge_product_attribute_values,
+    ),
+}
+
+
+def _copy_value(value):
+    # an empty unquoted CSV field is NULL to COPY
+    if value is None:
+        return ""
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    return value
+
+
+def read_rows(path, columns):
+    """Yield every record of a CSV or JSONL file as a tuple in ``columns`` order."""
+    with open(path, newline="") as feed:
+        if path.endswith((".jsonl", ".ndjson")):
+            records = (json.loads(line) for line in feed if line.strip())
+        else:
+            records = csv.DictReader(feed)
+        for number, record in enumerate(records, start=1):
+            unknown = set(record) - set(columns)
+            if unknown:
+                raise ValueError(
+                    f"{path}: record {number} has unknown columns "
+                    f"{sorted(map(str, unknown))}, expected {columns}"
+                )
+            yield tuple(_copy_value(record.get(column)) for column in columns)
+
+
+def copy_rows(db: Session, table, rows):
+    """COPY ``rows`` into ``table`` through the session's connection."""
+    buffer = io.StringIO()
+    csv.writer(buffer).writerows(rows)
+    buffer.seek(0)
+
+    quote = db.get_bind().dialect.identifier_preparer.quote
+    columns = ", ".join(quote(column) for column in staging_columns(table))
+    cursor = db.connection().connection.cursor()
+    try:
+        cursor.copy_expert(
+            f"COPY {table.name} ({columns}) FROM STDIN WITH (FORMAT csv)", buffer
+        )
+    finally:
+        cursor.close()
+
+
+def stage_feed(db: Session, feed, path, chunk_rows=IMPORT_CHUNK_ROWS):
+    """Stream ``path`` into the feed's staging table, ``chunk_rows`` at a time."""
+    table, _ = FEEDS[feed]
+    table.create(db.connection())
+    rows = read_rows(path, staging_columns(table))
+    started = time.perf_counter()
+    staged = 0
+    while chunk := list(islice(rows, chunk_rows)):
+        copy_rows(db, table, chunk)
+        staged += len(chunk)
+        elapsed = time.perf_counter() - started
+        logger.info(
+            f"{feed}: staged {staged} rows ({staged / max(elapsed, 1e-9):.0f} rows/s)"
+        )
+    # temporary tables are never analyzed by autovacuum
+    db.execute(text(f"ANALYZE {table.name}"))
+    return staged
+
+
+def merge_feed(db: Session, feed, staged):
+    _, merge = FEEDS[feed]
+    started = time.perf_counter()
+    valid, inserted, updated = db.execute(merge()).one()
+    elapsed = time.perf_counter() - started
+    stats = {
+        "staged": staged,
+        "inserted": inserted,
+        "updated": updated,
+        "unchanged": valid - inserted - updated,
+        "skipped": staged - valid,
+        "seconds": round(elapsed, 3),
+    }
+    logger.info(
+        f"{feed}: merged in {elapsed:.2f}s ({staged / max(elapsed, 1e-9):.0f} "
+        f"rows/s), {inserted} inserted, {updated} updated, "
+        f"{stats['unchanged']} unchanged, {stats['skipped']} skipped"
+    )
+    return stats
+
+
+def import_catalog(db: Session, paths, chunk_rows=IMPORT_CHUNK_ROWS):
+    """Stage and merge every ``{feed: path}`` in one transaction.
+
+    Merged rows stay locked until it commits, so stock reservations on the
+    imported product lines wait for the whole import.
+
+    Rows whose parent is not in the catalog, that break a check, or whose
+    other unique key (a product name, a line's order) belongs to a different
+    row are skipped and counted. A later row in a feed wins over an earlier
+    one with the same key.
+    """
+    unknown = set(paths) - set(FEEDS)
+    if unknown:
+        raise ValueError(f"Unknown feeds {sorted(unknown)}")
+
+    stats = {}
+    try:
+        for feed in FEEDS:
+            if feed in paths:
+                staged = stage_feed(db, feed, paths[feed], chunk_rows)
+                stats[feed] = merge_feed(db, feed, staged)
+                # frees the staged rows now, rather than at the end
+                FEEDS[feed][0].drop(db.connection())
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+    return stats
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    for feed in FEEDS:
+        parser.add_argument(f"--{feed.replace('_', '-')}", dest=feed, metavar="PATH")
+    parser.add_argument("--chunk-rows", type=int, default=IMPORT_CHUNK_ROWS)
+    parser.add_argument("--database-url", default=os.getenv("DEV_DATABASE_URL"))
+    args = parser.parse_args()
+
+    paths = {feed: getattr(args, feed) for feed in FEEDS if getattr(args, feed)}
+    if not paths:
+        parser.error("no feed given")
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(message)s")
+    engine = create_engine(args.database_url)
+    started = time.perf_counter()
+    try:
+        with Session(engine) as db:
+            stats = import_catalog(db, paths, args.chunk_rows)
+    finally:
+        engine.dispose()
+
+    rows = sum(feed["staged"] for feed in stats.values())
+    elapsed = time.perf_counter() - started
+    logger.info(
+        f"imported {rows} rows in {elapsed:.1f}s ({rows / max(elapsed, 1e-9):.0f} "
+        f"rows/s)"
+    )
+
+
+if __name__ == "__main__":
+    main()
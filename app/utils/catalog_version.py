@@ -0,0 +1,81 @@
+import os
+import threading
+import time
+from datetime import datetime
+from typing import NamedTuple, Optional
+
+from app.models import CatalogVersion
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+
+class CatalogState(NamedTuple):
+    version: int
+    updated_at: Optional[datetime]
+
+
+def read_catalog_state(db: Session, name: str) -> CatalogState:
+    row = db.execute(
+        select(CatalogVersion.version, CatalogVersion.updated_at).where(
+            CatalogVersion.name == name
+        )
+    ).first()
+    return CatalogState(*row) if row else CatalogState(0, None)
+
+
+class VersionTracker:
+    """Last known version of a catalog table, re-read at most every interval.
+
+    The version is bumped by a statement-level trigger on every write to the
+    table, so comparing it is enough to know whether cached data is stale.
+    ``updated_at`` is the time of that write as of the last refresh.
+    """
+
+    def __init__(self, name: str, check_interval: float):
+        self.name = name
+        self.check_interval = check_interval
+        self._version = None
+        self.updated_at = None
+        self._checked_at = 0.0
+        self._lock = threading.Lock()
+
+    def current(self, db: Session) -> int:
+        with self._lock:
+            if (
+                self._version is not None
+                and time.monotonic() - self._checked_at < self.check_interval
+            ):
+                return self._version
+        return self.refresh(db)
+
+    def refresh(self, db: Session) -> int:
+        state = read_catalog_state(db, self.name)
+        with self._lock:
+            self._version = state.version
+            self.updated_at = state.updated_at
+            self._checked_at = time.monotonic()
+        return state.version
+
+    def state(self, db: Session) -> CatalogState:
+        """Version and last write time of the table as ``db`` sees it.
+
+        A session on a replica reads them itself: a lagging replica must not
+        move the shared version back, and an ETag has to match the rows the
+        same session returns.
+        """
+        if db.info.get("replica"):
+            return read_catalog_state(db, self.name)
+        version = self.current(db)
+        return CatalogState(version, self.updated_at)
+
+    def expire(self):
+        with self._lock:
+            self._version = None
+
+
+CATALOG_VERSION_CHECK_INTERVAL = float(os.getenv("CATALOG_VERSION_CHECK_INTERVAL", "1"))
+
+category_version = VersionTracker("category", CATALOG_VERSION_CHECK_INTERVAL)
+seasonal_event_version = VersionTracker(
+    "seasonal_event", CATALOG_VERSION_CHECK_INTERVAL
+)
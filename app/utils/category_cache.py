@@ -0,0 +1,55 @@
+import os
+
+from app.models import Category
+from app.schemas.category_schema import CategoryReturn
+from app.utils.cache import ReadThroughCache, build_cache_backend
+from app.utils.category_utils import CATEGORY_RETURN_COLUMNS
+from sqlalchemy.orm import Session
+
+CATEGORY_CACHE_BACKEND = os.getenv("CATEGORY_CACHE_BACKEND", "memory")
+CATEGORY_CACHE_MAX_SIZE = int(os.getenv("CATEGORY_CACHE_MAX_SIZE", "10000"))
+CATEGORY_CACHE_TTL = float(os.getenv("CATEGORY_CACHE_TTL", "30"))
+CATEGORY_CACHE_NEGATIVE_TTL = float(os.getenv("CATEGORY_CACHE_NEGATIVE_TTL", "5"))
+REDIS_URL = os.getenv("REDIS_URL", "redis://localhost:6379/0")
+
+category_cache = ReadThroughCache(
+    build_cache_backend(
+        CATEGORY_CACHE_BACKEND, "category:", CATEGORY_CACHE_MAX_SIZE, REDIS_URL
+    ),
+    ttl=CATEGORY_CACHE_TTL,
+    negative_ttl=CATEGORY_CACHE_NEGATIVE_TTL,
+)
+
+
+def slug_key(slug: str) -> str:
+    return f"slug:{slug}"
+
+
+def id_key(category_id: int) -> str:
+    return f"id:{category_id}"
+
+
+def _load_category(db: Session, criterion):
+    category = db.query(*CATEGORY_RETURN_COLUMNS).filter(criterion).first()
+    if not category:
+        return None
+    return CategoryReturn.model_validate(category, from_attributes=True).model_dump()
+
+
+def get_cached_category_by_slug(db: Session, slug: str):
+    return category_cache.get_or_load(
+        slug_key(slug), lambda: _load_category(db, Category.slug == slug)
+    )
+
+
+def get_cached_category_by_id(db: Session, category_id: int):
+    return category_cache.get_or_load(
+        id_key(category_id), lambda: _load_category(db, Category.id == category_id)
+    )
+
+
+def invalidate_category(category_id=None, *slugs):
+    keys = [slug_key(slug) for slug in slugs if slug]
+    if category_id is not None:
+        keys.append(id_key(category_id))
+    category_cache.invalidate(*keys)
@@ -0,0 +1,73 @@
+from app.models import Category
+from app.utils.category_utils import CATEGORY_RETURN_COLUMNS
+from sqlalchemy import literal_column, select
+
+
+def descendants_query(category_id: int, max_depth: int):
+    """Select the category and everything below it, at most ``max_depth`` down."""
+    tree = (
+        select(*CATEGORY_RETURN_COLUMNS, literal_column("0").label("depth"))
+        .where(Category.id == category_id)
+        .cte("category_descendants", recursive=True)
+    )
+    tree = tree.union_all(
+        select(*CATEGORY_RETURN_COLUMNS, (tree.c.depth + 1).label("depth"))
+        .join(tree, Category.parent_id == tree.c.id)
+        .where(tree.c.depth < max_depth)
+    )
+    return select(tree).order_by(tree.c.depth, tree.c.id)
+
+
+def ancestors_query(category_id: int, max_depth: int):
+    """Select the category and its parents, root first, at most ``max_depth`` up."""
+    tree = (
+        select(*CATEGORY_RETURN_COLUMNS, literal_column("0").label("depth"))
+        .where(Category.id == category_id)
+        .cte("category_ancestors", recursive=True)
+    )
+    tree = tree.union_all(
+        select(*CATEGORY_RETURN_COLUMNS, (tree.c.depth + 1).label("depth"))
+        .join(tree, Category.id == tree.c.parent_id)
+        .where(tree.c.depth < max_depth)
+    )
+    return select(tree).order_by(tree.c.depth.desc())
+
+
+def build_tree(rows):
+    """Nest rows from ``descendants_query`` under their parents.
+
+    Rows must be ordered by depth so every parent is seen before its children.
+    Returns the depth 0 node, or ``None`` if there are no rows.
+    """
+    nodes = {}
+    root = None
+    for row in rows:
+        node = {**row, "children": []}
+        nodes[node["id"]] = node
+        if node["depth"] == 0:
+            root = node
+        else:
+            nodes[node["parent_id"]]["children"].append(node)
+    return root
+
+
+def descendant_rows(db, category_id: int, max_depth: int, cache=None):
+    if cache is not None:
+        cache.ensure_fresh(db)
+        return cache.descendants(category_id, max_depth)
+    return db.execute(descendants_query(category_id, max_depth)).mappings().all()
+
+
+def ancestor_rows(db, category_id: int, max_depth: int, cache=None):
+    if cache is not None:
+        cache.ensure_fresh(db)
+        return cache.ancestors(category_id, max_depth)
+    return db.execute(ancestors_query(category_id, max_depth)).mappings().all()
+
+
+def category_id_for_slug(db, slug: str, cache=None):
+    if cache is not None:
+        cache.ensure_fresh(db)
+        node = cache.get_by_slug(slug)
+        return node["id"] if node else None
+    return db.execute(select(Category.id).where(Category.slug == slug)).scalar()
@@ -0,0 +1,127 @@
+import bisect
+import threading
+
+from app.models import Category
+from app.utils.catalog_version import category_version
+from app.utils.category_utils import CATEGORY_RETURN_COLUMNS
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+
+def category_to_node(category) -> dict:
+    return {
+        column.key: getattr(category, column.key) for column in CATEGORY_RETURN_COLUMNS
+    }
+
+
+class CategoryTreeCache:
+    """The whole category hierarchy held in memory by one worker.
+
+    ``by_id`` and ``by_slug`` map to the same node dicts and ``children`` maps
+    a parent id (``None`` for roots) to its sorted child ids. The cache is
+    tagged with the catalog version it was loaded at and reloads when the
+    version tracker reports a different one.
+    """
+
+    def __init__(self, version_tracker):
+        self._tracker = version_tracker
+        self._lock = threading.RLock()
+        self.version = None
+        self.by_id = {}
+        self.by_slug = {}
+        self.children = {}
+
+    def ensure_fresh(self, db: Session):
+        version = self._tracker.current(db)
+        if version == self.version:
+            return
+        with self._lock:
+            if version != self.version:
+                self._load(db, version)
+
+    def _load(self, db: Session, version: int):
+        rows = (
+            db.execute(select(*CATEGORY_RETURN_COLUMNS).order_by(Category.id))
+            .mappings()
+            .all()
+        )
+        self.by_id, self.by_slug, self.children = {}, {}, {}
+        for row in rows:
+            self._add(dict(row))
+        self.version = version
+
+    def _add(self, node: dict):
+        self.by_id[node["id"]] = node
+        self.by_slug[node["slug"]] = node
+        bisect.insort(self.children.setdefault(node["parent_id"], []), node["id"])
+
+    def _remove(self, category_id: int):
+        node = self.by_id.pop(category_id, None)
+        if node is None:
+            return
+        if self.by_slug.get(node["slug"]) is node:
+            del self.by_slug[node["slug"]]
+        self.children[node["parent_id"]].remove(category_id)
+
+    def apply_write(self, db: Session, upserted=None, deleted_id=None):
+        """Patch the cache after a committed write made through this worker.
+
+        The write bumped the catalog version by one. If the version moved by
+        more, someone else wrote too and the cache is reloaded on next use.
+        """
+        version = self._tracker.refresh(db)
+        with self._lock:
+            if self.version is None or version != self.version + 1:
+                self.version = None
+                return
+            if deleted_id is not None:
+                self._remove(deleted_id)
+            if upserted is not None:
+                self._remove(upserted["id"])
+                self._add(dict(upserted))
+            self.version = version
+
+    def invalidate(self):
+        with self._lock:
+            self.version = None
+        self._tracker.expire()
+
+    def get_by_slug(self, slug: str):
+        with self._lock:
+            node = self.by_slug.get(slug)
+            return dict(node) if node else None
+
+    def descendants(self, category_id: int, max_depth: int):
+        """Rows shaped like ``descendants_query`` output, served from memory."""
+        with self._lock:
+            if category_id not in self.by_id:
+                return []
+            rows = [{**self.by_id[category_id], "depth": 0}]
+            frontier = [category_id]
+            for depth in range(1, max_depth + 1):
+                frontier = sorted(
+                    child
+                    for parent in frontier
+                    for child in self.children.get(parent, ())
+                )
+                if not frontier:
+                    break
+                rows.extend({**self.by_id[child], "depth": depth} for child in frontier)
+            return rows
+
+    def ancestors(self, category_id: int, max_depth: int):
+        """Rows shaped like ``ancestors_query`` output, served from memory."""
+        with self._lock:
+            node = self.by_id.get(category_id)
+            if node is None:
+                return []
+            rows = [{**node, "depth": 0}]
+            while node["parent_id"] is not None and len(rows) <= max_depth:
+                node = self.by_id.get(node["parent_id"])
+                if node is None:
+                    break
+                rows.append({**node, "depth": len(rows)})
+            return rows[::-1]
+
+
+category_tree_cache = CategoryTreeCache(category_version)
@@ -1,28 +1,200 @@
 from app.models import Category
+from sqlalchemy import literal_column, or_, select, tuple_
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.exc import DBAPIError, IntegrityError
+import orjson
 from sqlalchemy.orm import Session
-from app.schemas.category_schema import CategoryCreate
 from fastapi import HTTPException
 
 
-def check_existing_category(db: Session, category_data: CategoryCreate):
-    existing_category = (
-        db.query(Category)
-        .filter(
-            (Category.slug == category_data.slug)
-            | (
-                (Category.name == category_data.name)
-                & (Category.level == category_data.level)
+CATEGORY_CONSTRAINT_MESSAGES = {
+    "uq_category_name_level": "Category name and level exists",
+    "uq_category_slug": "Category slug exists",
+}
+
+
+def get_constraint_name(error: IntegrityError):
+    """Return the name of the constraint behind ``error``, if the driver says."""
+    diag = getattr(error.orig, "diag", None)
+    if diag is not None:
+        # psycopg2
+        return diag.constraint_name
+    # asyncpg, wrapped by SQLAlchemy's adapter
+    return getattr(error.orig.__cause__, "constraint_name", None)
+
+
+def raise_for_category_integrity_error(error: IntegrityError):
+    """Turn a unique constraint violation on ``category`` into a 400."""
+    detail_msg = CATEGORY_CONSTRAINT_MESSAGES.get(get_constraint_name(error))
+    if detail_msg:
+        raise HTTPException(status_code=400, detail=detail_msg) from error
+
+
+CATEGORY_ORDERINGS = {
+    "id": (Category.id,),
+    "level_name": (Category.level, Category.name),
+}
+
+
+def filter_categories(query, is_active=None, level=None, parent_id=None):
+    if is_active is not None:
+        query = query.filter(Category.is_active == is_active)
+    if level is not None:
+        query = query.filter(Category.level == level)
+    if parent_id is not None:
+        query = query.filter(Category.parent_id == parent_id)
+    return query
+
+
+CATEGORY_RETURN_COLUMNS = (
+    Category.id,
+    Category.name,
+    Category.slug,
+    Category.is_active,
+    Category.level,
+    Category.parent_id,
+)
+
+
+def stream_categories(session_factory, export_format="ndjson", batch_size=1000):
+    """Yield all categories as NDJSON lines or as a chunked JSON array.
+
+    Rows are read through a server-side cursor ``batch_size`` at a time and
+    each batch is encoded into a single chunk, so memory stays flat no matter
+    how large the table is.
+    """
+    db = session_factory()
+    try:
+        result = db.execute(
+            select(*CATEGORY_RETURN_COLUMNS)
+            .order_by(Category.id)
+            .execution_options(yield_per=batch_size)
+        )
+
+        if export_format == "json":
+            yield b"["
+        separator = b""
+        for rows in result.partitions():
+            encoded = [orjson.dumps(row._asdict()) for row in rows]
+            if export_format == "json":
+                yield separator + b",".join(encoded)
+                separator = b","
+            else:
+                yield b"\n".join(encoded) + b"\n"
+        if export_format == "json":
+            yield b"]"
+    finally:
+        db.close()
+
+
+BULK_UPDATABLE_COLUMNS = ("name", "is_active", "level", "parent_id")
+
+
+def find_conflicting_categories(db: Session, items):
+    """Fetch every stored category sharing a slug or (name, level) with ``items``."""
+    return db.execute(
+        select(Category.id, Category.slug, Category.name, Category.level).where(
+            or_(
+                Category.slug.in_(list({item.slug for item in items})),
+                tuple_(Category.name, Category.level).in_(
+                    list({(item.name, item.level) for item in items})
+                ),
             )
         )
-        .first()
-    )
+    ).all()
+
+
+def plan_bulk_categories(items, existing, on_conflict="skip"):
+    """Split a batch into items to write and per-item conflict results.
+
+    Returns ``(writes, conflicts)`` where ``writes`` is a list of
+    ``(index, item)`` and ``conflicts`` maps an index to its result dict.
+    """
+    by_slug = {row.slug: row for row in existing}
+    by_name_level = {(row.name, row.level): row for row in existing}
+    seen_slugs, seen_name_levels = set(), set()
+    writes, conflicts = [], {}
 
-    if existing_category:
-        if (
-            existing_category.name == category_data.name
-            and existing_category.level == category_data.level
+    for index, item in enumerate(items):
+        name_level = (item.name, item.level)
+        slug_owner = by_slug.get(item.slug)
+        name_level_owner = by_name_level.get(name_level)
+
+        if item.slug in seen_slugs:
+            detail = "Duplicate slug in batch"
+        elif name_level in seen_name_levels:
+            detail = "Duplicate name and level in batch"
+        elif name_level_owner is not None and (
+            on_conflict == "skip"
+            or slug_owner is None
+            or slug_owner.id != name_level_owner.id
         ):
-            detail_msg = "Category name and level exists"
+            detail = "Category name and level exists"
+        elif slug_owner is not None and on_conflict == "skip":
+            detail = "Category slug exists"
+        else:
+            detail = None
+
+        seen_slugs.add(item.slug)
+        seen_name_levels.add(name_level)
+        if detail:
+            conflicts[index] = {
+                "index": index,
+                "slug": item.slug,
+                "status": "conflict",
+                "detail": detail,
+            }
+        else:
+            writes.append((index, item))
+
+    return writes, conflicts
+
+
+def write_category_chunk(db: Session, chunk, on_conflict="skip"):
+    """Insert (or upsert by slug) ``chunk`` in one statement inside a savepoint."""
+    statement = insert(Category).values([item.model_dump() for _, item in chunk])
+    if on_conflict == "update":
+        statement = statement.on_conflict_do_update(
+            constraint="uq_category_slug",
+            set_={
+                column: statement.excluded[column] for column in BULK_UPDATABLE_COLUMNS
+            },
+        )
+    else:
+        statement = statement.on_conflict_do_nothing()
+    statement = statement.returning(
+        Category.id, Category.slug, literal_column("xmax = 0").label("inserted")
+    )
+
+    try:
+        with db.begin_nested():
+            written = {row.slug: row for row in db.execute(statement)}
+    except DBAPIError as e:
+        detail = str(e.orig).splitlines()[0] if e.orig else "Database error"
+        return [
+            {"index": index, "slug": item.slug, "status": "error", "detail": detail}
+            for index, item in chunk
+        ]
+
+    results = []
+    for index, item in chunk:
+        row = written.get(item.slug)
+        if row is None:
+            results.append(
+                {
+                    "index": index,
+                    "slug": item.slug,
+                    "status": "conflict",
+                    "detail": "Category already exists",
+                }
+            )
         else:
-            detail_msg = "Category slug exists"
-        raise HTTPException(status_code=400, detail=detail_msg)
+            results.append(
+                {
+                    "index": index,
+                    "slug": item.slug,
+                    "status": "created" if row.inserted else "updated",
+                    "id": row.id,
+                }
+            )
+    return results
@@ -0,0 +1,140 @@
+import atexit
+import itertools
+import logging
+import queue
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener
+
+import orjson
+
+# attributes every LogRecord has; anything else was passed through ``extra``
+RECORD_ATTRIBUTES = frozenset(
+    vars(logging.LogRecord("", logging.INFO, "", 0, "", None, None))
+) | {"message", "asctime", "sampled"}
+
+
+def parse_sampling(value: str) -> dict:
+    """Parse ``"app=1,sqlalchemy.pool=10"`` into ``{logger: keep one in N}``."""
+    sampling = {}
+    for item in filter(None, (part.strip() for part in value.split(","))):
+        name, _, every = item.partition("=")
+        sampling[name.strip()] = max(int(every), 1)
+    return sampling
+
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per line, including any ``extra`` fields."""
+
+    def format(self, record):
+        entry = {
+            "timestamp": datetime.fromtimestamp(
+                record.created, timezone.utc
+            ).isoformat(),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        for key, value in vars(record).items():
+            if key not in RECORD_ATTRIBUTES:
+                entry[key] = value
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            entry["exc_info"] = record.exc_text
+        return orjson.dumps(entry, default=str).decode()
+
+
+class SamplingFilter(logging.Filter):
+    """Keep one in N records per logger (and its children); never drop CRITICAL.
+
+    The decision is stored on the record so every handler a record propagates
+    to agrees on it.
+    """
+
+    def __init__(self, sampling: dict):
+        super().__init__()
+        # most specific logger name first
+        self.sampling = sorted(sampling.items(), key=lambda item: -len(item[0]))
+        self.counters = {name: itertools.count() for name in sampling}
+
+    def _every(self, logger_name):
+        for name, every in self.sampling:
+            if logger_name == name or logger_name.startswith(name + "."):
+                return name, every
+        return None, 1
+
+    def filter(self, record):
+        sampled = getattr(record, "sampled", None)
+        if sampled is None:
+            name, every = self._every(record.name)
+            sampled = (
+                every == 1
+                or record.levelno >= logging.CRITICAL
+                # itertools.count is atomic under the GIL, no lock needed
+                or next(self.counters[name]) % every == 0
+            )
+            record.sampled = sampled
+        return sampled
+
+
+class DeferredFormattingQueueHandler(QueueHandler):
+    """Queue records with their message resolved but formatting left to the
+    handlers behind the listener, so they can still emit structured output."""
+
+    def prepare(self, record):
+        prepared = logging.makeLogRecord(vars(record))
+        prepared.msg = record.getMessage()
+        prepared.args = None
+        if record.exc_info:
+            prepared.exc_text = record.exc_text or logging.Formatter().formatException(
+                record.exc_info
+            )
+            prepared.exc_info = None
+        return prepared
+
+
+_running_listeners = []
+
+
+def stop_queued_logging(listeners=None):
+    """Drain and stop ``listeners`` (default: all of them); safe to repeat."""
+    for listener in list(_running_listeners if listeners is None else listeners):
+        if listener in _running_listeners:
+            _running_listeners.remove(listener)
+            listener.stop()
+
+
+atexit.register(stop_queued_logging)
+
+
+def start_queued_logging(logger_names=("", "app"), sampling=None):
+    """Move the handlers of ``logger_names`` onto background threads.
+
+    Each logger keeps its own handlers, now fed by a ``QueueListener``, and
+    gets a single non-blocking ``QueueHandler`` in their place. Returns the
+    listeners, which ``stop_queued_logging`` drains at interpreter exit.
+    """
+    sampling_filter = SamplingFilter(sampling or {})
+    listeners = []
+    for name in logger_names:
+        logger = logging.getLogger(name or None)
+        handlers = [
+            handler
+            for handler in logger.handlers
+            if not isinstance(handler, QueueHandler)
+        ]
+        if not handlers:
+            continue
+
+        log_queue = queue.SimpleQueue()
+        queue_handler = DeferredFormattingQueueHandler(log_queue)
+        queue_handler.addFilter(sampling_filter)
+        for handler in handlers:
+            logger.removeHandler(handler)
+        logger.addHandler(queue_handler)
+
+        listener = QueueListener(log_queue, *handlers, respect_handler_level=True)
+        listener.start()
+        _running_listeners.append(listener)
+        listeners.append(listener)
+    return listeners
@@ -0,0 +1,322 @@
+import os
+import time
+
+import orjson
+
+from app.db_connection import get_pool_statistics
+from app.utils.category_cache import category_cache
+from app.utils.pool_stats import LatencyHistogram
+
+METRICS_MULTIPROCESS_DIR = os.getenv("METRICS_MULTIPROCESS_DIR")
+METRICS_FLUSH_INTERVAL = float(os.getenv("METRICS_FLUSH_INTERVAL", "5"))
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+UNMATCHED_ROUTE = "<unmatched>"
+POOL_GAUGES = ("size", "checked_in", "checked_out", "overflow")
+POOL_HISTOGRAMS = {
+    "checkout_wait": "db_pool_checkout_wait_seconds",
+    "connect_latency": "db_pool_connect_seconds",
+}
+
+
+class RequestMetrics:
+    """Request counters for this worker.
+
+    Only ``MetricsMiddleware`` and the async ``/metrics`` route touch these,
+    both on the event loop thread, so plain dict and int updates are safe
+    without a lock.
+    """
+
+    def __init__(self):
+        self.in_flight = 0
+        self.latency = {}
+        self.responses = {}
+
+    def observe(self, method, route, status_code, seconds):
+        histogram = self.latency.get((method, route))
+        if histogram is None:
+            histogram = self.latency[(method, route)] = LatencyHistogram()
+        histogram.observe(seconds)
+        key = (method, route, str(status_code))
+        self.responses[key] = self.responses.get(key, 0) + 1
+
+    def snapshot(self):
+        return {
+            "in_flight": self.in_flight,
+            "latency": [
+                [method, route, histogram.snapshot()]
+                for (method, route), histogram in self.latency.items()
+            ],
+            "responses": [
+                [method, route, status, count]
+                for (method, route, status), count in self.responses.items()
+            ],
+        }
+
+
+request_metrics = RequestMetrics()
+_last_flush = 0.0
+
+
+def collect():
+    """Everything this worker exports, as JSON-friendly data."""
+    return {
+        "pid": os.getpid(),
+        "requests": request_metrics.snapshot(),
+        "pools": get_pool_statistics(),
+        "caches": {"category": category_cache.stats()},
+    }
+
+
+def write_snapshot(directory):
+    """Publish this worker's metrics for the other workers to aggregate."""
+    path = os.path.join(directory, f"{os.getpid()}.json")
+    with open(path + ".tmp", "wb") as snapshot_file:
+        snapshot_file.write(orjson.dumps(collect()))
+    os.replace(path + ".tmp", path)
+
+
+def maybe_flush():
+    global _last_flush
+    now = time.monotonic()
+    if now - _last_flush >= METRICS_FLUSH_INTERVAL:
+        _last_flush = now
+        write_snapshot(METRICS_MULTIPROCESS_DIR)
+
+
+def read_snapshots(directory):
+    snapshots = []
+    for name in sorted(os.listdir(directory)):
+        if not name.endswith(".json"):
+            continue
+        try:
+            with open(os.path.join(directory, name), "rb") as snapshot_file:
+                snapshots.append(orjson.loads(snapshot_file.read()))
+        except (OSError, orjson.JSONDecodeError):
+            # removed or half written between listdir and open
+            continue
+    return snapshots
+
+
+def _is_alive(pid):
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        pass
+    return True
+
+
+def _add_histogram(histograms, key, histogram):
+    total = histograms.get(key)
+    if total is None:
+        histograms[key] = {
+            "buckets_ms": histogram["buckets_ms"],
+            "counts": list(histogram["counts"]),
+            "count": histogram["count"],
+            "sum_ms": histogram["sum_ms"],
+        }
+        return
+    total["counts"] = [a + b for a, b in zip(total["counts"], histogram["counts"])]
+    total["count"] += histogram["count"]
+    total["sum_ms"] += histogram["sum_ms"]
+
+
+def aggregate(snapshots):
+    """Sum per-worker snapshots into one set of metrics.
+
+    Counters and histograms from exited workers still count, so totals never
+    go backwards; gauges only come from workers that are still running.
+    """
+    metrics = {
+        "in_flight": 0,
+        "latency": {},
+        "responses": {},
+        "pool_gauges": {},
+        "pool_timeouts": {},
+        "pool_histograms": {},
+        "caches": {},
+    }
+    for snapshot in snapshots:
+        alive = snapshot["pid"] == os.getpid() or _is_alive(snapshot["pid"])
+        requests = snapshot["requests"]
+
+        if alive:
+            metrics["in_flight"] += requests["in_flight"]
+        for method, route, histogram in requests["latency"]:
+            _add_histogram(metrics["latency"], (method, route), histogram)
+        for method, route, status, count in requests["responses"]:
+            key = (method, route, status)
+            metrics["responses"][key] = metrics["responses"].get(key, 0) + count
+
+        for engine_name, pool in snapshot["pools"].items():
+            if alive:
+                for gauge in POOL_GAUGES:
+                    key = (gauge, engine_name)
+                    metrics["pool_gauges"][key] = (
+                        metrics["pool_gauges"].get(key, 0) + pool[gauge]
+                    )
+            metrics["pool_timeouts"][engine_name] = (
+                metrics["pool_timeouts"].get(engine_name, 0) + pool["checkout_timeouts"]
+            )
+            for field in POOL_HISTOGRAMS:
+                _add_histogram(
+                    metrics["pool_histograms"], (field, engine_name), pool[field]
+                )
+
+        for cache_name, stats in snapshot["caches"].items():
+            total = metrics["caches"].setdefault(
+                cache_name, {"hits": 0, "negative_hits": 0, "misses": 0}
+            )
+            for field in total:
+                total[field] += stats[field]
+    return metrics
+
+
+def _labels(**labels):
+    escaped = (
+        (name, str(value).replace("\\", r"\\").replace('"', r"\"").replace("\n", r"\n"))
+        for name, value in labels.items()
+    )
+    return "{" + ",".join(f'{name}="{value}"' for name, value in escaped) + "}"
+
+
+def _render_histogram(lines, name, histogram, **labels):
+    cumulative = 0
+    for bound_ms, count in zip(histogram["buckets_ms"], histogram["counts"]):
+        cumulative += count
+        lines.append(
+            f"{name}_bucket{_labels(**labels, le=f'{bound_ms / 1000:g}')} {cumulative}"
+        )
+    lines.append(f"{name}_bucket{_labels(**labels, le='+Inf')} {histogram['count']}")
+    lines.append(f"{name}_sum{_labels(**labels)} {histogram['sum_ms'] / 1000:.6f}")
+    lines.append(f"{name}_count{_labels(**labels)} {histogram['count']}")
+
+
+def render_metrics(metrics):
+    """Render ``aggregate`` output in the Prometheus text exposition format."""
+    lines = [
+        "# HELP http_requests_in_flight Requests currently being served.",
+        "# TYPE http_requests_in_flight gauge",
+        f"http_requests_in_flight {metrics['in_flight']}",
+        "# HELP http_request_duration_seconds Request latency by route template.",
+        "# TYPE http_request_duration_seconds histogram",
+    ]
+    for (method, route), histogram in sorted(metrics["latency"].items()):
+        _render_histogram(
+            lines,
+            "http_request_duration_seconds",
+            histogram,
+            method=method,
+            route=route,
+        )
+
+    lines += [
+        "# HELP http_responses_total Responses by route template and status code.",
+        "# TYPE http_responses_total counter",
+    ]
+    for (method, route, status), count in sorted(metrics["responses"].items()):
+        lines.append(
+            f"http_responses_total{_labels(method=method, route=route, status=status)}"
+            f" {count}"
+        )
+
+    for gauge in POOL_GAUGES:
+        lines += [
+            f"# HELP db_pool_{gauge} Connection pool {gauge.replace('_', ' ')}.",
+            f"# TYPE db_pool_{gauge} gauge",
+        ]
+        for (name, engine_name), value in sorted(metrics["pool_gauges"].items()):
+            if name == gauge:
+                lines.append(f"db_pool_{gauge}{_labels(engine=engine_name)} {value}")
+
+    lines += [
+        "# HELP db_pool_checkout_timeouts_total Pool checkouts that timed out.",
+        "# TYPE db_pool_checkout_timeouts_total counter",
+    ]
+    for engine_name, count in sorted(metrics["pool_timeouts"].items()):
+        lines.append(
+            f"db_pool_checkout_timeouts_total{_labels(engine=engine_name)} {count}"
+        )
+
+    for field, name in POOL_HISTOGRAMS.items():
+        lines += [
+            f"# HELP {name} Connection pool {field.replace('_', ' ')}.",
+            f"# TYPE {name} histogram",
+        ]
+        for (histogram_field, engine_name), histogram in sorted(
+            metrics["pool_histograms"].items()
+        ):
+            if histogram_field == field:
+                _render_histogram(lines, name, histogram, engine=engine_name)
+
+    for name, field in (
+        ("cache_hits_total", "hits"),
+        ("cache_negative_hits_total", "negative_hits"),
+        ("cache_misses_total", "misses"),
+    ):
+        lines += [
+            f"# HELP {name} Cache lookups answered with {field.replace('_', ' ')}.",
+            f"# TYPE {name} counter",
+        ]
+        for cache_name, stats in sorted(metrics["caches"].items()):
+            lines.append(f"{name}{_labels(cache=cache_name)} {stats[field]}")
+
+    lines += [
+        "# HELP cache_hit_ratio Share of cache lookups served from the cache.",
+        "# TYPE cache_hit_ratio gauge",
+    ]
+    for cache_name, stats in sorted(metrics["caches"].items()):
+        lookups = stats["hits"] + stats["misses"]
+        ratio = stats["hits"] / lookups if lookups else 0.0
+        lines.append(f"cache_hit_ratio{_labels(cache=cache_name)} {ratio:.6f}")
+
+    return "\n".join(lines) + "\n"
+
+
+def current_metrics():
+    """Metrics for this worker, or for all workers in multi-process mode."""
+    if not METRICS_MULTIPROCESS_DIR:
+        return aggregate([collect()])
+    write_snapshot(METRICS_MULTIPROCESS_DIR)
+    return aggregate(read_snapshots(METRICS_MULTIPROCESS_DIR))
+
+
+class MetricsMiddleware:
+    """ASGI middleware recording latency and status per route template.
+
+    In multi-process mode (``METRICS_MULTIPROCESS_DIR`` set, one directory
+    shared by all workers and emptied before they start) each worker also
+    writes its counters there at most every ``METRICS_FLUSH_INTERVAL``
+    seconds, and ``/metrics`` on any worker sums them.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        request_metrics.in_flight += 1
+        started = time.perf_counter()
+        status_code = 500
+
+        async def send_with_status(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            request_metrics.in_flight -= 1
+            # the router leaves the matched route in the scope
+            route = getattr(scope.get("route"), "path", UNMATCHED_ROUTE)
+            request_metrics.observe(
+                scope["method"], route, status_code, time.perf_counter() - started
+            )
+            if METRICS_MULTIPROCESS_DIR:
+                maybe_flush()
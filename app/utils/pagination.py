@@ -0,0 +1,45 @@
+import base64
+import binascii
+import json
+
+from fastapi import HTTPException
+from sqlalchemy import tuple_
+
+
+def encode_cursor(order_by: str, values: list) -> str:
+    payload = json.dumps({"o": order_by, "v": values}, separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, order_by: str, columns) -> list:
+    """Decode a cursor produced by ``encode_cursor`` for the given ordering.
+
+    Raises a 400 if the token is malformed or was issued for another ordering.
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        values = payload["v"]
+        valid = (
+            payload["o"] == order_by
+            and isinstance(values, list)
+            and len(values) == len(columns)
+            and all(
+                isinstance(value, column.type.python_type)
+                and not isinstance(value, bool)
+                for value, column in zip(values, columns)
+            )
+        )
+    except (binascii.Error, ValueError, TypeError, KeyError):
+        valid = False
+
+    if not valid:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    return values
+
+
+def apply_keyset(query, columns, cursor_values=None):
+    """Order ``query`` by ``columns`` and skip everything up to the cursor."""
+    if cursor_values is not None:
+        query = query.filter(tuple_(*columns) > tuple_(*cursor_values))
+    return query.order_by(*columns)
@@ -0,0 +1,109 @@
+import threading
+import time
+
+from sqlalchemy import event, exc
+
+LATENCY_BUCKETS_MS = (1, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000)
+
+
+class LatencyHistogram:
+    """Cumulative latency histogram with fixed millisecond buckets."""
+
+    def __init__(self, buckets_ms=LATENCY_BUCKETS_MS):
+        self.buckets_ms = tuple(buckets_ms)
+        self.counts = [0] * (len(self.buckets_ms) + 1)
+        self.count = 0
+        self.sum_ms = 0.0
+        self.max_ms = 0.0
+
+    def observe(self, seconds):
+        value_ms = seconds * 1000
+        index = len(self.buckets_ms)
+        for i, bound in enumerate(self.buckets_ms):
+            if value_ms <= bound:
+                index = i
+                break
+        self.counts[index] += 1
+        self.count += 1
+        self.sum_ms += value_ms
+        self.max_ms = max(self.max_ms, value_ms)
+
+    def snapshot(self):
+        return {
+            "buckets_ms": list(self.buckets_ms),
+            "counts": list(self.counts),
+            "count": self.count,
+            "sum_ms": round(self.sum_ms, 3),
+            "max_ms": round(self.max_ms, 3),
+        }
+
+
+class PoolStats:
+    """Checkout and connect statistics for one engine's connection pool."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.checkout_wait = LatencyHistogram()
+        self.connect_latency = LatencyHistogram()
+        self.checkout_timeouts = 0
+
+    def observe_checkout(self, seconds):
+        with self._lock:
+            self.checkout_wait.observe(seconds)
+
+    def observe_checkout_timeout(self):
+        with self._lock:
+            self.checkout_timeouts += 1
+
+    def observe_connect(self, seconds):
+        with self._lock:
+            self.connect_latency.observe(seconds)
+
+    def attach(self, engine):
+        """Time new DBAPI connections opened by ``engine``."""
+
+        @event.listens_for(engine, "do_connect")
+        def timed_connect(dialect, conn_rec, cargs, cparams):
+            start = time.perf_counter()
+            try:
+                return dialect.connect(*cargs, **cparams)
+            finally:
+                self.observe_connect(time.perf_counter() - start)
+
+    def snapshot(self, pool):
+        with self._lock:
+            return {
+                "pool_class": type(pool).__name__,
+                "size": pool.size(),
+                "checked_in": pool.checkedin(),
+                "checked_out": pool.checkedout(),
+                "overflow": pool.overflow(),
+                "max_overflow": getattr(pool, "_max_overflow", None),
+                "timeout": pool.timeout(),
+                "checkout_timeouts": self.checkout_timeouts,
+                "checkout_wait": self.checkout_wait.snapshot(),
+                "connect_latency": self.connect_latency.snapshot(),
+            }
+
+
+def instrumented_pool_class(base, stats):
+    """Return a subclass of the pool class ``base`` that reports to ``stats``.
+
+    The wait is measured around ``Pool.connect`` so it covers both queueing
+    for a free connection and opening a new one when the pool can grow.
+    """
+
+    class InstrumentedPool(base):
+        def connect(self):
+            start = time.perf_counter()
+            try:
+                return super().connect()
+            except exc.TimeoutError:
+                stats.observe_checkout_timeout()
+                raise
+            finally:
+                stats.observe_checkout(time.perf_counter() - start)
+
+    InstrumentedPool.__name__ = f"Instrumented{base.__name__}"
+    InstrumentedPool.__qualname__ = InstrumentedPool.__name__
+    return InstrumentedPool
@@ -0,0 +1,17 @@
+from app.models import AttributeValue, Product, ProductLine
+from sqlalchemy.orm import joinedload, selectinload
+
+# Everything a product response needs, in one query per level: products,
+# their lines, the lines' images and the lines' attribute values (with the
+# attribute joined in). The count stays the same however many rows each
+# level returns.
+PRODUCT_DETAIL_OPTIONS = (
+    selectinload(Product.product_lines).selectinload(ProductLine.product_images),
+    selectinload(Product.product_lines)
+    .selectinload(ProductLine.attribute_values)
+    .joinedload(AttributeValue.attribute),
+)
+
+
+def product_detail_query(db):
+    return db.query(Product).options(*PRODUCT_DETAIL_OPTIONS)
@@ -0,0 +1,139 @@
+import logging
+import os
+import time
+from contextvars import ContextVar
+
+from sqlalchemy import event
+from starlette.datastructures import MutableHeaders
+
+logger = logging.getLogger("app")
+
+SLOW_QUERY_THRESHOLD_MS = float(os.getenv("SLOW_QUERY_THRESHOLD_MS", "500"))
+REDACTED = "<redacted>"
+
+
+class QueryStats:
+    """SQL statement count and timings collected for one request."""
+
+    def __init__(self):
+        self.count = 0
+        self.total_seconds = 0.0
+        self.slowest_seconds = 0.0
+        self.slowest_statement = None
+
+    def observe(self, statement, seconds):
+        self.count += 1
+        self.total_seconds += seconds
+        if seconds >= self.slowest_seconds:
+            self.slowest_seconds = seconds
+            self.slowest_statement = statement
+
+    def server_timing(self, request_seconds):
+        return (
+            f'db;dur={self.total_seconds * 1000:.2f};desc="{self.count} queries", '
+            f"db-slowest;dur={self.slowest_seconds * 1000:.2f}, "
+            f"app;dur={request_seconds * 1000:.2f}"
+        )
+
+    def log_fields(self):
+        return {
+            "db_statements": self.count,
+            "db_time_ms": round(self.total_seconds * 1000, 3),
+            "db_slowest_ms": round(self.slowest_seconds * 1000, 3),
+        }
+
+
+current_query_stats: ContextVar = ContextVar("current_query_stats", default=None)
+
+
+def redact_parameters(parameters):
+    """Keep the shape of statement parameters but none of their values."""
+    if isinstance(parameters, dict):
+        return {key: REDACTED for key in parameters}
+    if isinstance(parameters, (list, tuple)):
+        if parameters and isinstance(parameters[0], (dict, list, tuple)):
+            # executemany: one parameter set per row
+            return f"<{len(parameters)} parameter sets>"
+        return [REDACTED] * len(parameters)
+    return REDACTED if parameters is not None else None
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    # kept on the execution context rather than conn.info: the context goes
+    # away with the statement even when it raises, the pooled connection stays
+    context.query_start = time.perf_counter()
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    elapsed = time.perf_counter() - context.query_start
+
+    stats = current_query_stats.get()
+    if stats is not None:
+        stats.observe(statement, elapsed)
+
+    if elapsed * 1000 >= SLOW_QUERY_THRESHOLD_MS:
+        logger.warning(
+            f"Slow query ({elapsed * 1000:.1f} ms): {statement}",
+            extra={
+                "db_duration_ms": round(elapsed * 1000, 3),
+                "db_statement": statement,
+                "db_parameters": redact_parameters(parameters),
+            },
+        )
+
+
+def attach(engine):
+    """Time every statement run through ``engine`` (a sync ``Engine``)."""
+    event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+
+
+class QueryStatsMiddleware:
+    """ASGI middleware that reports the SQL work done for each request.
+
+    The totals go out as a ``Server-Timing`` header and as fields on one log
+    record per request. Statements issued after the response has started
+    (streamed bodies) are only counted in the log record.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        stats = QueryStats()
+        token = current_query_stats.set(stats)
+        started = time.perf_counter()
+        status_code = 500
+
+        async def send_with_timing(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                headers = MutableHeaders(scope=message)
+                headers.append(
+                    "Server-Timing",
+                    stats.server_timing(time.perf_counter() - started),
+                )
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            current_query_stats.reset(token)
+            fields = stats.log_fields()
+            logger.info(
+                f"{scope['method']} {scope['path']} {status_code} "
+                f"db_statements={fields['db_statements']} "
+                f"db_time_ms={fields['db_time_ms']}",
+                extra={
+                    "method": scope["method"],
+                    "path": scope["path"],
+                    "status_code": status_code,
+                    "duration_ms": round((time.perf_counter() - started) * 1000, 3),
+                    **fields,
+                },
+            )
@@ -0,0 +1,151 @@
+import itertools
+import logging
+import threading
+import time
+from http.cookies import SimpleCookie
+
+from sqlalchemy import exc, text
+
+logger = logging.getLogger("app")
+
+# the lag is zero while a replica has replayed everything it received, even
+# if the last write was long ago
+REPLICA_STATUS_QUERY = text(
+    "SELECT pg_is_in_recovery(), "
+    "CASE WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0 "
+    "ELSE EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()) END"
+)
+
+READ_YOUR_WRITES_COOKIE = "db_primary_until"
+SAFE_METHODS = ("GET", "HEAD", "OPTIONS")
+
+
+def parse_replica_urls(value):
+    """``"url1,url2"`` -> ``{"replica1": "url1", "replica2": "url2"}``."""
+    urls = [url.strip() for url in value.split(",") if url.strip()]
+    return {f"replica{index}": url for index, url in enumerate(urls, start=1)}
+
+
+class Replica:
+    def __init__(self, name, engine):
+        self.name = name
+        self.engine = engine
+        # unknown until the first check
+        self.healthy = None
+        self.lag_seconds = None
+        self.error = None
+        self.checked_at = 0.0
+
+
+class ReplicaRouter:
+    """Picks the engine behind each read-only session.
+
+    Replicas are checked at most every ``check_interval`` seconds, by the
+    request that finds their status expired. One that cannot be reached or
+    lags more than ``max_lag`` seconds is skipped until a later check passes,
+    and reads go to the primary while no replica is usable.
+    """
+
+    def __init__(self, primary, replicas, max_lag, check_interval):
+        self.primary = primary
+        self.replicas = [Replica(name, engine) for name, engine in replicas.items()]
+        self.max_lag = max_lag
+        self.check_interval = check_interval
+        self._turn = itertools.count()
+        self._lock = threading.Lock()
+
+    def check(self, replica):
+        try:
+            with replica.engine.connect() as connection:
+                in_recovery, lag = connection.execute(REPLICA_STATUS_QUERY).one()
+            # a server that is not in recovery (say, a logical subscriber)
+            # cannot report its lag
+            lag = float(lag or 0) if in_recovery else 0.0
+            error = (
+                f"lag {lag:.1f}s over {self.max_lag}s" if lag > self.max_lag else None
+            )
+        except exc.SQLAlchemyError as e:
+            lag, error = None, str(e).splitlines()[0]
+
+        healthy = error is None
+        if healthy != replica.healthy:
+            if healthy:
+                logger.info(f"Replica {replica.name} in rotation, lag {lag:.1f}s")
+            else:
+                logger.warning(f"Replica {replica.name} out of rotation: {error}")
+        replica.healthy, replica.lag_seconds, replica.error = healthy, lag, error
+
+    def refresh(self):
+        now = time.monotonic()
+        with self._lock:
+            due = [
+                r for r in self.replicas if now - r.checked_at >= self.check_interval
+            ]
+            # claimed under the lock so concurrent requests do not all check
+            for replica in due:
+                replica.checked_at = now
+        for replica in due:
+            self.check(replica)
+
+    def read_target(self):
+        """``(engine, replica name)`` for a read, the name is None on the primary."""
+        if not self.replicas:
+            return self.primary, None
+        self.refresh()
+        usable = [replica for replica in self.replicas if replica.healthy]
+        if not usable:
+            return self.primary, None
+        replica = usable[next(self._turn) % len(usable)]
+        return replica.engine, replica.name
+
+    def status(self):
+        return {
+            replica.name: {
+                "healthy": replica.healthy,
+                "lag_seconds": replica.lag_seconds,
+                "error": replica.error,
+            }
+            for replica in self.replicas
+        }
+
+
+def wants_primary(cookies, now=None):
+    """Whether the client wrote recently enough that a replica may not have it."""
+    try:
+        until = float(cookies.get(READ_YOUR_WRITES_COOKIE, 0))
+    except ValueError:
+        return False
+    return until > (time.time() if now is None else now)
+
+
+class ReadYourWritesMiddleware:
+    """Send a client's reads to the primary for ``window`` seconds after it writes.
+
+    Successful requests with an unsafe method get a cookie holding the time
+    the window ends, which the read session dependency checks. A cookie works
+    across workers and needs no shared state.
+    """
+
+    def __init__(self, app, window):
+        self.app = app
+        self.window = window
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["method"] in SAFE_METHODS:
+            await self.app(scope, receive, send)
+            return
+
+        async def send_with_cookie(message):
+            if message["type"] == "http.response.start" and message["status"] < 400:
+                cookie = SimpleCookie()
+                cookie[READ_YOUR_WRITES_COOKIE] = f"{time.time() + self.window:.3f}"
+                cookie[READ_YOUR_WRITES_COOKIE]["max-age"] = int(self.window) + 1
+                cookie[READ_YOUR_WRITES_COOKIE]["path"] = "/"
+                cookie[READ_YOUR_WRITES_COOKIE]["httponly"] = True
+                cookie[READ_YOUR_WRITES_COOKIE]["samesite"] = "lax"
+                message["headers"] = list(message.get("headers", [])) + [
+                    (b"set-cookie", cookie.output(header="").strip().encode("latin-1"))
+                ]
+            await send(message)
+
+        await self.app(scope, receive, send_with_cookie)
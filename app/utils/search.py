@@ -0,0 +1,62 @@
+import os
+
+from app.models import Category, Product
+from sqlalchemy import Float, String, cast, func, literal, or_, select, union_all
+
+SEARCH_TEXT_CONFIG = "english"
+# pg_trgm's default of 0.6 misses most single-letter typos in short words
+SEARCH_WORD_SIMILARITY = os.getenv("SEARCH_WORD_SIMILARITY", "0.5")
+
+
+def _matches(model, kind, q, is_active=None):
+    tsquery = func.websearch_to_tsquery(SEARCH_TEXT_CONFIG, q)
+    # normalization 32 maps the rank to rank / (rank + 1), the same 0..1
+    # range as the trigram similarity it is compared with
+    score = func.greatest(
+        func.ts_rank_cd(model.search_vector, tsquery, 32),
+        func.word_similarity(q, model.name),
+    )
+    statement = select(
+        literal(kind, String).label("kind"),
+        model.id,
+        model.name,
+        model.slug,
+        cast(score, Float).label("score"),
+    ).where(
+        # both conditions are served by GIN indexes, combined in a bitmap OR
+        or_(
+            model.search_vector.op("@@")(tsquery),
+            literal(q, String).op("<%")(model.name),
+        )
+    )
+    if is_active is not None:
+        statement = statement.where(model.is_active == is_active)
+    return statement
+
+
+def search_results(q, is_active=None):
+    """Categories and products matching ``q``, as one selectable.
+
+    A row matches on the full-text vector (names and product descriptions,
+    stemmed) or on trigram word similarity of its name, which tolerates
+    typos. ``score`` is the better of the two.
+    """
+    return union_all(
+        _matches(Category, "category", q, is_active),
+        _matches(Product, "product", q, is_active),
+    ).subquery("search_results")
+
+
+def search_ordering(results):
+    """Best score first; kind and id make the order total for keyset paging."""
+    return (-results.c.score, results.c.kind, results.c.id)
+
+
+def set_similarity_threshold(db):
+    db.execute(
+        select(
+            func.set_config(
+                "pg_trgm.word_similarity_threshold", SEARCH_WORD_SIMILARITY, True
+            )
+        )
+    )
@@ -0,0 +1,80 @@
+import math
+import threading
+import time
+
+from app.models import Seasonal
+from app.utils.catalog_version import seasonal_event_version
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+
+
+def active_events_query():
+    """Events running now, and the next time any event starts or ends.
+
+    ``now`` is the database's local time, which the naive event timestamps
+    are written in, so the app's clock and time zone play no part.
+    """
+    now = func.localtimestamp()
+    active = (
+        select(func.array_agg(Seasonal.id))
+        .where(Seasonal.active_during.contains(now))
+        .scalar_subquery()
+    )
+    next_boundary = select(
+        func.least(
+            func.min(Seasonal.start_date).filter(Seasonal.start_date > now),
+            func.min(Seasonal.end_date).filter(Seasonal.end_date > now),
+        )
+    ).scalar_subquery()
+    return select(
+        now.label("now"),
+        active.label("event_ids"),
+        next_boundary.label("next_boundary"),
+    )
+
+
+class ActiveEventCache:
+    """Ids of the seasonal events running now, as last loaded by one worker.
+
+    The set only changes when an event starts or ends, or when events are
+    written. So it is kept until the next start or end date, counted on the
+    database clock, or until the version tracker reports a write, whichever
+    comes first. Without events ahead it is kept until the next write.
+    """
+
+    def __init__(self, version_tracker):
+        self._tracker = version_tracker
+        self._lock = threading.Lock()
+        self.version = None
+        self.event_ids = ()
+        # time.monotonic() at the next boundary
+        self.expires_at = 0.0
+
+    def get(self, db: Session):
+        version = self._tracker.current(db)
+        with self._lock:
+            if version == self.version and time.monotonic() < self.expires_at:
+                return self.event_ids
+        return self._load(db, version)
+
+    def _load(self, db: Session, version: int):
+        row = db.execute(active_events_query()).one()
+        if row.next_boundary is None:
+            expires_at = math.inf
+        else:
+            remaining = (row.next_boundary - row.now).total_seconds()
+            expires_at = time.monotonic() + remaining
+        event_ids = tuple(sorted(row.event_ids or ()))
+        with self._lock:
+            self.version = version
+            self.event_ids = event_ids
+            self.expires_at = expires_at
+        return event_ids
+
+    def invalidate(self):
+        with self._lock:
+            self.version = None
+        self._tracker.expire()
+
+
+active_event_cache = ActiveEventCache(seasonal_event_version)
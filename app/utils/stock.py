@@ -0,0 +1,257 @@
+import asyncio
+import logging
+import os
+from datetime import timedelta
+
+from app.models import ProductLine, StockReservation, StockReservationLine
+from fastapi import HTTPException
+from sqlalchemy import (
+    Integer,
+    String,
+    cast,
+    column,
+    func,
+    insert,
+    select,
+    true,
+    update,
+    values,
+)
+from sqlalchemy.orm import Session
+
+logger = logging.getLogger("app")
+
+RESERVATION_SWEEP_INTERVAL = float(os.getenv("RESERVATION_SWEEP_INTERVAL", "30"))
+RESERVATION_SWEEP_BATCH_SIZE = int(os.getenv("RESERVATION_SWEEP_BATCH_SIZE", "500"))
+
+# Every statement here locks product lines in id order, so reservations and
+# releases spanning several lines queue behind each other instead of
+# deadlocking. The locks last two round trips, the statement and its COMMIT
+# (or ROLLBACK), and the callers do nothing in between but look at the rows
+# it returned.
+
+
+def _restock(closed):
+    """Put back the stock held by the reservations ``closed`` returns."""
+    returned = (
+        select(
+            StockReservationLine.product_line_id,
+            func.sum(StockReservationLine.quantity).label("quantity"),
+        )
+        .join(closed, StockReservationLine.reservation_id == closed.c.id)
+        .group_by(StockReservationLine.product_line_id)
+        .cte("returned")
+    )
+    locked = (
+        select(ProductLine.id, returned.c.quantity)
+        .join(returned, ProductLine.id == returned.c.product_line_id)
+        .order_by(ProductLine.id)
+        .with_for_update(of=ProductLine)
+        .cte("locked")
+    )
+    restocked = (
+        update(ProductLine)
+        .where(ProductLine.id == locked.c.id)
+        .values(stock_qty=ProductLine.stock_qty + locked.c.quantity)
+        .returning(ProductLine.id)
+        .cte("restocked")
+    )
+    return select(closed.c.id).add_cte(restocked)
+
+
+def reserve_statement(lines: dict, ttl_seconds: int):
+    """Take stock for every ``{sku: quantity}`` line and record a reservation.
+
+    One statement: each line is decremented only ``WHERE stock_qty >=
+    quantity``, and the reservation is inserted only if every line was. The
+    result has a row per line taken, with a null reservation id when some
+    line was short, in which case the caller rolls back.
+    """
+    requested = values(
+        column("sku", String), column("quantity", Integer), name="requested"
+    ).data([(str(sku), quantity) for sku, quantity in lines.items()])
+    locked = (
+        select(ProductLine.id, ProductLine.sku, requested.c.quantity)
+        .join(requested, ProductLine.sku == cast(requested.c.sku, ProductLine.sku.type))
+        .where(ProductLine.is_active == true())
+        .order_by(ProductLine.id)
+        .with_for_update(of=ProductLine)
+        .cte("locked")
+    )
+    taken = (
+        update(ProductLine)
+        .where(
+            ProductLine.id == locked.c.id, ProductLine.stock_qty >= locked.c.quantity
+        )
+        .values(stock_qty=ProductLine.stock_qty - locked.c.quantity)
+        .returning(ProductLine.id, ProductLine.sku, locked.c.quantity)
+        .cte("taken")
+    )
+    reservation = (
+        insert(StockReservation)
+        .from_select(
+            ["expires_at"],
+            select(func.now() + timedelta(seconds=ttl_seconds)).where(
+                select(func.count()).select_from(taken).scalar_subquery() == len(lines)
+            ),
+        )
+        .returning(StockReservation.id, StockReservation.expires_at)
+        .cte("reservation")
+    )
+    reservation_lines = (
+        insert(StockReservationLine)
+        .from_select(
+            ["reservation_id", "product_line_id", "quantity"],
+            select(reservation.c.id, taken.c.id, taken.c.quantity),
+        )
+        .returning(StockReservationLine.product_line_id)
+        .cte("reservation_lines")
+    )
+    return (
+        select(
+            reservation.c.id,
+            reservation.c.expires_at,
+            taken.c.sku,
+            taken.c.quantity,
+        )
+        .select_from(taken)
+        .outerjoin(reservation, true())
+        # unreferenced data-modifying CTEs still run, but must be rendered
+        .add_cte(reservation_lines)
+    )
+
+
+def release_statement(reservation_id):
+    closed = (
+        update(StockReservation)
+        .where(StockReservation.id == reservation_id, StockReservation.status == "held")
+        .values(status="released", closed_at=func.now())
+        .returning(StockReservation.id)
+        .cte("closed")
+    )
+    return _restock(closed)
+
+
+def expire_statement(batch_size: int):
+    # SKIP LOCKED lets every worker sweep at once without waiting on the
+    # others, or on a release of the same reservation
+    due = (
+        select(StockReservation.id)
+        .where(
+            StockReservation.status == "held",
+            StockReservation.expires_at <= func.now(),
+        )
+        .order_by(StockReservation.expires_at)
+        .limit(batch_size)
+        .with_for_update(skip_locked=True)
+        .cte("due")
+    )
+    closed = (
+        update(StockReservation)
+        .where(StockReservation.id == due.c.id)
+        .values(status="expired", closed_at=func.now())
+        .returning(StockReservation.id)
+        .cte("closed")
+    )
+    return _restock(closed)
+
+
+def commit_statement(reservation_id):
+    return (
+        update(StockReservation)
+        .where(
+            StockReservation.id == reservation_id,
+            StockReservation.status == "held",
+            StockReservation.expires_at > func.now(),
+        )
+        .values(status="committed", closed_at=func.now())
+        .returning(StockReservation.id)
+    )
+
+
+def get_reservation(db: Session, reservation_id):
+    reservation = db.execute(
+        select(
+            StockReservation.id,
+            StockReservation.status,
+            StockReservation.expires_at,
+        ).where(StockReservation.id == reservation_id)
+    ).first()
+    if reservation is None:
+        raise HTTPException(status_code=404, detail="Reservation does not exist")
+    lines = db.execute(
+        select(ProductLine.sku, StockReservationLine.quantity)
+        .join(ProductLine, ProductLine.id == StockReservationLine.product_line_id)
+        .where(StockReservationLine.reservation_id == reservation_id)
+        .order_by(ProductLine.id)
+    ).all()
+    return {**reservation._asdict(), "lines": [line._asdict() for line in lines]}
+
+
+def reserve_stock(db: Session, lines: dict, ttl_seconds: int):
+    """Reserve every line or none; a 409 names the SKUs that were short."""
+    rows = db.execute(reserve_statement(lines, ttl_seconds)).all()
+
+    if len(rows) < len(lines) or rows[0].id is None:
+        db.rollback()
+        taken = {row.sku for row in rows}
+        short = sorted(str(sku) for sku in lines if sku not in taken)
+        raise HTTPException(
+            status_code=409,
+            detail={"message": "Insufficient stock", "skus": short},
+        )
+    db.commit()
+    return {
+        "id": rows[0].id,
+        "status": "held",
+        "expires_at": rows[0].expires_at,
+        "lines": [{"sku": row.sku, "quantity": row.quantity} for row in rows],
+    }
+
+
+def commit_reservation(db: Session, reservation_id):
+    committed = db.execute(commit_statement(reservation_id)).first()
+    db.commit()
+    reservation = get_reservation(db, reservation_id)
+    if committed is None and reservation["status"] != "committed":
+        # still held means past its expiry, just not swept yet
+        status = "expired" if reservation["status"] == "held" else reservation["status"]
+        raise HTTPException(status_code=409, detail=f"Reservation {status}")
+    return reservation
+
+
+def release_reservation(db: Session, reservation_id):
+    db.execute(release_statement(reservation_id)).first()
+    db.commit()
+    reservation = get_reservation(db, reservation_id)
+    if reservation["status"] == "committed":
+        raise HTTPException(status_code=409, detail="Reservation committed")
+    return reservation
+
+
+def expire_reservations(db: Session, batch_size=RESERVATION_SWEEP_BATCH_SIZE):
+    """Release held reservations past their expiry, one batch at a time."""
+    expired = 0
+    while True:
+        count = len(db.execute(expire_statement(batch_size)).all())
+        db.commit()
+        expired += count
+        if count < batch_size:
+            return expired
+
+
+def _expire_with(session_factory):
+    with session_factory() as db:
+        return expire_reservations(db)
+
+
+async def sweep_expired_reservations(session_factory, interval):
+    """Expire reservations every ``interval`` seconds until cancelled."""
+    while True:
+        await asyncio.sleep(interval)
+        try:
+            expired = await asyncio.to_thread(_expire_with, session_factory)
+            if expired:
+                logger.info(f"Expired {expired} stock reservations")
+        except Exception as e:
+            logger.error(f"Unexpected error while expiring reservations: {e}")
@@ -0,0 +1,103 @@
+"""Measure catalog import throughput on generated supplier feeds.
+
+Needs a Postgres database migrated to head. Feeds of ``--products``
+products with ``--lines`` product lines each are written to a temporary
+directory and imported twice, inside a transaction that is rolled back at
+the end, so the target database is left untouched:
+
+    python -m benchmarks.catalog_import --products 200000 --lines 3
+
+The first run inserts everything, the second finds every row unchanged,
+like a nightly feed without changes. Each reports rows/s per feed.
+"""
+
+import argparse
+import csv
+import os
+import tempfile
+import time
+import uuid
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session
+
+from app.models import Category
+from app.utils.catalog_import import import_catalog
+
+
+def write_feeds(directory, run_id, products, lines):
+    paths = {
+        "products": os.path.join(directory, "products.csv"),
+        "product_lines": os.path.join(directory, "product_lines.csv"),
+        "product_images": os.path.join(directory, "product_images.csv"),
+    }
+    with open(paths["products"], "w", newline="") as product_feed, open(
+        paths["product_lines"], "w", newline=""
+    ) as line_feed, open(paths["product_images"], "w", newline="") as image_feed:
+        product_writer = csv.writer(product_feed)
+        line_writer = csv.writer(line_feed)
+        image_writer = csv.writer(image_feed)
+        product_writer.writerow(["slug", "name", "description", "category"])
+        line_writer.writerow(
+            ["sku", "product", "price", "stock_qty", "order", "weight"]
+        )
+        image_writer.writerow(["alternative_text", "sku", "url", "order"])
+
+        for product in range(products):
+            slug = f"bench-{run_id}-{product}"
+            product_writer.writerow(
+                [slug, slug, f"Generated product {product}", f"bench-{run_id}"]
+            )
+            for order in range(1, lines + 1):
+                sku = uuid.uuid4()
+                line_writer.writerow([sku, slug, "9.99", 10, order, 1.0])
+                image_writer.writerow(
+                    [f"{slug}-{order}", sku, f"https://example.com/{sku}.png", 1]
+                )
+    return paths
+
+
+def report(label, stats, elapsed):
+    rows = sum(feed["staged"] for feed in stats.values())
+    print(f"{label}: {rows} rows in {elapsed:.1f}s ({rows / elapsed:.0f} rows/s)")
+    for feed, feed_stats in stats.items():
+        print(
+            f"  {feed:<16} {feed_stats['inserted']:>9} inserted"
+            f" {feed_stats['updated']:>9} updated"
+            f" {feed_stats['unchanged']:>9} unchanged"
+            f" {feed_stats['skipped']:>7} skipped"
+            f"  merge {feed_stats['seconds']:.2f}s"
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--products", type=int, default=200_000)
+    parser.add_argument("--lines", type=int, default=3)
+    parser.add_argument("--chunk-rows", type=int, default=50_000)
+    parser.add_argument("--database-url", default=os.getenv("DEV_DATABASE_URL"))
+    args = parser.parse_args()
+
+    run_id = uuid.uuid4().hex[:8]
+    engine = create_engine(args.database_url)
+    with tempfile.TemporaryDirectory() as directory, engine.connect() as connection:
+        started = time.perf_counter()
+        paths = write_feeds(directory, run_id, args.products, args.lines)
+        print(f"wrote feeds in {time.perf_counter() - started:.1f}s")
+
+        transaction = connection.begin()
+        try:
+            db = Session(bind=connection, join_transaction_mode="create_savepoint")
+            db.add(Category(name=f"bench-{run_id}", slug=f"bench-{run_id}"))
+            db.commit()
+
+            for label in ("first import", "unchanged import"):
+                started = time.perf_counter()
+                stats = import_catalog(db, paths, args.chunk_rows)
+                report(label, stats, time.perf_counter() - started)
+        finally:
+            transaction.rollback()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,115 @@
+"""Compare loading categories as ORM entities against projected column rows.
+
+Needs a Postgres database migrated to head. Rows are inserted inside a
+transaction that is rolled back at the end, so the target database is left
+untouched:
+
+    python -m benchmarks.category_projection --rows 100000
+    python -m benchmarks.category_projection --database-url postgresql://...
+
+* ``entities``: ``db.query(Category)`` then per-object model validation, the
+  way the read endpoints used to work.
+* ``columns``: ``db.query(*CATEGORY_RETURN_COLUMNS)`` validated in one
+  ``TypeAdapter`` call, the way they work now.
+"""
+
+import argparse
+import gc
+import os
+import time
+import tracemalloc
+import uuid
+from typing import List
+
+from pydantic import TypeAdapter
+from sqlalchemy import create_engine, insert
+from sqlalchemy.orm import Session
+
+from app.models import Category
+from app.schemas.category_schema import CategoryReturn
+from app.utils.category_utils import CATEGORY_RETURN_COLUMNS
+
+INSERT_CHUNK_SIZE = 5000
+category_models_adapter = TypeAdapter(List[CategoryReturn])
+
+
+def seed_categories(db, count):
+    run_id = uuid.uuid4().hex[:8]
+    for start in range(0, count, INSERT_CHUNK_SIZE):
+        db.execute(
+            insert(Category),
+            [
+                {
+                    "name": f"bench-{run_id}-{i}",
+                    "slug": f"bench-{run_id}-{i}",
+                    "is_active": i % 2 == 0,
+                    "level": i % 20,
+                }
+                for i in range(start, min(start + INSERT_CHUNK_SIZE, count))
+            ],
+        )
+
+
+def load_entities(db):
+    return [
+        CategoryReturn.model_validate(category, from_attributes=True)
+        for category in db.query(Category).all()
+    ]
+
+
+def load_columns(db):
+    return category_models_adapter.validate_python(
+        db.query(*CATEGORY_RETURN_COLUMNS).all(), from_attributes=True
+    )
+
+
+def measure(name, load, db):
+    # Time and memory are taken in separate runs: tracemalloc slows down
+    # allocation-heavy code enough to distort the timings.
+    db.expunge_all()
+    gc.collect()
+    started = time.perf_counter()
+    categories = load(db)
+    elapsed = time.perf_counter() - started
+    del categories
+
+    db.expunge_all()
+    gc.collect()
+    tracemalloc.start()
+    categories = load(db)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(
+        f"{name:<9} {elapsed * 1000:9.1f} ms  peak {peak / 2**20:7.1f} MiB"
+        f"  {len(categories)} rows"
+    )
+    return elapsed, peak
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=100_000)
+    parser.add_argument("--database-url", default=os.getenv("DEV_DATABASE_URL"))
+    args = parser.parse_args()
+    if not args.database_url:
+        parser.error("--database-url or DEV_DATABASE_URL is required")
+
+    engine = create_engine(args.database_url)
+    with engine.connect() as connection:
+        transaction = connection.begin()
+        try:
+            db = Session(bind=connection, join_transaction_mode="create_savepoint")
+            seed_categories(db, args.rows)
+
+            entities_time, entities_peak = measure("entities", load_entities, db)
+            columns_time, columns_peak = measure("columns", load_columns, db)
+            print(
+                f"columns: {entities_time / columns_time:.1f}x faster, "
+                f"{entities_peak / columns_peak:.1f}x less peak memory"
+            )
+        finally:
+            transaction.rollback()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+"""Compare sync and async category endpoint throughput.
+
+Run the app against a local Postgres with a single worker, then point this
+script at it:
+
+    uvicorn app.main:app --workers 1
+    python benchmarks/category_throughput.py --seed 500 --concurrency 200
+"""
+
+import argparse
+import asyncio
+import statistics
+import time
+import uuid
+
+import httpx
+
+SYNC_PREFIX = "/api/category"
+ASYNC_PREFIX = "/api/async/category"
+
+
+async def seed_categories(client, count):
+    run_id = uuid.uuid4().hex[:8]
+    for i in range(count):
+        await client.post(
+            f"{SYNC_PREFIX}/",
+            json={
+                "name": f"bench-{run_id}-{i}",
+                "slug": f"bench-{run_id}-{i}",
+                "is_active": True,
+                "level": 100,
+            },
+        )
+
+
+async def run_load(client, path, total_requests, concurrency):
+    latencies = []
+    errors = 0
+    remaining = iter(range(total_requests))
+
+    async def worker():
+        nonlocal errors
+        for _ in remaining:
+            start = time.perf_counter()
+            response = await client.get(path)
+            latencies.append(time.perf_counter() - start)
+            if response.status_code != 200:
+                errors += 1
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - start
+
+    latencies.sort()
+    return {
+        "path": path,
+        "requests": total_requests,
+        "errors": errors,
+        "rps": total_requests / elapsed,
+        "p50_ms": statistics.median(latencies) * 1000,
+        "p99_ms": latencies[int(len(latencies) * 0.99) - 1] * 1000,
+    }
+
+
+async def main(args):
+    limits = httpx.Limits(
+        max_connections=args.concurrency, max_keepalive_connections=args.concurrency
+    )
+    async with httpx.AsyncClient(
+        base_url=args.base_url, limits=limits, timeout=60
+    ) as client:
+        if args.seed:
+            await seed_categories(client, args.seed)
+
+        categories = (await client.get(f"{SYNC_PREFIX}/")).json()
+        if not categories:
+            raise SystemExit("No categories found, run with --seed N first")
+        slug = categories[0]["slug"]
+
+        paths = [
+            f"{SYNC_PREFIX}/",
+            f"{ASYNC_PREFIX}/",
+            f"{SYNC_PREFIX}/slug/{slug}",
+            f"{ASYNC_PREFIX}/slug/{slug}",
+        ]
+
+        print(f"{'path':<50} {'rps':>10} {'p50 ms':>10} {'p99 ms':>10} {'errors':>8}")
+        for path in paths:
+            # warm up the pool and the server before measuring
+            await run_load(client, path, args.concurrency, args.concurrency)
+            result = await run_load(client, path, args.requests, args.concurrency)
+            print(
+                f"{result['path']:<50} {result['rps']:>10.1f} "
+                f"{result['p50_ms']:>10.2f} {result['p99_ms']:>10.2f} "
+                f"{result['errors']:>8}"
+            )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--base-url", default="http://127.0.0.1:8000")
+    parser.add_argument("--requests", type=int, default=5000)
+    parser.add_argument("--concurrency", type=int, default=200)
+    parser.add_argument(
+        "--seed", type=int, default=0, help="create N categories before running"
+    )
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,123 @@
+"""Compare request-path latency with direct and queued logging handlers.
+
+Worker threads stand in for the server's threadpool: each simulated request
+does a little work and logs a few records with ``extra`` fields, the way the
+query stats middleware does. No server or database is needed:
+
+    python -m benchmarks.logging_latency --threads 32 --requests 2000
+
+``direct`` writes through ``FileHandler``s on the calling thread (the old
+``logging.conf`` setup); ``queued`` puts the same handlers behind
+``start_queued_logging``. ``--write-delay-ms`` makes every write block for a
+while, as a busy disk or a slow stdout consumer would:
+
+    python -m benchmarks.logging_latency --write-delay-ms 0.5
+"""
+
+import argparse
+import logging
+import os
+import statistics
+import tempfile
+import threading
+import time
+
+from app.utils.logging_utils import (
+    JsonFormatter,
+    start_queued_logging,
+    stop_queued_logging,
+)
+
+LOG_CALLS_PER_REQUEST = 3
+
+
+class SlowFileHandler(logging.FileHandler):
+    def __init__(self, filename, delay_seconds):
+        super().__init__(filename)
+        self.delay_seconds = delay_seconds
+
+    def emit(self, record):
+        super().emit(record)
+        if self.delay_seconds:
+            time.sleep(self.delay_seconds)
+
+
+def build_logger(name, directory, delay_seconds):
+    logger = logging.getLogger(name)
+    logger.setLevel(logging.DEBUG)
+    logger.propagate = False
+    for filename in ("app.log", "dev.log"):
+        handler = SlowFileHandler(
+            os.path.join(directory, f"{name}-{filename}"), delay_seconds
+        )
+        handler.setFormatter(JsonFormatter())
+        logger.addHandler(handler)
+    return logger
+
+
+def simulated_request(logger, index):
+    started = time.perf_counter()
+    payload = sum(i * i for i in range(200))
+    for call in range(LOG_CALLS_PER_REQUEST):
+        logger.info(
+            f"GET /api/category/{index} 200",
+            extra={"path": f"/api/category/{index}", "call": call, "work": payload},
+        )
+    return time.perf_counter() - started
+
+
+def run(name, logger, threads, requests):
+    latencies = []
+    lock = threading.Lock()
+
+    def worker():
+        local = [simulated_request(logger, i) for i in range(requests)]
+        with lock:
+            latencies.extend(local)
+
+    workers = [threading.Thread(target=worker) for _ in range(threads)]
+    started = time.perf_counter()
+    for thread in workers:
+        thread.start()
+    for thread in workers:
+        thread.join()
+    elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    p99 = latencies[int(len(latencies) * 0.99) - 1]
+    print(
+        f"{name:<7} p50 {statistics.median(latencies) * 1e6:8.1f} us"
+        f"  p99 {p99 * 1e6:8.1f} us"
+        f"  {len(latencies) / elapsed:9.0f} req/s"
+    )
+    return p99
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--threads", type=int, default=32)
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--write-delay-ms", type=float, default=0.0)
+    args = parser.parse_args()
+    delay_seconds = args.write_delay_ms / 1000
+
+    with tempfile.TemporaryDirectory() as directory:
+        direct = run(
+            "direct",
+            build_logger("direct", directory, delay_seconds),
+            args.threads,
+            args.requests,
+        )
+
+        queued_logger = build_logger("queued", directory, delay_seconds)
+        listeners = start_queued_logging(("queued",))
+        queued = run("queued", queued_logger, args.threads, args.requests)
+        drain_started = time.perf_counter()
+        stop_queued_logging(listeners)
+        print(f"queued listener drained in {time.perf_counter() - drain_started:.2f} s")
+
+    print(f"p99 direct / queued: {direct / queued:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
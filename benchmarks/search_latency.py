@@ -0,0 +1,130 @@
+"""Measure /api/search query latency on a large generated catalog.
+
+Needs a Postgres database migrated to head (pg_trgm and the search indexes).
+Products are generated inside a transaction that is rolled back at the end,
+so the target database is left untouched:
+
+    python -m benchmarks.search_latency --rows 1000000
+
+Each query runs the same statement as the search route, first page only, and
+reports p50/p99 over ``--repeat`` runs along with the indexes the plan used.
+"""
+
+import argparse
+import os
+import statistics
+import time
+import uuid
+
+from sqlalchemy import create_engine, select, text
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.orm import Session
+
+from app.models import Category
+from app.utils.pagination import apply_keyset
+from app.utils.search import search_ordering, search_results, set_similarity_threshold
+
+WORDS = (
+    "lamp chair table desk shelf rug mirror clock vase basket pillow blanket "
+    "kettle teapot mug bowl plate knife spoon candle frame drawer stool bench "
+    "hose shovel rake bucket planter lantern heater fan radio speaker cable"
+).split()
+
+# (label, query)
+QUERIES = [
+    ("rare word", "lantern basket"),
+    ("common word", "lamp"),
+    ("typo", "lanturn"),
+    ("no match", "xylophone"),
+]
+
+
+def seed_products(db, count):
+    run_id = uuid.uuid4().hex[:8]
+    category = Category(name=f"bench-{run_id}", slug=f"bench-{run_id}")
+    db.add(category)
+    db.flush()
+    db.execute(
+        text(
+            "INSERT INTO product (name, slug, description, category_id, is_active) "
+            "SELECT w[1 + i % n] || ' ' || w[1 + (i / n) % n] || ' ' || i, "
+            "  :prefix || i, "
+            "  'A ' || w[1 + (i / 7) % n] || ' to go with your ' || w[1 + (i / 3) % n], "
+            "  :category_id, true "
+            "FROM generate_series(1, :count) AS i, "
+            "  (SELECT CAST(:words AS text[]) AS w, :word_count AS n) AS vocabulary"
+        ),
+        {
+            "prefix": f"bench-{run_id}-",
+            "category_id": category.id,
+            "count": count,
+            "words": WORDS,
+            "word_count": len(WORDS),
+        },
+    )
+    db.execute(text("ANALYZE product"))
+
+
+def first_page(q):
+    results = search_results(q, is_active=True)
+    return apply_keyset(select(results), search_ordering(results)).limit(21)
+
+
+def plan_indexes(db, statement):
+    sql = statement.compile(
+        dialect=postgresql.dialect(), compile_kwargs={"literal_binds": True}
+    )
+    (plan,) = db.execute(text(f"EXPLAIN (FORMAT JSON) {sql}")).scalar()
+    names, nodes = set(), [plan["Plan"]]
+    while nodes:
+        node = nodes.pop()
+        if "Index Name" in node:
+            names.add(node["Index Name"])
+        nodes.extend(node.get("Plans", []))
+    return sorted(names)
+
+
+def measure(db, label, q, repeat):
+    statement = first_page(q)
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        rows = db.execute(statement).all()
+        timings.append(time.perf_counter() - started)
+
+    timings.sort()
+    p99 = timings[max(int(len(timings) * 0.99) - 1, 0)]
+    print(
+        f"{label:<12} {q!r:<18} p50 {statistics.median(timings) * 1000:7.2f} ms"
+        f"  p99 {p99 * 1000:7.2f} ms  {len(rows):3d} rows"
+        f"  {', '.join(plan_indexes(db, statement)) or 'no index'}"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--repeat", type=int, default=50)
+    parser.add_argument("--database-url", default=os.getenv("DEV_DATABASE_URL"))
+    args = parser.parse_args()
+
+    engine = create_engine(args.database_url)
+    with engine.connect() as connection:
+        transaction = connection.begin()
+        try:
+            db = Session(bind=connection, join_transaction_mode="create_savepoint")
+            started = time.perf_counter()
+            seed_products(db, args.rows)
+            print(
+                f"seeded {args.rows} products in {time.perf_counter() - started:.1f}s"
+            )
+
+            set_similarity_threshold(db)
+            for label, q in QUERIES:
+                measure(db, label, q, args.repeat)
+        finally:
+            transaction.rollback()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,163 @@
+"""Measure stock reservations under contention for a single hot SKU.
+
+Needs a Postgres database migrated to head. A product line with ``--stock``
+units is created and committed, ``--clients`` threads then reserve one unit
+each as fast as they can, and everything the run created is deleted at the
+end:
+
+    python -m benchmarks.stock_contention --clients 500 --stock 2000
+
+Reports throughput, p50/p99 latency per reservation, and checks that exactly
+``--stock`` reservations succeeded and the stock never went below zero.
+"""
+
+import argparse
+import os
+import statistics
+import threading
+import time
+import uuid
+
+from fastapi import HTTPException
+from sqlalchemy import create_engine, delete, select
+from sqlalchemy.orm import sessionmaker
+
+from app.models import (
+    Category,
+    Product,
+    ProductLine,
+    StockReservation,
+    StockReservationLine,
+)
+from app.utils.stock import reserve_stock
+
+
+def seed_line(Session, stock):
+    run_id = uuid.uuid4().hex[:8]
+    with Session() as db:
+        category = Category(name=f"bench-{run_id}", slug=f"bench-{run_id}")
+        db.add(category)
+        db.flush()
+        product = Product(
+            name=f"bench-{run_id}", slug=f"bench-{run_id}", category_id=category.id
+        )
+        db.add(product)
+        db.flush()
+        line = ProductLine(
+            price=10,
+            order=1,
+            weight=1.0,
+            product_id=product.id,
+            stock_qty=stock,
+            is_active=True,
+        )
+        db.add(line)
+        db.commit()
+        return category.id, product.id, line.id, line.sku
+
+
+def clean_up(Session, category_id, product_id, line_id):
+    with Session() as db:
+        reservation_ids = (
+            db.execute(
+                delete(StockReservationLine)
+                .where(StockReservationLine.product_line_id == line_id)
+                .returning(StockReservationLine.reservation_id)
+            )
+            .scalars()
+            .all()
+        )
+        db.execute(
+            delete(StockReservation).where(StockReservation.id.in_(reservation_ids))
+        )
+        db.execute(delete(ProductLine).where(ProductLine.id == line_id))
+        db.execute(delete(Product).where(Product.id == product_id))
+        db.execute(delete(Category).where(Category.id == category_id))
+        db.commit()
+
+
+def run_clients(Session, sku, clients, attempts):
+    start = threading.Barrier(clients + 1)
+    timings, outcomes = [], []
+    lock = threading.Lock()
+
+    def client():
+        local_timings, local_outcomes = [], []
+        with Session() as db:
+            start.wait()
+            for _ in range(attempts):
+                started = time.perf_counter()
+                try:
+                    reserve_stock(db, {sku: 1}, 600)
+                    local_outcomes.append(201)
+                except HTTPException as e:
+                    local_outcomes.append(e.status_code)
+                local_timings.append(time.perf_counter() - started)
+        with lock:
+            timings.extend(local_timings)
+            outcomes.extend(local_outcomes)
+
+    threads = [threading.Thread(target=client) for _ in range(clients)]
+    for thread in threads:
+        thread.start()
+    start.wait()
+    started = time.perf_counter()
+    for thread in threads:
+        thread.join()
+    return time.perf_counter() - started, timings, outcomes
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--clients", type=int, default=200)
+    parser.add_argument("--attempts", type=int, default=10)
+    parser.add_argument("--stock", type=int, default=1000)
+    parser.add_argument("--database-url", default=os.getenv("DEV_DATABASE_URL"))
+    args = parser.parse_args()
+
+    engine = create_engine(
+        args.database_url, pool_size=args.clients, max_overflow=0, pool_timeout=60
+    )
+    Session = sessionmaker(bind=engine)
+    category_id, product_id, line_id, sku = seed_line(Session, args.stock)
+    try:
+        elapsed, timings, outcomes = run_clients(
+            Session, sku, args.clients, args.attempts
+        )
+        with Session() as db:
+            remaining = db.execute(
+                select(ProductLine.stock_qty).where(ProductLine.id == line_id)
+            ).scalar()
+            held = db.execute(
+                select(StockReservationLine.quantity).where(
+                    StockReservationLine.product_line_id == line_id
+                )
+            ).all()
+    finally:
+        clean_up(Session, category_id, product_id, line_id)
+        engine.dispose()
+
+    timings.sort()
+    p99 = timings[max(int(len(timings) * 0.99) - 1, 0)]
+    reserved = outcomes.count(201)
+    print(
+        f"{len(outcomes)} attempts by {args.clients} clients in {elapsed:.2f}s: "
+        f"{len(outcomes) / elapsed:.0f} req/s"
+    )
+    print(f"p50 {statistics.median(timings) * 1000:.2f} ms  p99 {p99 * 1000:.2f} ms")
+    print(
+        f"reserved {reserved}, refused {outcomes.count(409)}, "
+        f"other {len(outcomes) - reserved - outcomes.count(409)}"
+    )
+    expected = min(args.stock, len(outcomes))
+    oversold = reserved != expected or len(held) != reserved
+    if oversold or remaining != args.stock - reserved:
+        raise SystemExit(
+            f"inconsistent stock: {reserved} reserved, {len(held)} reservation "
+            f"lines, {remaining} left of {args.stock}"
+        )
+    print(f"consistent: {remaining} of {args.stock} left")
+
+
+if __name__ == "__main__":
+    main()
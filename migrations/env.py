@@ -6,7 +6,10 @@ from sqlalchemy import pool
 from app import models
 
 from alembic import context
+from sqlalchemy import exc, text
+import logging
 import os
+import time
 
 config = context.config
 
@@ -14,9 +17,30 @@ if config.config_file_name is not None:
     fileConfig(config.config_file_name)
 
 config.set_section_option("devdb", "sqlalchemy.url", os.getenv("DEV_DATABASE_URL"))
-config.set_section_option("testdb", "sqlalchemy.url", os.getenv("TEST_DATABASE_URL"))
+# the test fixtures point "testdb" at a database of their own
+config.set_section_option(
+    "testdb",
+    "sqlalchemy.url",
+    config.get_section_option("testdb", "sqlalchemy.url")
+    or os.getenv("TEST_DATABASE_URL"),
+)
 target_metadata = models.Base.metadata
 
+logger = logging.getLogger("alembic.online")
+
+# Online mode (MIGRATION_MODE=online or ``alembic -x online=true upgrade``):
+# every revision commits on its own, DDL gives up on a lock after
+# MIGRATION_LOCK_TIMEOUT instead of queueing reads behind it, and the run is
+# retried from the last committed revision when that happens.
+MIGRATION_ONLINE = context.get_x_argument(as_dictionary=True).get(
+    "online", os.getenv("MIGRATION_MODE", "offline") == "online"
+) in (True, "1", "true", "yes")
+MIGRATION_LOCK_TIMEOUT = os.getenv("MIGRATION_LOCK_TIMEOUT", "5s")
+MIGRATION_STATEMENT_TIMEOUT = os.getenv("MIGRATION_STATEMENT_TIMEOUT", "0")
+MIGRATION_LOCK_RETRIES = int(os.getenv("MIGRATION_LOCK_RETRIES", "5"))
+MIGRATION_LOCK_RETRY_DELAY = float(os.getenv("MIGRATION_LOCK_RETRY_DELAY", "2"))
+LOCK_NOT_AVAILABLE = "55P03"
+
 
 def run_migrations_offline() -> None:
     """Run migrations in 'offline' mode.
@@ -56,10 +80,45 @@ def run_migrations_online() -> None:
     )
 
     with connectable.connect() as connection:
-        context.configure(connection=connection, target_metadata=target_metadata)
-
-        with context.begin_transaction():
-            context.run_migrations()
+        if not MIGRATION_ONLINE:
+            context.configure(connection=connection, target_metadata=target_metadata)
+
+            with context.begin_transaction():
+                context.run_migrations()
+            return
+
+        # session level, so they also apply inside autocommit blocks
+        connection.execute(
+            text("SELECT set_config('lock_timeout', :value, false)"),
+            {"value": MIGRATION_LOCK_TIMEOUT},
+        )
+        connection.execute(
+            text("SELECT set_config('statement_timeout', :value, false)"),
+            {"value": MIGRATION_STATEMENT_TIMEOUT},
+        )
+        connection.commit()
+        context.configure(
+            connection=connection,
+            target_metadata=target_metadata,
+            transaction_per_migration=True,
+        )
+
+        for attempt in range(MIGRATION_LOCK_RETRIES + 1):
+            try:
+                with context.begin_transaction():
+                    context.run_migrations()
+                return
+            except exc.OperationalError as e:
+                lock_timed_out = getattr(e.orig, "pgcode", None) == LOCK_NOT_AVAILABLE
+                if not lock_timed_out or attempt == MIGRATION_LOCK_RETRIES:
+                    raise
+                connection.rollback()
+                delay = MIGRATION_LOCK_RETRY_DELAY * 2**attempt
+                logger.warning(
+                    f"Lock timeout after {MIGRATION_LOCK_TIMEOUT}, "
+                    f"retrying in {delay:.0f}s ({attempt + 1}/{MIGRATION_LOCK_RETRIES})"
+                )
+                time.sleep(delay)
 
 
 if context.is_offline_mode():
@@ -0,0 +1,141 @@
+"""Helpers for revisions that must not block a live catalog.
+
+Use them from a revision's ``upgrade()``/``downgrade()``::
+
+    from migrations.online import batched_backfill, create_index_concurrently
+
+Each helper commits its own work outside the revision's transaction, so a
+revision mixing them with ordinary DDL should run with online mode on (see
+``env.py``), where every revision gets its own transaction.
+"""
+
+import logging
+import os
+import time
+
+from alembic import op
+from sqlalchemy import text
+
+logger = logging.getLogger("alembic.online")
+
+MIGRATION_BATCH_SIZE = int(os.getenv("MIGRATION_BATCH_SIZE", "5000"))
+MIGRATION_BATCH_SLEEP = float(os.getenv("MIGRATION_BATCH_SLEEP", "0.1"))
+MIGRATION_PROGRESS_INTERVAL = float(os.getenv("MIGRATION_PROGRESS_INTERVAL", "10"))
+
+
+def _invalid_index_exists(name):
+    # a CONCURRENTLY build that failed leaves an INVALID index behind, which
+    # IF NOT EXISTS would then happily keep
+    return bool(
+        op.get_bind()
+        .execute(
+            text(
+                "SELECT 1 FROM pg_index JOIN pg_class ON pg_class.oid = indexrelid "
+                "WHERE relname = :name AND NOT indisvalid"
+            ),
+            {"name": name},
+        )
+        .scalar()
+    )
+
+
+def create_index_concurrently(name, table, columns, **kw):
+    """Build an index without locking out writes; safe to re-run."""
+    with op.get_context().autocommit_block():
+        # offline (--sql) runs have no database to ask
+        if (
+            not op.get_context().as_sql
+            and op.get_context().dialect.name == "postgresql"
+            and _invalid_index_exists(name)
+        ):
+            logger.info(f"Dropping invalid index {name} left by an earlier run")
+            op.drop_index(
+                name, table_name=table, postgresql_concurrently=True, if_exists=True
+            )
+        op.create_index(
+            name,
+            table,
+            columns,
+            postgresql_concurrently=True,
+            if_not_exists=True,
+            **kw,
+        )
+
+
+def drop_index_concurrently(name, table):
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            name, table_name=table, postgresql_concurrently=True, if_exists=True
+        )
+
+
+def batched_backfill(
+    table,
+    assignments,
+    where="TRUE",
+    key="id",
+    batch_size=None,
+    sleep=None,
+    params=None,
+):
+    """Run ``UPDATE table SET assignments WHERE where`` in committed batches.
+
+    Rows are walked in ``key`` order, ``batch_size`` at a time, each batch in
+    its own short transaction so row locks are held briefly and replicas keep
+    up. ``sleep`` seconds between batches leaves room for regular traffic.
+    ``where`` should exclude rows already done, which makes an interrupted
+    backfill resumable. Returns the number of rows updated.
+    """
+    if op.get_context().as_sql:
+        raise RuntimeError("batched_backfill needs a database connection, not --sql")
+    batch_size = batch_size or MIGRATION_BATCH_SIZE
+    sleep = MIGRATION_BATCH_SLEEP if sleep is None else sleep
+    bind = op.get_bind()
+    statement = text(
+        f"UPDATE {table} SET {assignments} WHERE {key} IN ("
+        f"SELECT {key} FROM {table} WHERE {key} > :_last_key AND ({where}) "
+        f"ORDER BY {key} LIMIT :_batch_size) RETURNING {key}"
+    )
+
+    with op.get_context().autocommit_block():
+        total = bind.execute(
+            text(f"SELECT count(*) FROM {table} WHERE {where}"), params or {}
+        ).scalar()
+        logger.info(f"Backfilling {total} rows of {table} in batches of {batch_size}")
+
+        started = last_report = time.monotonic()
+        done, last_key = 0, None
+        while True:
+            keys = (
+                bind.execute(
+                    statement,
+                    {
+                        **(params or {}),
+                        "_last_key": last_key if last_key is not None else -1,
+                        "_batch_size": batch_size,
+                    },
+                )
+                .scalars()
+                .all()
+            )
+            if not keys:
+                break
+            done += len(keys)
+            last_key = max(keys)
+
+            now = time.monotonic()
+            if now - last_report >= MIGRATION_PROGRESS_INTERVAL:
+                last_report = now
+                rate = done / (now - started)
+                remaining = max(total - done, 0) / rate if rate else 0
+                logger.info(
+                    f"{table}: {done}/{total} rows ({done / max(total, 1):.0%}), "
+                    f"{rate:.0f} rows/s, about {remaining:.0f}s left"
+                )
+            if sleep:
+                time.sleep(sleep)
+
+    logger.info(
+        f"Backfilled {done} rows of {table} in {time.monotonic() - started:.1f}s"
+    )
+    return done
@@ -0,0 +1,56 @@
+"""search vectors
+
+Revision ID: 3b9d7e2f5c18
+Revises: 61e6489584d4
+Create Date: 2026-10-17 16:40:12.204417
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+from migrations.online import create_index_concurrently, drop_index_concurrently
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3b9d7e2f5c18'
+down_revision: Union[str, None] = '61e6489584d4'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# (table, generated tsvector expression)
+SEARCH_VECTORS = [
+    ('category', "to_tsvector('english', name)"),
+    (
+        'product',
+        "setweight(to_tsvector('english', name), 'A') || "
+        "setweight(to_tsvector('english', coalesce(description, '')), 'B')",
+    ),
+]
+
+# (index name, table, columns, index options)
+INDEXES = [
+    ('ix_category_search_vector', 'category', ['search_vector'], {'postgresql_using': 'gin'}),
+    ('ix_category_name_trgm', 'category', ['name'], {'postgresql_using': 'gin', 'postgresql_ops': {'name': 'gin_trgm_ops'}}),
+    ('ix_product_search_vector', 'product', ['search_vector'], {'postgresql_using': 'gin'}),
+    ('ix_product_name_trgm', 'product', ['name'], {'postgresql_using': 'gin', 'postgresql_ops': {'name': 'gin_trgm_ops'}}),
+]
+
+
+def upgrade() -> None:
+    op.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+    # a stored generated column is filled by rewriting the table once, under
+    # an exclusive lock; the indexes are then built without blocking writes
+    for table, expression in SEARCH_VECTORS:
+        op.add_column(table, sa.Column('search_vector', postgresql.TSVECTOR(), sa.Computed(expression, persisted=True), nullable=True))
+    for name, table, columns, options in INDEXES:
+        create_index_concurrently(name, table, columns, **options)
+
+
+def downgrade() -> None:
+    for name, table, _, _ in reversed(INDEXES):
+        drop_index_concurrently(name, table)
+    for table, _ in reversed(SEARCH_VECTORS):
+        op.drop_column(table, 'search_vector')
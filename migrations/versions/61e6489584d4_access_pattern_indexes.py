@@ -0,0 +1,42 @@
+"""access pattern indexes
+
+Revision ID: 61e6489584d4
+Revises: a41f0c6e8b27
+Create Date: 2026-10-17 14:21:05.530114
+
+"""
+from typing import Sequence, Union
+
+from migrations.online import create_index_concurrently, drop_index_concurrently
+
+
+# revision identifiers, used by Alembic.
+revision: str = '61e6489584d4'
+down_revision: Union[str, None] = 'a41f0c6e8b27'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# (index name, table, columns)
+INDEXES = [
+    # tree traversal: children of a category
+    ('ix_category_parent_id', 'category', ['parent_id']),
+    # listing filters with keyset ordering by id or by (level, name)
+    ('ix_category_is_active_id', 'category', ['is_active', 'id']),
+    ('ix_category_level_name', 'category', ['level', 'name']),
+    # products by category, keyset ordered by id
+    ('ix_product_category_id', 'product', ['category_id', 'id']),
+    # foreign keys followed by the product detail loaders
+    ('ix_product_line_product_id', 'product_line', ['product_id']),
+    ('ix_product_image_product_line_id', 'product_image', ['product_line_id']),
+    ('ix_product_attribute_value_product_line_id', 'product_attribute_value', ['product_line_id']),
+]
+
+
+def upgrade() -> None:
+    for name, table, columns in INDEXES:
+        create_index_concurrently(name, table, columns, unique=False)
+
+
+def downgrade() -> None:
+    for name, table, _ in reversed(INDEXES):
+        drop_index_concurrently(name, table)
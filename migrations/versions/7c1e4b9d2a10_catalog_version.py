@@ -0,0 +1,51 @@
+"""catalog version
+
+Revision ID: 7c1e4b9d2a10
+Revises: 2f24e1bea97c
+Create Date: 2026-10-17 10:12:31.402117
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '7c1e4b9d2a10'
+down_revision: Union[str, None] = '2f24e1bea97c'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('catalog_version',
+    sa.Column('name', sa.String(length=50), nullable=False),
+    sa.Column('version', sa.BigInteger(), server_default='0', nullable=False),
+    sa.PrimaryKeyConstraint('name')
+    )
+    op.execute("INSERT INTO catalog_version (name, version) VALUES ('category', 0)")
+    # Every statement touching the table bumps its version once, whoever
+    # issues it, so caches can detect changes with a single-row read.
+    op.execute(
+        """
+        CREATE FUNCTION bump_catalog_version() RETURNS trigger AS $$
+        BEGIN
+            UPDATE catalog_version SET version = version + 1
+            WHERE name = TG_ARGV[0];
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql
+        """
+    )
+    op.execute(
+        "CREATE TRIGGER category_catalog_version "
+        "AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE ON category "
+        "FOR EACH STATEMENT EXECUTE FUNCTION bump_catalog_version('category')"
+    )
+
+
+def downgrade() -> None:
+    op.execute("DROP TRIGGER category_catalog_version ON category")
+    op.execute("DROP FUNCTION bump_catalog_version()")
+    op.drop_table('catalog_version')
@@ -0,0 +1,56 @@
+"""stock reservations
+
+Revision ID: c58a1f4e7d92
+Revises: 3b9d7e2f5c18
+Create Date: 2026-10-17 18:05:44.731950
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c58a1f4e7d92'
+down_revision: Union[str, None] = '3b9d7e2f5c18'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('stock_reservation',
+    sa.Column('id', postgresql.UUID(as_uuid=True), server_default=sa.text('uuid_generate_v4()'), nullable=False),
+    sa.Column('status', sa.Enum('held', 'committed', 'released', 'expired', name='reservation_status_enum'), server_default='held', nullable=False),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('CURRENT_TIMESTAMP'), nullable=False),
+    sa.Column('expires_at', sa.DateTime(timezone=True), nullable=False),
+    sa.Column('closed_at', sa.DateTime(timezone=True), nullable=True),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_stock_reservation_held_expires_at', 'stock_reservation', ['expires_at'], unique=False, postgresql_where=sa.text("status = 'held'"))
+    op.create_table('stock_reservation_line',
+    sa.Column('reservation_id', postgresql.UUID(as_uuid=True), nullable=False),
+    sa.Column('product_line_id', sa.Integer(), nullable=False),
+    sa.Column('quantity', sa.Integer(), nullable=False),
+    sa.CheckConstraint('quantity > 0', name='stock_reservation_line_quantity_check'),
+    sa.ForeignKeyConstraint(['product_line_id'], ['product_line.id'], ),
+    sa.ForeignKeyConstraint(['reservation_id'], ['stock_reservation.id'], ),
+    sa.PrimaryKeyConstraint('reservation_id', 'product_line_id')
+    )
+    # NOT VALID only needs a brief lock; validating afterwards, outside this
+    # transaction, scans the table without blocking writes
+    op.execute(
+        'ALTER TABLE product_line ADD CONSTRAINT product_line_stock_qty_check '
+        'CHECK (stock_qty >= 0) NOT VALID'
+    )
+    with op.get_context().autocommit_block():
+        op.execute('ALTER TABLE product_line VALIDATE CONSTRAINT product_line_stock_qty_check')
+
+
+def downgrade() -> None:
+    op.drop_constraint('product_line_stock_qty_check', 'product_line', type_='check')
+    op.drop_table('stock_reservation_line')
+    op.drop_index('ix_stock_reservation_held_expires_at', table_name='stock_reservation', postgresql_where=sa.text("status = 'held'"))
+    op.drop_table('stock_reservation')
+    op.execute('DROP TYPE reservation_status_enum')
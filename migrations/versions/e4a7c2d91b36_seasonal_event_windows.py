@@ -0,0 +1,49 @@
+"""seasonal event windows
+
+Revision ID: e4a7c2d91b36
+Revises: c58a1f4e7d92
+Create Date: 2026-10-17 20:31:08.519274
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+from migrations.online import create_index_concurrently, drop_index_concurrently
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e4a7c2d91b36'
+down_revision: Union[str, None] = 'c58a1f4e7d92'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# (index name, table, columns, index options)
+INDEXES = [
+    ('ix_seasonal_event_active_during', 'seasonal_event', ['active_during'], {'postgresql_using': 'gist'}),
+    ('ix_product_seasonal_event', 'product', ['seasonal_event', 'id'], {'postgresql_where': sa.text('seasonal_event IS NOT NULL')}),
+]
+
+
+def upgrade() -> None:
+    # fails on an event ending before it starts, which was never meaningful
+    op.add_column('seasonal_event', sa.Column('active_during', postgresql.TSRANGE(), sa.Computed("tsrange(start_date, end_date, '[)')", persisted=True), nullable=True))
+    # cached active events are reloaded when an event is written
+    op.execute("INSERT INTO catalog_version (name, version) VALUES ('seasonal_event', 0)")
+    op.execute(
+        "CREATE TRIGGER seasonal_event_catalog_version "
+        "AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE ON seasonal_event "
+        "FOR EACH STATEMENT EXECUTE FUNCTION bump_catalog_version('seasonal_event')"
+    )
+    for name, table, columns, options in INDEXES:
+        create_index_concurrently(name, table, columns, **options)
+
+
+def downgrade() -> None:
+    for name, table, _, _ in reversed(INDEXES):
+        drop_index_concurrently(name, table)
+    op.execute('DROP TRIGGER seasonal_event_catalog_version ON seasonal_event')
+    op.execute("DELETE FROM catalog_version WHERE name = 'seasonal_event'")
+    op.drop_column('seasonal_event', 'active_during')
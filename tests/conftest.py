@@ -1,2 +1,7 @@
-from .fixtures import db_session, client
-from .utils.pytest_utils import pytest_collection_modifyitems
+import os
+
+# the admin endpoints are off unless enabled, the tests cover them
+os.environ.setdefault("ADMIN_ENDPOINTS_ENABLED", "true")
+
+from .fixtures import test_database_url, test_engine, db_session, client
+from .utils.pytest_utils import pytest_collection_modifyitems, pytest_sessionfinish
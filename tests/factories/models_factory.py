@@ -36,3 +36,47 @@ def get_random_category_dict(id_: int = None):
         "level": faker.random_int(1, 20),
         "parent_id": None,
     }
+
+
+def get_random_product_dict(id_: int = 1, lines: int = 1, images: int = 1):
+    return {
+        "id": id_,
+        "pid": str(faker.uuid4()),
+        "name": faker.word(),
+        "slug": faker.slug(),
+        "description": faker.sentence(),
+        "is_digital": faker.boolean(),
+        "is_active": faker.boolean(),
+        "stock_status": "is",
+        "category_id": 1,
+        "created_at": "2024-01-01T00:00:00",
+        "updated_at": "2024-01-01T00:00:00",
+        "product_lines": [
+            {
+                "id": line,
+                "price": "9.99",
+                "sku": str(faker.uuid4()),
+                "stock_qty": faker.random_int(0, 100),
+                "is_active": True,
+                "order": line,
+                "weight": 1.5,
+                "product_images": [
+                    {
+                        "id": line * 100 + image,
+                        "alternative_text": faker.sentence(),
+                        "url": faker.image_url(),
+                        "order": image,
+                    }
+                    for image in range(1, images + 1)
+                ],
+                "attribute_values": [
+                    {
+                        "id": line,
+                        "attribute_value": faker.word(),
+                        "attribute": {"id": 1, "name": "colour", "description": None},
+                    }
+                ],
+            }
+            for line in range(1, lines + 1)
+        ],
+    }
@@ -1,31 +1,63 @@
-from .utils.docker_utils import start_database_container
+from .utils.docker_utils import (
+    database_accepts_connections,
+    start_database_container,
+)
 import pytest
 import os
 from sqlalchemy import create_engine
-from tests.utils.databse_utils import migrate_to_db
+from sqlalchemy.engine import make_url
+from tests.utils.databse_utils import (
+    clone_database,
+    create_template_database,
+    database_lock,
+)
+from tests.utils.pytest_utils import mark_database_container_started
 from sqlalchemy.orm import sessionmaker
 from fastapi.testclient import TestClient
 from app.main import app
 
+# set by pytest-xdist in its workers
+TEST_WORKER = os.getenv("PYTEST_XDIST_WORKER", "main")
+
 
 @pytest.fixture(scope="session")
-def db_session():
-    container = start_database_container()
+def test_database_url():
+    """This worker's own copy of the migrated test database.
 
-    engine = create_engine(os.getenv("TEST_DATABASE_URL"))
+    The first worker starts the container and migrates a template database
+    once, every worker then clones the template, which takes a fraction of a
+    second instead of a full migration run.
+    """
+    url = os.getenv("TEST_DATABASE_URL")
 
-    with engine.begin() as connection:
-        migrate_to_db("migrations", "alembic.ini", connection)
+    with database_lock():
+        # another worker, or an earlier run kept with KEEP_TEST_DATABASE
+        if not database_accepts_connections(url):
+            start_database_container(url)
+            mark_database_container_started()
 
-    SessionLocal = sessionmaker(autocommit=False, autoflush=True, bind=engine)
+        template_url = create_template_database(url, "migrations", "alembic.ini")
+        worker_url = clone_database(
+            template_url, f"{make_url(url).database}_{TEST_WORKER}"
+        )
+
+    return worker_url
 
-    yield SessionLocal
 
-    container.stop()
-    container.remove()
+@pytest.fixture(scope="session")
+def test_engine(test_database_url):
+    engine = create_engine(test_database_url)
+    yield engine
     engine.dispose()
 
 
+@pytest.fixture(scope="session")
+def db_session(test_engine):
+    SessionLocal = sessionmaker(autocommit=False, autoflush=True, bind=test_engine)
+
+    yield SessionLocal
+
+
 @pytest.fixture(scope="function")
 def client():
     with TestClient(app) as _client:
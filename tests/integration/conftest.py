@@ -1,36 +1,45 @@
-from tests.utils.docker_utils import start_database_container
 import pytest
-import os
-from sqlalchemy import create_engine
-from tests.utils.databse_utils import migrate_to_db
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy.orm import Session, sessionmaker
 from fastapi.testclient import TestClient
 from app.main import app
-from app.db_connection import get_db_session
+from app.db_connection import (
+    get_db_session,
+    get_db_session_factory,
+    get_read_db_session,
+    get_read_db_session_factory,
+)
+from app.utils.catalog_version import category_version
+from app.utils.category_cache import category_cache
+from app.utils.category_tree_cache import category_tree_cache
+from app.utils.seasonal_events import active_event_cache
 
 
-@pytest.fixture(scope="function")
-def db_session_integration():
-    container = start_database_container()
-
-    engine = create_engine(os.getenv("TEST_DATABASE_URL"))
-
-    with engine.begin() as connection:
-        migrate_to_db("migrations", "alembic.ini", connection)
+@pytest.fixture(autouse=True)
+def reset_category_caches():
+    # catalog versions go back with every rollback, so a cache filled by an
+    # earlier test could look current
+    category_tree_cache.invalidate()
+    category_cache.clear()
+    category_version.expire()
+    active_event_cache.invalidate()
 
-    SessionLocal = sessionmaker(autocommit=False, autoflush=True, bind=engine)
 
-    # yield SessionLocal
-    db = SessionLocal()
+@pytest.fixture(scope="function")
+def db_session_integration(test_engine):
+    # commits by the test or the app only release a savepoint, the outer
+    # transaction is rolled back so every test starts from the migrated schema
+    connection = test_engine.connect()
+    transaction = connection.begin()
+    db = Session(
+        bind=connection, autoflush=True, join_transaction_mode="create_savepoint"
+    )
 
     try:
         yield db
     finally:
         db.close()
-
-    container.stop()
-    container.remove()
-    engine.dispose()
+        transaction.rollback()
+        connection.close()
 
 
 @pytest.fixture()
@@ -38,7 +47,16 @@ def override_get_db_session(db_session_integration):
     def override():
         return db_session_integration
 
+    def override_factory():
+        return sessionmaker(
+            bind=db_session_integration.get_bind(),
+            join_transaction_mode="create_savepoint",
+        )
+
     app.dependency_overrides[get_db_session] = override
+    app.dependency_overrides[get_read_db_session] = override
+    app.dependency_overrides[get_db_session_factory] = override_factory
+    app.dependency_overrides[get_read_db_session_factory] = override_factory
 
 
 @pytest.fixture(scope="function")
@@ -0,0 +1,247 @@
+import csv
+import json
+import uuid
+import pytest
+from sqlalchemy import select
+from app.models import (
+    Attribute,
+    AttributeValue,
+    Category,
+    Product,
+    ProductAttributeValue,
+    ProductImage,
+    ProductLine,
+)
+from app.utils.catalog_import import import_catalog
+from app.utils.stock import release_reservation, reserve_stock
+
+LAMP_SKU = str(uuid.UUID("11111111-1111-4111-8111-111111111111"))
+RUG_SKU = str(uuid.UUID("22222222-2222-4222-8222-222222222222"))
+
+
+def write_csv(path, rows):
+    with open(path, "w", newline="") as feed:
+        writer = csv.DictWriter(feed, fieldnames=list(rows[0]))
+        writer.writeheader()
+        writer.writerows(rows)
+    return str(path)
+
+
+def write_jsonl(path, rows):
+    path.write_text("".join(json.dumps(row) + "\n" for row in rows))
+    return str(path)
+
+
+@pytest.fixture()
+def feeds(tmp_path, db_session_integration):
+    db_session_integration.add_all(
+        [
+            Category(name="Lighting", slug="lighting", is_active=True),
+            Attribute(name="colour"),
+            Attribute(name="size"),
+        ]
+    )
+    db_session_integration.commit()
+
+    return {
+        "products": write_csv(
+            tmp_path / "products.csv",
+            [
+                {"slug": "desk-lamp", "name": "Desk lamp", "category": "lighting"},
+                {"slug": "rug", "name": "Rug", "category": "lighting"},
+                # no such category
+                {"slug": "vase", "name": "Vase", "category": "pottery"},
+            ],
+        ),
+        "product_lines": write_jsonl(
+            tmp_path / "lines.jsonl",
+            [
+                {
+                    "sku": LAMP_SKU,
+                    "product": "desk-lamp",
+                    "price": 19.99,
+                    "stock_qty": 4,
+                    "is_active": True,
+                    "order": 1,
+                    "weight": 1.5,
+                },
+                {
+                    "sku": RUG_SKU,
+                    "product": "rug",
+                    "price": 1200,
+                    "order": 1,
+                    "weight": 3,
+                },
+            ],
+        ),
+        "product_images": write_csv(
+            tmp_path / "images.csv",
+            [
+                {
+                    "alternative_text": "Desk lamp, lit",
+                    "sku": LAMP_SKU,
+                    "url": "https://example.com/lamp.png",
+                    "order": 1,
+                }
+            ],
+        ),
+        "attribute_values": write_csv(
+            tmp_path / "values.csv",
+            [
+                {"attribute": "colour", "value": "red"},
+                {"attribute": "colour", "value": "brass"},
+                {"attribute": "size", "value": "large"},
+            ],
+        ),
+        "product_attribute_values": write_csv(
+            tmp_path / "line_values.csv",
+            [{"sku": LAMP_SKU, "attribute": "colour"}],
+        ),
+    }
+
+
+def test_integrate_catalog_import(db_session_integration, feeds):
+    stats = import_catalog(db_session_integration, feeds, chunk_rows=2)
+
+    assert stats["products"]["staged"] == 3
+    assert stats["products"]["inserted"] == 2
+    assert stats["products"]["skipped"] == 1
+    # the rug's price is over the line's check constraint
+    assert stats["product_lines"]["inserted"] == 1
+    assert stats["product_lines"]["skipped"] == 1
+    # the later colour wins
+    assert stats["attribute_values"]["inserted"] == 2
+    assert stats["attribute_values"]["skipped"] == 1
+
+    line = db_session_integration.execute(
+        select(ProductLine).where(ProductLine.sku == uuid.UUID(LAMP_SKU))
+    ).scalar_one()
+    assert (line.product.slug, line.stock_qty, line.is_active) == ("desk-lamp", 4, True)
+    assert [image.url for image in line.product_images] == [
+        "https://example.com/lamp.png"
+    ]
+    assert [value.attribute_value for value in line.attribute_values] == ["brass"]
+    assert (
+        db_session_integration.execute(
+            select(Product).where(Product.slug == "vase")
+        ).first()
+        is None
+    )
+
+
+def test_integrate_catalog_import_again_updates_only_changes(
+    db_session_integration, feeds, tmp_path
+):
+    import_catalog(db_session_integration, feeds)
+    feeds["products"] = write_csv(
+        tmp_path / "products.csv",
+        [
+            {"slug": "desk-lamp", "name": "Desk lamp", "category": "lighting"},
+            {
+                "slug": "rug",
+                "name": "Rug",
+                "category": "lighting",
+                "description": "Hand woven",
+            },
+        ],
+    )
+
+    stats = import_catalog(db_session_integration, feeds)
+
+    assert (stats["products"]["updated"], stats["products"]["unchanged"]) == (1, 1)
+    for feed in ("product_lines", "product_images", "product_attribute_values"):
+        assert stats[feed]["inserted"] == stats[feed]["updated"] == 0
+    assert (
+        db_session_integration.execute(
+            select(Product.description).where(Product.slug == "rug")
+        ).scalar()
+        == "Hand woven"
+    )
+
+
+def test_integrate_catalog_import_again_keeps_held_stock(
+    db_session_integration, feeds, tmp_path
+):
+    import_catalog(db_session_integration, feeds)
+    reservation = reserve_stock(db_session_integration, {LAMP_SKU: 3}, 60)
+    # no is_active, and the supplier's own stock figure
+    feeds["product_lines"] = write_jsonl(
+        tmp_path / "restock.jsonl",
+        [
+            {
+                "sku": LAMP_SKU,
+                "product": "desk-lamp",
+                "price": 17.5,
+                "stock_qty": 10,
+                "order": 1,
+                "weight": 1.5,
+            }
+        ],
+    )
+
+    stats = import_catalog(db_session_integration, feeds)
+
+    assert stats["product_lines"]["updated"] == 1
+    line = db_session_integration.execute(
+        select(ProductLine.price, ProductLine.stock_qty, ProductLine.is_active).where(
+            ProductLine.sku == uuid.UUID(LAMP_SKU)
+        )
+    ).one()
+    assert (float(line.price), line.stock_qty, line.is_active) == (17.5, 1, True)
+
+    release_reservation(db_session_integration, reservation["id"])
+    assert (
+        db_session_integration.execute(
+            select(ProductLine.stock_qty).where(ProductLine.sku == uuid.UUID(LAMP_SKU))
+        ).scalar()
+        == 4
+    )
+
+
+def test_integrate_catalog_import_skips_taken_unique_keys(
+    db_session_integration, feeds, tmp_path
+):
+    import_catalog(db_session_integration, feeds)
+
+    stats = import_catalog(
+        db_session_integration,
+        {
+            # the name belongs to the desk lamp
+            "products": write_csv(
+                tmp_path / "clash.csv",
+                [{"slug": "other-lamp", "name": "Desk lamp", "category": "lighting"}],
+            ),
+            # order 1 of the desk lamp is taken by another line
+            "product_lines": write_jsonl(
+                tmp_path / "clash.jsonl",
+                [
+                    {
+                        "sku": str(uuid.uuid4()),
+                        "product": "desk-lamp",
+                        "price": 5,
+                        "order": 1,
+                        "weight": 1,
+                    }
+                ],
+            ),
+        },
+    )
+
+    assert stats["products"]["skipped"] == 1
+    assert stats["product_lines"]["skipped"] == 1
+    assert len(db_session_integration.execute(select(ProductImage)).all()) == 1
+    assert len(db_session_integration.execute(select(AttributeValue)).all()) == 2
+    assert len(db_session_integration.execute(select(ProductAttributeValue)).all()) == 1
+
+
+def test_integrate_catalog_import_malformed_feed_changes_nothing(
+    db_session_integration, feeds, tmp_path
+):
+    feeds["product_lines"] = write_jsonl(
+        tmp_path / "broken.jsonl", [{"sku": "not-a-uuid", "product": "desk-lamp"}]
+    )
+
+    with pytest.raises(Exception, match="uuid"):
+        import_catalog(db_session_integration, feeds)
+
+    assert db_session_integration.execute(select(Product)).first() is None
@@ -1,3 +1,4 @@
+import json
 from tests.factories.models_factory import get_random_category_dict
 from app.models import Category
 
@@ -124,3 +125,189 @@ def test_integrate_create_new_category_duplicate_slug(client, db_session_integra
     response = client.post("api/category", json=category2)
 
     assert response.status_code == 400
+
+
+def test_integrate_get_categories_keyset_pages(client, db_session_integration):
+    categories = [get_random_category_dict() for i in range(5)]
+
+    for category_data in categories:
+        category_data.pop("id", None)
+        db_session_integration.add(Category(**category_data))
+    db_session_integration.commit()
+
+    seen = []
+    cursor = None
+    while True:
+        params = {"limit": 2, "order_by": "level_name"}
+        if cursor:
+            params["cursor"] = cursor
+        response = client.get("api/category", params=params)
+        assert response.status_code == 200
+        seen.extend(response.json())
+
+        cursor = response.headers.get("X-Next-Cursor")
+        if cursor is None:
+            break
+
+    assert len(seen) == len(categories)
+    assert [(c["level"], c["name"]) for c in seen] == sorted(
+        (c["level"], c["name"]) for c in categories
+    )
+
+
+def test_integrate_get_categories_filters(client, db_session_integration):
+    parent = Category(**get_random_category_dict())
+    parent.id = None
+    db_session_integration.add(parent)
+    db_session_integration.commit()
+
+    child_data = get_random_category_dict()
+    child_data.pop("id")
+    child_data.update(parent_id=parent.id, is_active=True)
+    db_session_integration.add(Category(**child_data))
+    db_session_integration.commit()
+
+    response = client.get(
+        "api/category", params={"parent_id": parent.id, "is_active": True}
+    )
+
+    assert response.status_code == 200
+    assert [c["slug"] for c in response.json()] == [child_data["slug"]]
+
+
+def test_integrate_export_categories_ndjson(client, db_session_integration):
+    categories = [get_random_category_dict() for i in range(5)]
+
+    for category_data in categories:
+        category_data.pop("id", None)
+        db_session_integration.add(Category(**category_data))
+    db_session_integration.commit()
+
+    response = client.get("api/category/export")
+
+    assert response.status_code == 200
+    exported = [json.loads(line) for line in response.text.splitlines()]
+    assert sorted(c["slug"] for c in exported) == sorted(c["slug"] for c in categories)
+
+
+def test_integrate_bulk_create_categories(client, db_session_integration):
+    existing = get_random_category_dict()
+    existing.pop("id")
+    db_session_integration.add(Category(**existing))
+    db_session_integration.commit()
+
+    items = [get_random_category_dict() for _ in range(3)]
+    for i, item in enumerate(items):
+        item.pop("id")
+        item["slug"] = f"bulk-{i}"
+        item["name"] = f"bulk-{i}"
+    items.append({**items[0], "name": "bulk-duplicate"})
+    items.append({**existing, "name": "bulk-existing"})
+
+    response = client.post("api/category/bulk", json={"items": items})
+
+    assert response.status_code == 200
+    body = response.json()
+    assert body["created"] == 3
+    assert body["failed"] == 2
+    assert [result["status"] for result in body["results"]] == [
+        "created",
+        "created",
+        "created",
+        "conflict",
+        "conflict",
+    ]
+
+    created_ids = [result["id"] for result in body["results"][:3]]
+    assert (
+        db_session_integration.query(Category)
+        .filter(Category.id.in_(created_ids))
+        .count()
+        == 3
+    )
+
+
+def test_integrate_bulk_upsert_categories(client, db_session_integration):
+    category = get_random_category_dict()
+    category.pop("id")
+    db_session_integration.add(Category(**category))
+    db_session_integration.commit()
+
+    updated = {**category, "name": "bulk-renamed", "is_active": True}
+
+    response = client.post(
+        "api/category/bulk", json={"items": [updated], "on_conflict": "update"}
+    )
+
+    assert response.status_code == 200
+    assert response.json()["updated"] == 1
+
+    db_session_integration.expire_all()
+    stored = (
+        db_session_integration.query(Category).filter_by(slug=category["slug"]).one()
+    )
+    assert stored.name == "bulk-renamed"
+    assert stored.is_active is True
+
+
+def create_category_chain(db_session, length):
+    parent_id = None
+    chain = []
+    for _ in range(length):
+        category_data = get_random_category_dict()
+        category_data.pop("id")
+        category_data["parent_id"] = parent_id
+        category = Category(**category_data)
+        db_session.add(category)
+        db_session.commit()
+        chain.append(category)
+        parent_id = category.id
+    return chain
+
+
+def test_integrate_category_tree_and_breadcrumbs(client, db_session_integration):
+    chain = create_category_chain(db_session_integration, 4)
+    root, leaf = chain[0], chain[-1]
+
+    response = client.get(f"api/category/{root.id}/tree", params={"max_depth": 2})
+    assert response.status_code == 200
+    tree = response.json()
+    assert tree["id"] == root.id
+    assert tree["children"][0]["id"] == chain[1].id
+    assert tree["children"][0]["children"][0]["id"] == chain[2].id
+    assert tree["children"][0]["children"][0]["children"] == []
+
+    response = client.get(f"api/category/{root.id}/descendants")
+    assert [c["id"] for c in response.json()] == [c.id for c in chain[1:]]
+
+    response = client.get(f"api/category/{leaf.id}/ancestors")
+    assert [c["id"] for c in response.json()] == [c.id for c in chain[:-1]]
+
+
+def test_integrate_category_tree_cache_sees_writes(client, db_session_integration):
+    root, child = create_category_chain(db_session_integration, 2)
+
+    response = client.get(f"api/category/slug/{root.slug}/tree")
+    assert [c["id"] for c in response.json()["children"]] == [child.id]
+
+    response = client.delete(f"api/category/{child.id}")
+    assert response.status_code == 200
+
+    response = client.get(f"api/category/slug/{root.slug}/tree")
+    assert response.json()["children"] == []
+
+
+def test_integrate_get_categories_etag_changes_on_write(client, db_session_integration):
+    response = client.get("api/category")
+    etag = response.headers["ETag"]
+
+    response = client.get("api/category", headers={"If-None-Match": etag})
+    assert response.status_code == 304
+
+    category = get_random_category_dict()
+    category.pop("id")
+    assert client.post("api/category/", json=category).status_code == 201
+
+    response = client.get("api/category", headers={"If-None-Match": etag})
+    assert response.status_code == 200
+    assert response.headers["ETag"] != etag
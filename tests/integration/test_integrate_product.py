@@ -0,0 +1,143 @@
+import pytest
+from sqlalchemy import event
+from app.models import (
+    Attribute,
+    AttributeValue,
+    Category,
+    Product,
+    ProductAttributeValue,
+    ProductImage,
+    ProductLine,
+)
+
+
+def create_product(db_session, category, name, lines, images):
+    product = Product(name=name, slug=name, category_id=category.id, is_active=True)
+    db_session.add(product)
+    db_session.flush()
+
+    for line_order in range(1, lines + 1):
+        line = ProductLine(
+            price=10, order=line_order, weight=1.0, product_id=product.id
+        )
+        db_session.add(line)
+        db_session.flush()
+
+        for image_order in range(1, images + 1):
+            db_session.add(
+                ProductImage(
+                    alternative_text=f"{name}-{line_order}-{image_order}",
+                    url=f"https://example.com/{name}/{line_order}/{image_order}.png",
+                    order=image_order,
+                    product_line_id=line.id,
+                )
+            )
+
+        attribute = Attribute(name=f"{name}-attribute-{line_order}")
+        db_session.add(attribute)
+        db_session.flush()
+        value = AttributeValue(attribute_value="value", attribute_id=attribute.id)
+        db_session.add(value)
+        db_session.flush()
+        db_session.add(
+            ProductAttributeValue(attribute_value_id=value.id, product_line_id=line.id)
+        )
+
+    db_session.commit()
+    return product
+
+
+def count_queries(engine, request):
+    statements = []
+
+    def before_cursor_execute(conn, cursor, statement, *args):
+        statements.append(statement)
+
+    event.listen(engine, "before_cursor_execute", before_cursor_execute)
+    try:
+        response = request()
+    finally:
+        event.remove(engine, "before_cursor_execute", before_cursor_execute)
+    return response, len(statements)
+
+
+@pytest.fixture()
+def category(db_session_integration):
+    category = Category(name="products", slug="products")
+    db_session_integration.add(category)
+    db_session_integration.commit()
+    return category
+
+
+def test_integrate_get_product_by_slug(client, db_session_integration, category):
+    create_product(db_session_integration, category, "lamp", lines=2, images=3)
+
+    response = client.get("api/product/lamp")
+    assert response.status_code == 200
+
+    product = response.json()
+    assert product["slug"] == "lamp"
+    assert [line["order"] for line in product["product_lines"]] == [1, 2]
+    assert [
+        image["order"] for image in product["product_lines"][0]["product_images"]
+    ] == [1, 2, 3]
+    assert product["product_lines"][0]["attribute_values"][0]["attribute"]["name"] == (
+        "lamp-attribute-1"
+    )
+
+
+def test_integrate_get_product_query_count_is_constant(
+    client, db_session_integration, category
+):
+    engine = db_session_integration.get_bind()
+    create_product(db_session_integration, category, "small", lines=1, images=1)
+    create_product(db_session_integration, category, "large", lines=10, images=10)
+
+    db_session_integration.expunge_all()
+    _, small_queries = count_queries(engine, lambda: client.get("api/product/small"))
+    db_session_integration.expunge_all()
+    _, large_queries = count_queries(engine, lambda: client.get("api/product/large"))
+
+    assert small_queries == large_queries
+
+
+def test_integrate_get_products_by_category_query_count_is_constant(
+    client, db_session_integration, category
+):
+    engine = db_session_integration.get_bind()
+    create_product(db_session_integration, category, "first", lines=1, images=1)
+
+    db_session_integration.expunge_all()
+    response, one_product_queries = count_queries(
+        engine, lambda: client.get(f"api/product/category/{category.id}")
+    )
+    assert len(response.json()) == 1
+
+    for index in range(5):
+        create_product(
+            db_session_integration, category, f"more-{index}", lines=3, images=4
+        )
+
+    db_session_integration.expunge_all()
+    response, many_products_queries = count_queries(
+        engine, lambda: client.get(f"api/product/category/{category.id}")
+    )
+    assert len(response.json()) == 6
+    assert one_product_queries == many_products_queries
+
+
+def test_integrate_get_products_by_category_pagination(
+    client, db_session_integration, category
+):
+    for index in range(3):
+        create_product(db_session_integration, category, f"page-{index}", 1, 1)
+
+    first = client.get(f"api/product/category/{category.id}?limit=2")
+    assert [product["slug"] for product in first.json()] == ["page-0", "page-1"]
+
+    second = client.get(
+        f"api/product/category/{category.id}?limit=2"
+        f"&cursor={first.headers['X-Next-Cursor']}"
+    )
+    assert [product["slug"] for product in second.json()] == ["page-2"]
+    assert "X-Next-Cursor" not in second.headers
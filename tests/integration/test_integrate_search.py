@@ -0,0 +1,75 @@
+import pytest
+from app.models import Category, Product
+
+
+@pytest.fixture()
+def catalog(db_session_integration):
+    lighting = Category(name="Lighting", slug="lighting", is_active=True)
+    gardening = Category(name="Gardening", slug="gardening", is_active=True)
+    db_session_integration.add_all([lighting, gardening])
+    db_session_integration.flush()
+
+    products = [
+        ("Brass desk lamp", "A lamp for reading", lighting),
+        ("Floor lamp", "Tall and bright", lighting),
+        ("Garden hose", "Twenty metres, with a brass nozzle", gardening),
+        ("Watering can", "Holds ten litres", gardening),
+    ]
+    for name, description, category in products:
+        db_session_integration.add(
+            Product(
+                name=name,
+                slug=name.lower().replace(" ", "-"),
+                description=description,
+                category_id=category.id,
+                is_active=True,
+            )
+        )
+    db_session_integration.commit()
+
+
+def search(client, **params):
+    response = client.get("api/search", params=params)
+    assert response.status_code == 200
+    return response
+
+
+def test_integrate_search_full_text_ranks_names_first(client, catalog):
+    results = search(client, q="lamps").json()
+
+    # stemmed: "lamps" matches "lamp"; a name match outranks a description one
+    assert [r["name"] for r in results][:2] in (
+        ["Brass desk lamp", "Floor lamp"],
+        ["Floor lamp", "Brass desk lamp"],
+    )
+    assert all(r["kind"] == "product" for r in results)
+    scores = [r["score"] for r in results]
+    assert scores == sorted(scores, reverse=True)
+
+
+def test_integrate_search_matches_descriptions(client, catalog):
+    names = {r["name"] for r in search(client, q="nozzle").json()}
+    assert names == {"Garden hose"}
+
+
+def test_integrate_search_tolerates_typos(client, catalog):
+    results = search(client, q="gardnening").json()
+    assert {(r["kind"], r["name"]) for r in results} >= {("category", "Gardening")}
+
+
+def test_integrate_search_keyset_pages(client, catalog):
+    seen = []
+    cursor = None
+    while True:
+        params = {"q": "lamp", "limit": 1}
+        if cursor:
+            params["cursor"] = cursor
+        response = search(client, **params)
+        seen.extend((r["kind"], r["id"]) for r in response.json())
+        cursor = response.headers.get("X-Next-Cursor")
+        if not cursor:
+            break
+
+    everything = search(client, q="lamp", limit=100).json()
+    assert seen == [(r["kind"], r["id"]) for r in everything]
+    assert len(seen) == len(set(seen))
@@ -0,0 +1,94 @@
+import time
+from datetime import timedelta
+import pytest
+from sqlalchemy import func
+from app.models import Category, Product, Seasonal
+from app.utils.catalog_version import seasonal_event_version
+from app.utils.seasonal_events import active_event_cache
+
+# the test transaction is never committed, so LOCALTIMESTAMP is the same in
+# every statement the test and the app run
+NOW = func.localtimestamp()
+
+
+def create_event(db_session, category, name, start, end):
+    event = Seasonal(name=name, start_date=NOW + start, end_date=NOW + end)
+    db_session.add(event)
+    db_session.flush()
+    product = Product(
+        name=f"{name} special",
+        slug=f"{name}-special",
+        category_id=category.id,
+        seasonal_event=event.id,
+        is_active=True,
+    )
+    db_session.add(product)
+    db_session.commit()
+    return product
+
+
+@pytest.fixture()
+def seasonal_catalog(db_session_integration):
+    category = Category(name="Seasonal", slug="seasonal", is_active=True)
+    db_session_integration.add(category)
+    db_session_integration.flush()
+    db_session_integration.add(
+        Product(name="Everyday", slug="everyday", category_id=category.id)
+    )
+
+    hour, day, zero = timedelta(hours=1), timedelta(days=1), timedelta(0)
+    events = [
+        ("ended", "summer", -2 * day, -day),
+        # ends exactly now, the range excludes its end
+        ("ending", "autumn", -day, zero),
+        ("running", "winter", -day, day),
+        # starts exactly now, the range includes its start
+        ("starting", "advent", zero, day),
+        ("upcoming", "spring", hour, day),
+    ]
+    return {
+        key: create_event(db_session_integration, category, name, start, end)
+        for key, name, start, end in events
+    }
+
+
+def active_slugs(client, **params):
+    response = client.get("api/product/seasonal/active", params=params)
+    assert response.status_code == 200
+    return [product["slug"] for product in response.json()]
+
+
+def test_integrate_seasonal_active_event_products(client, seasonal_catalog):
+    assert active_slugs(client) == [
+        seasonal_catalog["running"].slug,
+        seasonal_catalog["starting"].slug,
+    ]
+
+    # kept until the upcoming event starts, an hour from now
+    assert 3590 < active_event_cache.expires_at - time.monotonic() <= 3600
+
+
+def test_integrate_seasonal_active_event_products_pages(client, seasonal_catalog):
+    response = client.get("api/product/seasonal/active", params={"limit": 1})
+    cursor = response.headers["X-Next-Cursor"]
+
+    assert active_slugs(client, limit=1, cursor=cursor) == [
+        seasonal_catalog["starting"].slug
+    ]
+
+
+def test_integrate_seasonal_event_write_reloads_active_events(
+    client, db_session_integration, seasonal_catalog
+):
+    assert len(active_slugs(client)) == 2
+
+    db_session_integration.execute(
+        Seasonal.__table__.update()
+        .where(Seasonal.name == "spring")
+        .values(start_date=NOW - timedelta(hours=1))
+    )
+    db_session_integration.commit()
+    # as if the version check interval had passed
+    seasonal_event_version.expire()
+
+    assert seasonal_catalog["upcoming"].slug in active_slugs(client)
@@ -0,0 +1,68 @@
+import os
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import text
+from sqlalchemy.orm import sessionmaker
+from app.main import app
+from app.db_connection import get_db_session
+from app.utils.category_cache import category_cache
+from tests.factories.models_factory import get_random_category_dict
+
+LOAD_TEST_REQUESTS = int(os.getenv("LOAD_TEST_REQUESTS", "10000"))
+
+
+def count_database_connections(engine):
+    with engine.connect() as connection:
+        return connection.execute(
+            text(
+                "SELECT count(*) FROM pg_stat_activity "
+                "WHERE datname = current_database()"
+            )
+        ).scalar()
+
+
+@pytest.fixture()
+def lifecycle_client(test_engine, monkeypatch):
+    # real sessions from a pool, so what this test commits is cleaned up here
+    # rather than rolled back with the test's transaction
+    monkeypatch.setattr(
+        "app.db_connection.SessionLocal",
+        sessionmaker(autocommit=False, autoflush=True, bind=test_engine),
+    )
+    app.dependency_overrides.pop(get_db_session, None)
+
+    try:
+        with TestClient(app) as _client:
+            yield _client
+    finally:
+        with test_engine.begin() as connection:
+            connection.execute(text("DELETE FROM category"))
+
+
+def test_integrate_session_lifecycle_no_connection_growth(
+    lifecycle_client, test_engine, monkeypatch
+):
+    engine = test_engine
+    # nothing is cached, so every request checks out a connection
+    monkeypatch.setattr(category_cache, "ttl", 0)
+    monkeypatch.setattr(category_cache, "negative_ttl", 0)
+    category = get_random_category_dict()
+    category.pop("id")
+
+    response = lifecycle_client.post("api/category/", json=category)
+    assert response.status_code == 201
+
+    baseline = count_database_connections(engine)
+    misses = category_cache.stats()["misses"]
+
+    for i in range(LOAD_TEST_REQUESTS):
+        if i % 10 == 0:
+            response = lifecycle_client.get("api/category/slug/does-not-exist")
+            assert response.status_code == 404
+        else:
+            response = lifecycle_client.get(f"api/category/slug/{category['slug']}")
+            assert response.status_code == 200
+
+    assert category_cache.stats()["misses"] - misses == LOAD_TEST_REQUESTS
+    assert engine.pool.checkedout() == 0
+    assert count_database_connections(engine) <= baseline
@@ -0,0 +1,197 @@
+import os
+import threading
+import pytest
+from fastapi import HTTPException
+from sqlalchemy import select, text, update
+from sqlalchemy.orm import sessionmaker
+from app.models import (
+    Category,
+    Product,
+    ProductLine,
+    StockReservation,
+    StockReservationLine,
+)
+from app.utils.stock import expire_reservations, reserve_stock
+
+CONTENTION_CLIENTS = int(os.getenv("CONTENTION_CLIENTS", "50"))
+
+
+def create_lines(db_session, *stock):
+    category = Category(name="Stocked", slug="stocked", is_active=True)
+    db_session.add(category)
+    db_session.flush()
+    product = Product(
+        name="Stocked", slug="stocked", category_id=category.id, is_active=True
+    )
+    db_session.add(product)
+    db_session.flush()
+
+    lines = [
+        ProductLine(
+            price=10,
+            order=order,
+            weight=1.0,
+            product_id=product.id,
+            stock_qty=qty,
+            is_active=True,
+        )
+        for order, qty in enumerate(stock, start=1)
+    ]
+    db_session.add_all(lines)
+    db_session.commit()
+    return lines
+
+
+def stock_of(db_session, *lines):
+    return [
+        db_session.execute(
+            select(ProductLine.stock_qty).where(ProductLine.id == line.id)
+        ).scalar()
+        for line in lines
+    ]
+
+
+def reserve(client, *lines, **body):
+    return client.post(
+        "api/stock/reservations",
+        json={
+            "lines": [{"sku": str(line.sku), "quantity": qty} for line, qty in lines],
+            **body,
+        },
+    )
+
+
+def test_integrate_stock_reserve_and_commit(client, db_session_integration):
+    lamp, chair = create_lines(db_session_integration, 5, 2)
+
+    response = reserve(client, (lamp, 3), (chair, 2))
+    assert response.status_code == 201
+    reservation = response.json()
+    assert reservation["status"] == "held"
+    assert stock_of(db_session_integration, lamp, chair) == [2, 0]
+
+    response = client.post(f"api/stock/reservations/{reservation['id']}/commit")
+    assert response.status_code == 200
+    assert response.json()["status"] == "committed"
+    # committing again is a no-op, releasing is refused
+    assert (
+        client.post(f"api/stock/reservations/{reservation['id']}/commit").status_code
+        == 200
+    )
+    assert (
+        client.post(f"api/stock/reservations/{reservation['id']}/release").status_code
+        == 409
+    )
+    assert stock_of(db_session_integration, lamp, chair) == [2, 0]
+
+
+def test_integrate_stock_release_restocks(client, db_session_integration):
+    (lamp,) = create_lines(db_session_integration, 5)
+    reservation_id = reserve(client, (lamp, 4)).json()["id"]
+
+    for _ in range(2):
+        response = client.post(f"api/stock/reservations/{reservation_id}/release")
+        assert response.status_code == 200
+        assert response.json()["status"] == "released"
+    # restocked once, however often it is released
+    assert stock_of(db_session_integration, lamp) == [5]
+
+    response = client.post(f"api/stock/reservations/{reservation_id}/commit")
+    assert response.status_code == 409
+    assert response.json() == {"detail": "Reservation released"}
+
+
+def test_integrate_stock_all_or_nothing(client, db_session_integration):
+    lamp, chair = create_lines(db_session_integration, 5, 1)
+
+    response = reserve(client, (lamp, 2), (chair, 3))
+
+    assert response.status_code == 409
+    assert response.json() == {
+        "detail": {"message": "Insufficient stock", "skus": [str(chair.sku)]}
+    }
+    assert stock_of(db_session_integration, lamp, chair) == [5, 1]
+    assert db_session_integration.execute(select(StockReservation.id)).first() is None
+
+
+def test_integrate_stock_inactive_line(client, db_session_integration):
+    (lamp,) = create_lines(db_session_integration, 5)
+    db_session_integration.execute(
+        update(ProductLine).where(ProductLine.id == lamp.id).values(is_active=False)
+    )
+    db_session_integration.commit()
+
+    assert reserve(client, (lamp, 1)).status_code == 409
+
+
+def test_integrate_stock_expired_reservations_restock(client, db_session_integration):
+    (lamp,) = create_lines(db_session_integration, 5)
+    expiring = reserve(client, (lamp, 2), ttl_seconds=60).json()["id"]
+    kept = reserve(client, (lamp, 1), ttl_seconds=60).json()["id"]
+    db_session_integration.execute(
+        update(StockReservation)
+        .where(StockReservation.id == expiring)
+        .values(expires_at=text("now() - interval '1 second'"))
+    )
+    db_session_integration.commit()
+
+    # due but not swept yet: too late to commit
+    response = client.post(f"api/stock/reservations/{expiring}/commit")
+    assert response.json() == {"detail": "Reservation expired"}
+
+    assert expire_reservations(db_session_integration, batch_size=1) == 1
+    assert stock_of(db_session_integration, lamp) == [3]
+    assert client.get(f"api/stock/reservations/{expiring}").json()["status"] == (
+        "expired"
+    )
+    assert client.get(f"api/stock/reservations/{kept}").json()["status"] == "held"
+
+
+@pytest.fixture()
+def committed_line(test_engine):
+    # the contention test needs real commits from separate connections
+    Session = sessionmaker(bind=test_engine)
+    with Session() as db:
+        (line,) = create_lines(db, CONTENTION_CLIENTS // 2)
+        db.refresh(line)
+        db.expunge(line)
+
+    try:
+        yield line, Session
+    finally:
+        with test_engine.begin() as connection:
+            for table in (StockReservationLine, StockReservation):
+                connection.execute(table.__table__.delete())
+            for table in (ProductLine, Product, Category):
+                connection.execute(table.__table__.delete())
+
+
+def test_integrate_stock_concurrent_reservations_never_oversell(committed_line):
+    line, Session = committed_line
+    start = threading.Barrier(CONTENTION_CLIENTS)
+    outcomes = []
+
+    def client():
+        with Session() as db:
+            start.wait()
+            try:
+                reserve_stock(db, {line.sku: 1}, 60)
+                outcomes.append(201)
+            except HTTPException as e:
+                outcomes.append(e.status_code)
+
+    threads = [threading.Thread(target=client) for _ in range(CONTENTION_CLIENTS)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    with Session() as db:
+        assert stock_of(db, line) == [0]
+        held = db.execute(
+            select(StockReservationLine.quantity).where(
+                StockReservationLine.product_line_id == line.id
+            )
+        ).all()
+    assert outcomes.count(201) == CONTENTION_CLIENTS // 2 == len(held)
+    assert outcomes.count(409) == CONTENTION_CLIENTS - CONTENTION_CLIENTS // 2
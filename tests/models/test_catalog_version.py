@@ -0,0 +1,20 @@
+from sqlalchemy import BigInteger, String
+
+
+def test_model_structure_table_exists(db_inspector):
+    assert db_inspector.has_table("catalog_version")
+
+
+def test_model_structure_column_data_types(db_inspector):
+    table = "catalog_version"
+    columns = {columns["name"]: columns for columns in db_inspector.get_columns(table)}
+
+    assert isinstance(columns["name"]["type"], String)
+    assert isinstance(columns["version"]["type"], BigInteger)
+
+
+def test_model_structure_default_values(db_inspector):
+    table = "catalog_version"
+    columns = {columns["name"]: columns for columns in db_inspector.get_columns(table)}
+
+    assert columns["version"]["default"] == "0"
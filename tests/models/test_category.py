@@ -1,4 +1,5 @@
 from sqlalchemy import Integer, Boolean, String
+from sqlalchemy.dialects.postgresql import TSVECTOR
 import pytest
 
 
@@ -16,6 +17,7 @@ def test_model_structure_column_data_types(db_inspector):
     assert isinstance(columns["is_active"]["type"], Boolean)
     assert isinstance(columns["level"]["type"], Integer)
     assert isinstance(columns["parent_id"]["type"], Integer)
+    assert isinstance(columns["search_vector"]["type"], TSVECTOR)
 
 
 def test_model_structure_nullable_constraints(db_inspector):
@@ -29,6 +31,7 @@ def test_model_structure_nullable_constraints(db_inspector):
         "is_active": False,
         "level": False,
         "parent_id": True,
+        "search_vector": True,
     }
 
     for column in columns:
@@ -55,6 +55,10 @@ def test_model_structure_column_constraints(db_inspector):
     assert any(
         constraint["name"] == "product_line_max_value" for constraint in constraints
     )
+    assert any(
+        constraint["name"] == "product_line_stock_qty_check"
+        for constraint in constraints
+    )
 
 
 def test_model_structure_default_values(db_inspector):
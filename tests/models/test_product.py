@@ -1,5 +1,5 @@
 from sqlalchemy import Integer, Boolean, String, Text, DateTime, Enum
-from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.dialects.postgresql import TSVECTOR, UUID
 
 
 def test_model_structure_table_exists(db_inspector):
@@ -22,6 +22,7 @@ def test_model_structure_column_data_types(db_inspector):
     assert isinstance(columns["stock_status"]["type"], Enum)
     assert isinstance(columns["category_id"]["type"], Integer)
     assert isinstance(columns["seasonal_event"]["type"], Integer)
+    assert isinstance(columns["search_vector"]["type"], TSVECTOR)
 
 
 def test_model_structure_nullable_constraints(db_inspector):
@@ -41,6 +42,7 @@ def test_model_structure_nullable_constraints(db_inspector):
         "stock_status": False,
         "category_id": False,
         "seasonal_event": True,
+        "search_vector": True,
     }
 
     for column in columns:
@@ -0,0 +1,138 @@
+import pytest
+from fixtures import db_inspector
+from sqlalchemy import func, select, text
+from sqlalchemy.dialects import postgresql
+from app.models import (
+    Product,
+    ProductAttributeValue,
+    ProductImage,
+    ProductLine,
+    Seasonal,
+)
+from app.utils.category_tree import descendants_query
+from app.utils.category_utils import (
+    CATEGORY_ORDERINGS,
+    CATEGORY_RETURN_COLUMNS,
+    filter_categories,
+)
+from app.utils.pagination import apply_keyset
+
+ACCESS_PATTERN_INDEXES = {
+    "category": {
+        "ix_category_parent_id",
+        "ix_category_is_active_id",
+        "ix_category_level_name",
+        "ix_category_search_vector",
+        "ix_category_name_trgm",
+    },
+    "product": {
+        "ix_product_category_id",
+        "ix_product_search_vector",
+        "ix_product_name_trgm",
+        "ix_product_seasonal_event",
+    },
+    "product_line": {"ix_product_line_product_id"},
+    "product_image": {"ix_product_image_product_line_id"},
+    "product_attribute_value": {"ix_product_attribute_value_product_line_id"},
+    "seasonal_event": {"ix_seasonal_event_active_during"},
+}
+
+
+def plan_index_names(db_session, statement):
+    """Indexes the planner picks for ``statement`` when it may not seq scan.
+
+    The test tables are nearly empty, where a sequential scan always wins, so
+    seq scans are disabled to check the indexes can serve these queries.
+    """
+    sql = statement.compile(
+        dialect=postgresql.dialect(), compile_kwargs={"literal_binds": True}
+    )
+    with db_session() as session:
+        session.execute(text("SET LOCAL enable_seqscan = off"))
+        (plan,) = session.execute(text(f"EXPLAIN (FORMAT JSON) {sql}")).scalar()
+        session.rollback()
+
+    names = set()
+    nodes = [plan["Plan"]]
+    while nodes:
+        node = nodes.pop()
+        if "Index Name" in node:
+            names.add(node["Index Name"])
+        nodes.extend(node.get("Plans", []))
+    return names
+
+
+@pytest.mark.parametrize("table, indexes", ACCESS_PATTERN_INDEXES.items())
+def test_model_structure_access_pattern_indexes(db_inspector, table, indexes):
+    names = {index["name"] for index in db_inspector.get_indexes(table)}
+    assert indexes <= names
+
+
+@pytest.mark.parametrize(
+    "statement, index",
+    [
+        (descendants_query(1, 5), "ix_category_parent_id"),
+        (
+            apply_keyset(
+                filter_categories(select(*CATEGORY_RETURN_COLUMNS), is_active=True),
+                CATEGORY_ORDERINGS["id"],
+                [10],
+            ).limit(101),
+            "ix_category_is_active_id",
+        ),
+        (
+            apply_keyset(
+                filter_categories(select(*CATEGORY_RETURN_COLUMNS), level=3),
+                CATEGORY_ORDERINGS["level_name"],
+            ).limit(101),
+            "ix_category_level_name",
+        ),
+        (
+            select(Product)
+            .where(Product.category_id == 1)
+            .order_by(Product.id)
+            .limit(51),
+            "ix_product_category_id",
+        ),
+        (
+            select(ProductLine).where(ProductLine.product_id.in_([1, 2, 3])),
+            "ix_product_line_product_id",
+        ),
+        (
+            select(ProductImage).where(ProductImage.product_line_id.in_([1, 2, 3])),
+            "ix_product_image_product_line_id",
+        ),
+        (
+            select(ProductAttributeValue).where(
+                ProductAttributeValue.product_line_id.in_([1, 2, 3])
+            ),
+            "ix_product_attribute_value_product_line_id",
+        ),
+        (
+            select(Seasonal.id).where(
+                Seasonal.active_during.contains(func.localtimestamp())
+            ),
+            "ix_seasonal_event_active_during",
+        ),
+        (
+            select(Product)
+            .where(Product.seasonal_event.in_([1, 2]))
+            .order_by(Product.id)
+            .limit(51),
+            "ix_product_seasonal_event",
+        ),
+    ],
+    ids=[
+        "category_descendants",
+        "category_list_is_active",
+        "category_list_level",
+        "products_by_category",
+        "product_lines_by_product",
+        "product_images_by_line",
+        "product_attribute_values_by_line",
+        "active_seasonal_events",
+        "products_by_seasonal_event",
+    ],
+)
+def test_model_query_plan_uses_index(db_session, statement, index):
+    assert index in plan_index_names(db_session, statement)
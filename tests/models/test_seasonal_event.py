@@ -1,5 +1,6 @@
 from sqlalchemy import Integer, Boolean, String, DateTime
 import pytest
+from sqlalchemy.dialects.postgresql import TSRANGE
 
 
 def test_model_structure_table_exists(db_inspector):
@@ -14,6 +15,7 @@ def test_model_structure_column_data_types(db_inspector):
     assert isinstance(columns["start_date"]["type"], DateTime)
     assert isinstance(columns["end_date"]["type"], DateTime)
     assert isinstance(columns["name"]["type"], String)
+    assert isinstance(columns["active_during"]["type"], TSRANGE)
 
 
 def test_model_structure_nullable_constraints(db_inspector):
@@ -25,6 +27,7 @@ def test_model_structure_nullable_constraints(db_inspector):
         "start_date": False,
         "end_date": False,
         "name": False,
+        "active_during": True,
     }
 
     for column in columns:
@@ -0,0 +1,79 @@
+from sqlalchemy import Integer, DateTime, Enum
+import pytest
+from sqlalchemy.dialects.postgresql import UUID
+
+
+def test_model_structure_table_exists(db_inspector):
+    assert db_inspector.has_table("stock_reservation")
+    assert db_inspector.has_table("stock_reservation_line")
+
+
+def test_model_structure_column_data_types(db_inspector):
+    table = "stock_reservation"
+    columns = {columns["name"]: columns for columns in db_inspector.get_columns(table)}
+
+    assert isinstance(columns["id"]["type"], UUID)
+    assert isinstance(columns["status"]["type"], Enum)
+    assert isinstance(columns["created_at"]["type"], DateTime)
+    assert isinstance(columns["expires_at"]["type"], DateTime)
+    assert isinstance(columns["closed_at"]["type"], DateTime)
+
+    table = "stock_reservation_line"
+    columns = {columns["name"]: columns for columns in db_inspector.get_columns(table)}
+
+    assert isinstance(columns["reservation_id"]["type"], UUID)
+    assert isinstance(columns["product_line_id"]["type"], Integer)
+    assert isinstance(columns["quantity"]["type"], Integer)
+
+
+def test_model_structure_nullable_constraints(db_inspector):
+    table = "stock_reservation"
+    columns = db_inspector.get_columns(table)
+
+    expected_nullable = {
+        "id": False,
+        "status": False,
+        "created_at": False,
+        "expires_at": False,
+        "closed_at": True,
+    }
+
+    for column in columns:
+        column_name = column["name"]
+        assert column["nullable"] == expected_nullable.get(
+            column_name
+        ), f"column '{column_name} is not nullable as expected'"
+
+
+def test_model_structure_default_values(db_inspector):
+    table = "stock_reservation"
+    columns = {columns["name"]: columns for columns in db_inspector.get_columns(table)}
+
+    assert columns["status"]["default"] == "'held'::reservation_status_enum"
+
+
+def test_model_structure_column_constraints(db_inspector):
+    table = "stock_reservation_line"
+    constraints = db_inspector.get_check_constraints(table)
+
+    assert any(
+        constraint["name"] == "stock_reservation_line_quantity_check"
+        for constraint in constraints
+    )
+
+
+def test_model_structure_primary_key(db_inspector):
+    table = "stock_reservation_line"
+    primary_key = db_inspector.get_pk_constraint(table)
+
+    assert primary_key["constrained_columns"] == ["reservation_id", "product_line_id"]
+
+
+def test_model_structure_held_expiry_index(db_inspector):
+    indexes = {
+        index["name"]: index for index in db_inspector.get_indexes("stock_reservation")
+    }
+
+    assert indexes["ix_stock_reservation_held_expires_at"]["column_names"] == [
+        "expires_at"
+    ]
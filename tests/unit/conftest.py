@@ -0,0 +1,17 @@
+import pytest
+from datetime import datetime, timezone
+from app.utils.catalog_version import CatalogState, category_version
+from app.utils.category_tree_cache import category_tree_cache
+from app.utils.category_cache import category_cache
+
+
+@pytest.fixture(autouse=True)
+def reset_category_caches(monkeypatch):
+    # unit tests never reach the database, so pin the catalog version
+    monkeypatch.setattr(
+        "app.utils.catalog_version.read_catalog_state",
+        lambda db, name: CatalogState(0, datetime(2024, 1, 1, tzinfo=timezone.utc)),
+    )
+    category_tree_cache.invalidate()
+    category_cache.clear()
+    category_version.expire()
@@ -0,0 +1,45 @@
+from app.utils.pool_stats import LatencyHistogram, PoolStats, instrumented_pool_class
+from sqlalchemy.pool import QueuePool
+
+
+def test_unit_latency_histogram_buckets():
+    histogram = LatencyHistogram(buckets_ms=(1, 10, 100))
+
+    for seconds in (0.0005, 0.005, 0.05, 0.5):
+        histogram.observe(seconds)
+
+    snapshot = histogram.snapshot()
+    assert snapshot["counts"] == [1, 1, 1, 1]
+    assert snapshot["count"] == 4
+    assert snapshot["max_ms"] == 500.0
+
+
+def test_unit_instrumented_pool_records_checkout_wait():
+    stats = PoolStats()
+    pool_class = instrumented_pool_class(QueuePool, stats)
+
+    class MockConnection:
+        def rollback(self):
+            pass
+
+        def close(self):
+            pass
+
+    pool = pool_class(MockConnection, pool_size=1, max_overflow=0)
+    connection = pool.connect()
+
+    snapshot = stats.snapshot(pool)
+    assert snapshot["pool_class"] == "InstrumentedQueuePool"
+    assert snapshot["checked_out"] == 1
+    assert snapshot["checkout_wait"]["count"] == 1
+
+    connection.close()
+    assert stats.snapshot(pool)["checked_out"] == 0
+
+
+def test_unit_get_pool_stats(client):
+    response = client.get("api/admin/pool")
+
+    assert response.status_code == 200
+    assert set(response.json()) == {"sync", "async"}
+    assert response.json()["sync"]["size"] >= 1
@@ -0,0 +1,170 @@
+import json
+import pytest
+from sqlalchemy.dialects import postgresql
+from app.utils import catalog_import
+from app.utils.catalog_import import (
+    FEEDS,
+    copy_rows,
+    import_catalog,
+    read_rows,
+    staging_product_line,
+)
+
+
+class MockCursor:
+    def __init__(self):
+        self.copies = []
+
+    def copy_expert(self, sql, buffer):
+        self.copies.append((sql, buffer.read()))
+
+    def close(self):
+        pass
+
+
+class MockConnection:
+    def __init__(self, cursor):
+        self.connection = self
+        self._cursor = cursor
+
+    def cursor(self):
+        return self._cursor
+
+
+class MockSession:
+    """Enough of a session for staging: a dialect and a raw cursor."""
+
+    def __init__(self):
+        self.cursor = MockCursor()
+        self.dialect = postgresql.dialect()
+        self.calls = []
+
+    def get_bind(self):
+        return self
+
+    def connection(self):
+        return MockConnection(self.cursor)
+
+    def commit(self):
+        self.calls.append("commit")
+
+    def rollback(self):
+        self.calls.append("rollback")
+
+
+def compile_sql(statement):
+    return str(statement.compile(dialect=postgresql.dialect()))
+
+
+def test_unit_catalog_import_read_csv_rows(tmp_path):
+    path = tmp_path / "products.csv"
+    path.write_text("slug,name,is_active\nlamp,Desk lamp,true\nrug,Rug,\n")
+
+    rows = list(read_rows(str(path), ["slug", "name", "category", "is_active"]))
+
+    # missing columns and empty values are staged as NULL
+    assert rows == [("lamp", "Desk lamp", "", "true"), ("rug", "Rug", "", "")]
+
+
+def test_unit_catalog_import_read_jsonl_rows(tmp_path):
+    path = tmp_path / "lines.jsonl"
+    records = [
+        {"sku": "a", "price": 9.5, "is_active": True},
+        {"sku": "b", "price": 12, "is_active": False, "weight": None},
+    ]
+    path.write_text("\n".join(json.dumps(record) for record in records) + "\n\n")
+
+    rows = list(read_rows(str(path), ["sku", "price", "is_active", "weight"]))
+
+    assert rows == [("a", 9.5, "true", ""), ("b", 12, "false", "")]
+
+
+def test_unit_catalog_import_rejects_unknown_columns(tmp_path):
+    path = tmp_path / "products.csv"
+    path.write_text("slug,colour\nlamp,red\n")
+
+    with pytest.raises(ValueError, match=r"record 1 has unknown columns \['colour'\]"):
+        list(read_rows(str(path), ["slug", "name"]))
+
+
+def test_unit_catalog_import_copy_rows():
+    db = MockSession()
+
+    copy_rows(db, staging_product_line, [("a", "lamp", 9.5, 3, "true", 1, 1.0)])
+
+    ((sql, data),) = db.cursor.copies
+    assert sql == (
+        "COPY staging_product_line "
+        '(sku, product, price, stock_qty, is_active, "order", weight) '
+        "FROM STDIN WITH (FORMAT csv)"
+    )
+    assert data == "a,lamp,9.5,3,true,1,1.0\r\n"
+
+
+@pytest.mark.parametrize(
+    "feed, constraint",
+    [
+        ("products", "uq_product_slug"),
+        ("product_lines", "uq_product_line_sku"),
+        ("product_images", "uq_product_image_alt"),
+        ("attribute_values", "uq_attribute_value_attribute_id"),
+        ("product_attribute_values", "uq_product_attribute_value"),
+    ],
+)
+def test_unit_catalog_import_merge_is_one_upsert(feed, constraint):
+    _, merge = FEEDS[feed]
+    sql = compile_sql(merge())
+
+    assert sql.count("INSERT INTO") == 1
+    assert f"ON CONFLICT ON CONSTRAINT {constraint} DO UPDATE" in sql
+    # unchanged rows are not rewritten
+    assert "IS DISTINCT FROM" in sql
+    assert "DISTINCT ON" in sql
+
+
+def test_unit_catalog_import_product_lines_keep_current_values():
+    sql = compile_sql(FEEDS["product_lines"][1]())
+    update = sql[sql.index("DO UPDATE SET") :]
+
+    # an empty column keeps the existing row's value
+    assert "coalesce(source.is_active, existing.is_active, false)" in sql
+    # stock held by reservations is only known to the database
+    assert "stock_qty" not in update
+
+
+def test_unit_catalog_import_merges_in_dependency_order(monkeypatch):
+    merged = []
+    monkeypatch.setattr(catalog_import, "stage_feed", lambda db, feed, *args: 10)
+    monkeypatch.setattr(
+        catalog_import,
+        "merge_feed",
+        lambda db, feed, staged: merged.append(feed) or {"staged": staged},
+    )
+    for table, _ in FEEDS.values():
+        monkeypatch.setattr(table, "drop", lambda *args, **kwargs: None)
+    db = MockSession()
+
+    stats = import_catalog(
+        db, {"product_images": "images.csv", "products": "products.csv"}
+    )
+
+    assert merged == ["products", "product_images"]
+    assert stats == {"products": {"staged": 10}, "product_images": {"staged": 10}}
+    assert db.calls == ["commit"]
+
+
+def test_unit_catalog_import_rolls_back_on_error(monkeypatch):
+    def mock_stage_feed(db, feed, *args):
+        raise ValueError("bad feed")
+
+    monkeypatch.setattr(catalog_import, "stage_feed", mock_stage_feed)
+    db = MockSession()
+
+    with pytest.raises(ValueError, match="bad feed"):
+        import_catalog(db, {"products": "products.csv"})
+    assert db.calls == ["rollback"]
+
+
+def test_unit_catalog_import_unknown_feed():
+    with pytest.raises(ValueError, match="Unknown feeds"):
+        import_catalog(MockSession(), {"categories": "categories.csv"})
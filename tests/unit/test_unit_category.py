@@ -1,15 +1,33 @@
+from collections import namedtuple
 from app.schemas.category_schema import CategoryCreate
 import pytest
 from pydantic import ValidationError
 from tests.factories.models_factory import get_random_category_dict
 from app.models import Category
-from fastapi import HTTPException
+from sqlalchemy.exc import IntegrityError
+from app.utils.category_utils import CATEGORY_ORDERINGS
+from app.utils.pagination import decode_cursor, encode_cursor
 
 
 def mock_output(return_value=None):
     return lambda *args, **kwargs: return_value
 
 
+def mock_integrity_error(constraint_name):
+    class MockDiag:
+        pass
+
+    class MockDBAPIError(Exception):
+        diag = MockDiag()
+
+    MockDiag.constraint_name = constraint_name
+
+    def raise_integrity_error(*args, **kwargs):
+        raise IntegrityError("INSERT INTO category", {}, MockDBAPIError())
+
+    return raise_integrity_error
+
+
 def test_unit_schema_category_validation():
     valid_data = {"name": "test category", "slug": "test_slug"}
     category = CategoryCreate(**valid_data)
@@ -43,26 +61,62 @@ def test_unit_create_new_category_succesfully(client, monkeypatch):
     assert response.json() == category
 
 
+def mock_failed_tree_cache_patch(monkeypatch):
+    def mock_apply_write_exception(*args, **kwargs):
+        raise Exception("catalog version unavailable")
+
+    invalidated = []
+    monkeypatch.setattr(
+        "app.routers.category_routes.category_tree_cache.apply_write",
+        mock_apply_write_exception,
+    )
+    monkeypatch.setattr(
+        "app.routers.category_routes.category_tree_cache.invalidate",
+        lambda: invalidated.append(True),
+    )
+    return invalidated
+
+
+def test_unit_create_new_category_tree_cache_error(client, monkeypatch):
+    category = get_random_category_dict()
+
+    for key, value in category.items():
+        monkeypatch.setattr(Category, key, value)
+
+    monkeypatch.setattr("sqlalchemy.orm.Query.first", mock_output())
+    monkeypatch.setattr("sqlalchemy.orm.Session.commit", mock_output())
+    monkeypatch.setattr("sqlalchemy.orm.Session.refresh", mock_output())
+    invalidated = mock_failed_tree_cache_patch(monkeypatch)
+
+    body = category.copy()
+    body.pop("id")
+
+    response = client.post("api/category", json=body)
+
+    # the category is committed, only the cache is dropped
+    assert response.status_code == 201
+    assert response.json() == category
+    assert invalidated == [True]
+
+
 @pytest.mark.parametrize(
-    "existing_category, category_data, expected_detail",
+    "constraint_name, category_data, expected_detail",
     [
-        (True, get_random_category_dict(), "Category name and level exists"),
-        (True, get_random_category_dict(), "Category slug exists"),
+        (
+            "uq_category_name_level",
+            get_random_category_dict(),
+            "Category name and level exists",
+        ),
+        ("uq_category_slug", get_random_category_dict(), "Category slug exists"),
     ],
 )
 def test_unit_create_new_category_existing(
-    client, monkeypatch, existing_category, category_data, expected_detail
+    client, monkeypatch, constraint_name, category_data, expected_detail
 ):
-    def mock_check_existing_category(db, category_data):
-        if existing_category:
-            raise HTTPException(status_code=400, detail=expected_detail)
-
     monkeypatch.setattr(
-        "app.routers.category_routes.check_existing_category",
-        mock_check_existing_category,
+        "sqlalchemy.orm.Session.commit", mock_integrity_error(constraint_name)
     )
 
-    monkeypatch.setattr("sqlalchemy.orm.Query.first", mock_output())
     body = category_data.copy()
     body.pop("id")
     response = client.post("api/category", json=body)
@@ -73,6 +127,19 @@ def test_unit_create_new_category_existing(
         assert response.json() == {"detail": expected_detail}
 
 
+def test_unit_create_new_category_unknown_integrity_error(client, monkeypatch):
+    monkeypatch.setattr(
+        "sqlalchemy.orm.Session.commit", mock_integrity_error("category_parent_id_fkey")
+    )
+
+    body = get_random_category_dict()
+    body.pop("id")
+    response = client.post("api/category", json=body)
+
+    assert response.status_code == 500
+    assert response.json() == {"detail": "Internal server error"}
+
+
 def test_unit_create_new_category_with_internal_server_error(client, monkeypatch):
     category = get_random_category_dict()
 
@@ -217,6 +284,20 @@ def test_unit_delete_category_succesfully(client, monkeypatch):
     assert response.json() == expected_json
 
 
+def test_unit_delete_category_tree_cache_error(client, monkeypatch):
+    category_dict = get_random_category_dict()
+    category_instance = Category(**category_dict)
+
+    monkeypatch.setattr("sqlalchemy.orm.Query.first", mock_output(category_instance))
+    monkeypatch.setattr("sqlalchemy.orm.Session.delete", mock_output())
+    monkeypatch.setattr("sqlalchemy.orm.Session.commit", mock_output())
+    invalidated = mock_failed_tree_cache_patch(monkeypatch)
+
+    response = client.delete("api/category/1")
+    assert response.status_code == 200
+    assert invalidated == [True]
+
+
 def test_unit_delete_category_not_found(client, monkeypatch):
     category = []
 
@@ -238,3 +319,108 @@ def test_unit_delete_category_internal_error(client, monkeypatch):
     response = client.delete("api/category/1")
     assert response.status_code == 500
     assert response.json() == {"detail": "Internal server error"}
+
+
+def test_unit_get_all_categories_next_cursor(client, monkeypatch):
+    categories = [Category(**get_random_category_dict()) for _ in range(3)]
+    for i, category in enumerate(categories, start=1):
+        category.id = i
+    monkeypatch.setattr("sqlalchemy.orm.Query.all", mock_output(categories))
+
+    response = client.get("api/category?limit=2")
+    assert response.status_code == 200
+    assert len(response.json()) == 2
+
+    next_cursor = response.headers["X-Next-Cursor"]
+    assert decode_cursor(next_cursor, "id", CATEGORY_ORDERINGS["id"]) == [2]
+
+
+def test_unit_get_all_categories_no_cursor_on_last_page(client, monkeypatch):
+    category = [get_random_category_dict() for _ in range(2)]
+    monkeypatch.setattr("sqlalchemy.orm.Query.all", mock_output(category))
+
+    response = client.get("api/category?limit=2")
+    assert response.status_code == 200
+    assert "X-Next-Cursor" not in response.headers
+
+
+@pytest.mark.parametrize(
+    "cursor",
+    [
+        "not-a-cursor",
+        encode_cursor("level_name", [1, "name"]),
+        encode_cursor("id", ["1"]),
+    ],
+)
+def test_unit_get_all_categories_invalid_cursor(client, cursor):
+    response = client.get(f"api/category?cursor={cursor}")
+    assert response.status_code == 400
+    assert response.json() == {"detail": "Invalid cursor"}
+
+
+def test_unit_get_all_categories_limit_cap(client):
+    response = client.get("api/category?limit=100000")
+    assert response.status_code == 422
+
+
+def test_unit_update_category_existing_slug(client, monkeypatch):
+    category_dict = get_random_category_dict()
+    category_instance = Category(**category_dict)
+
+    monkeypatch.setattr("sqlalchemy.orm.Query.first", mock_output(category_instance))
+    monkeypatch.setattr(
+        "sqlalchemy.orm.Session.commit", mock_integrity_error("uq_category_slug")
+    )
+
+    body = category_dict.copy()
+    body.pop("id")
+
+    response = client.put("api/category/1", json=body)
+    assert response.status_code == 400
+    assert response.json() == {"detail": "Category slug exists"}
+
+
+def as_rows(categories):
+    Row = namedtuple("Row", list(categories[0]))
+    return [Row(**category) for category in categories]
+
+
+def test_unit_get_all_categories_fast_serialization(client, monkeypatch):
+    categories = [get_random_category_dict(i) for i in range(3)]
+    monkeypatch.setattr("app.routers.category_routes.CATEGORY_FAST_SERIALIZATION", True)
+    monkeypatch.setattr("sqlalchemy.orm.Query.all", mock_output(as_rows(categories)))
+
+    response = client.get("api/category")
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/json"
+    assert response.headers["ETag"] == '"category-0"'
+    assert response.json() == categories
+
+
+def test_unit_get_all_categories_fast_serialization_next_cursor(client, monkeypatch):
+    categories = [dict(get_random_category_dict(), id=i) for i in range(1, 4)]
+    monkeypatch.setattr("app.routers.category_routes.CATEGORY_FAST_SERIALIZATION", True)
+    monkeypatch.setattr("sqlalchemy.orm.Query.all", mock_output(as_rows(categories)))
+
+    response = client.get("api/category?limit=2")
+    assert response.status_code == 200
+    assert response.json() == categories[:2]
+    assert decode_cursor(
+        response.headers["X-Next-Cursor"], "id", CATEGORY_ORDERINGS["id"]
+    ) == [2]
+
+
+def test_unit_get_all_categories_selects_columns_only(client, monkeypatch):
+    categories = [get_random_category_dict()]
+    selected = []
+
+    def mock_all(query):
+        selected.extend(column["name"] for column in query.column_descriptions)
+        return categories
+
+    monkeypatch.setattr("sqlalchemy.orm.Query.all", mock_all)
+
+    response = client.get("api/category")
+    assert response.status_code == 200
+    assert response.json() == categories
+    assert selected == ["id", "name", "slug", "is_active", "level", "parent_id"]
@@ -0,0 +1,141 @@
+from tests.factories.models_factory import get_random_category_dict
+from sqlalchemy.exc import IntegrityError
+from app.models import Category
+from app.utils.category_utils import CATEGORY_ORDERINGS
+from app.utils.pagination import decode_cursor, encode_cursor
+
+
+class MockResult:
+    def __init__(self, rows):
+        self._rows = rows
+
+    def scalars(self):
+        return self
+
+    def all(self):
+        return self._rows
+
+    def first(self):
+        return self._rows[0] if self._rows else None
+
+
+def async_mock_output(return_value=None):
+    async def mock(*args, **kwargs):
+        return return_value
+
+    return mock
+
+
+def test_unit_async_create_new_category_succesfully(client, monkeypatch):
+    category = get_random_category_dict()
+
+    monkeypatch.setattr(
+        "sqlalchemy.ext.asyncio.AsyncSession.commit", async_mock_output()
+    )
+
+    async def mock_refresh(self, instance):
+        instance.id = category["id"]
+
+    monkeypatch.setattr("sqlalchemy.ext.asyncio.AsyncSession.refresh", mock_refresh)
+
+    body = category.copy()
+    body.pop("id")
+
+    response = client.post("api/async/category/", json=body)
+
+    assert response.status_code == 201
+    assert response.json() == category
+
+
+def test_unit_async_create_new_category_existing(client, monkeypatch):
+    category = get_random_category_dict()
+
+    class MockAsyncpgError(Exception):
+        constraint_name = "uq_category_name_level"
+
+    class MockAdaptedError(Exception):
+        pass
+
+    async def mock_commit(*args, **kwargs):
+        orig = MockAdaptedError()
+        orig.__cause__ = MockAsyncpgError()
+        raise IntegrityError("INSERT INTO category", {}, orig)
+
+    monkeypatch.setattr("sqlalchemy.ext.asyncio.AsyncSession.commit", mock_commit)
+    monkeypatch.setattr(
+        "sqlalchemy.ext.asyncio.AsyncSession.rollback", async_mock_output()
+    )
+
+    body = category.copy()
+    body.pop("id")
+    response = client.post("api/async/category/", json=body)
+
+    assert response.status_code == 400
+    assert response.json() == {"detail": "Category name and level exists"}
+
+
+def test_unit_async_get_all_categories_succesfully(client, monkeypatch):
+    categories = [get_random_category_dict() for _ in range(5)]
+    monkeypatch.setattr(
+        "sqlalchemy.ext.asyncio.AsyncSession.execute",
+        async_mock_output(MockResult(categories)),
+    )
+
+    response = client.get("api/async/category/")
+    assert response.status_code == 200
+    assert response.json() == categories
+
+
+def test_unit_async_get_all_categories_next_cursor(client, monkeypatch):
+    categories = [Category(**get_random_category_dict()) for _ in range(3)]
+    for i, category in enumerate(categories, start=1):
+        category.id = i
+    monkeypatch.setattr(
+        "sqlalchemy.ext.asyncio.AsyncSession.execute",
+        async_mock_output(MockResult(categories)),
+    )
+
+    response = client.get("api/async/category/?limit=2")
+    assert response.status_code == 200
+    assert len(response.json()) == 2
+
+    next_cursor = response.headers["X-Next-Cursor"]
+    assert decode_cursor(next_cursor, "id", CATEGORY_ORDERINGS["id"]) == [2]
+
+
+def test_unit_async_get_all_categories_invalid_cursor(client):
+    cursor = encode_cursor("level_name", [1, "name"])
+    response = client.get(f"api/async/category/?cursor={cursor}")
+    assert response.status_code == 400
+    assert response.json() == {"detail": "Invalid cursor"}
+
+
+def test_unit_async_get_single_category_not_found(client, monkeypatch):
+    monkeypatch.setattr(
+        "sqlalchemy.ext.asyncio.AsyncSession.execute",
+        async_mock_output(MockResult([])),
+    )
+
+    response = client.get("api/async/category/slug/missing")
+    assert response.status_code == 404
+    assert response.json() == {"detail": "Category does not exist"}
+
+
+def test_unit_async_get_all_categories_internal_error(client, monkeypatch):
+    async def mock_execute_exception(*args, **kwargs):
+        raise Exception("Internal server error")
+
+    monkeypatch.setattr(
+        "sqlalchemy.ext.asyncio.AsyncSession.execute", mock_execute_exception
+    )
+
+    response = client.get("api/async/category/")
+    assert response.status_code == 500
+
+
+def test_unit_async_delete_category_not_found(client, monkeypatch):
+    monkeypatch.setattr("sqlalchemy.ext.asyncio.AsyncSession.get", async_mock_output())
+
+    response = client.delete("api/async/category/1")
+    assert response.status_code == 404
+    assert response.json() == {"detail": "Category not found"}
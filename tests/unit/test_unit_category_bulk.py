@@ -0,0 +1,66 @@
+from collections import namedtuple
+from app.schemas.category_schema import CategoryCreate
+from app.utils.category_utils import plan_bulk_categories
+
+ExistingRow = namedtuple("ExistingRow", ["id", "slug", "name", "level"])
+
+
+def make_items(*specs):
+    return [
+        CategoryCreate(name=name, slug=slug, level=level) for name, slug, level in specs
+    ]
+
+
+def test_unit_bulk_plan_without_conflicts():
+    items = make_items(("a", "a", 1), ("b", "b", 1))
+
+    writes, conflicts = plan_bulk_categories(items, [])
+
+    assert [index for index, _ in writes] == [0, 1]
+    assert conflicts == {}
+
+
+def test_unit_bulk_plan_duplicates_in_batch():
+    items = make_items(("a", "a", 1), ("b", "a", 1), ("a", "c", 1))
+
+    writes, conflicts = plan_bulk_categories(items, [])
+
+    assert [index for index, _ in writes] == [0]
+    assert conflicts[1]["detail"] == "Duplicate slug in batch"
+    assert conflicts[2]["detail"] == "Duplicate name and level in batch"
+
+
+def test_unit_bulk_plan_skip_existing():
+    items = make_items(("a", "new-slug", 1), ("new", "b", 1), ("c", "c", 1))
+    existing = [ExistingRow(1, "a", "a", 1), ExistingRow(2, "b", "b", 1)]
+
+    writes, conflicts = plan_bulk_categories(items, existing, "skip")
+
+    assert [index for index, _ in writes] == [2]
+    assert conflicts[0]["detail"] == "Category name and level exists"
+    assert conflicts[1]["detail"] == "Category slug exists"
+
+
+def test_unit_bulk_plan_update_existing():
+    items = make_items(("a", "a", 1), ("renamed", "b", 1), ("a", "other", 1))
+    existing = [ExistingRow(1, "a", "a", 1), ExistingRow(2, "b", "b", 1)]
+
+    writes, conflicts = plan_bulk_categories(items, existing, "update")
+
+    assert [index for index, _ in writes] == [0, 1]
+    assert conflicts[2]["detail"] == "Duplicate name and level in batch"
+
+
+def test_unit_bulk_plan_update_name_level_owned_by_other_slug():
+    items = make_items(("b", "a", 1))
+    existing = [ExistingRow(1, "a", "a", 1), ExistingRow(2, "b", "b", 1)]
+
+    writes, conflicts = plan_bulk_categories(items, existing, "update")
+
+    assert writes == []
+    assert conflicts[0]["detail"] == "Category name and level exists"
+
+
+def test_unit_bulk_create_rejects_empty_batch(client):
+    response = client.post("api/category/bulk", json={"items": []})
+    assert response.status_code == 422
@@ -0,0 +1,164 @@
+import threading
+import pytest
+from app.models import Category
+from app.utils.cache import MISSING, LRUCache, ReadThroughCache, RedisCache
+from app.utils.category_cache import category_cache
+from tests.factories.models_factory import get_random_category_dict
+from tests.utils.fake_redis import FakeRedis
+
+
+def mock_output(return_value=None):
+    return lambda *args, **kwargs: return_value
+
+
+@pytest.fixture(params=["memory", "redis"])
+def backend(request):
+    if request.param == "memory":
+        return LRUCache(max_size=2)
+    return RedisCache(FakeRedis(), "test:")
+
+
+def test_unit_cache_backend_set_get_delete(backend):
+    backend.set("a", {"id": 1}, ttl=60)
+
+    assert backend.get("a") == {"id": 1}
+    assert backend.get("b") is MISSING
+
+    backend.delete("a")
+    assert backend.get("a") is MISSING
+
+
+def test_unit_cache_backend_expires_entries(backend):
+    backend.set("a", {"id": 1}, ttl=-1)
+    assert backend.get("a") is MISSING
+
+
+def test_unit_lru_cache_evicts_least_recently_used():
+    cache = LRUCache(max_size=2)
+    cache.set("a", 1, ttl=60)
+    cache.set("b", 2, ttl=60)
+    cache.get("a")
+    cache.set("c", 3, ttl=60)
+
+    assert cache.get("a") == 1
+    assert cache.get("b") is MISSING
+    assert cache.get("c") == 3
+
+
+def test_unit_read_through_cache_counts_and_negative_caching(backend):
+    cache = ReadThroughCache(backend, ttl=60, negative_ttl=60)
+    loads = []
+
+    def loader():
+        loads.append(1)
+        return None
+
+    assert cache.get_or_load("missing", loader) is None
+    assert cache.get_or_load("missing", loader) is None
+    assert len(loads) == 1
+
+    stats = cache.stats()
+    assert (stats["hits"], stats["negative_hits"], stats["misses"]) == (1, 1, 1)
+
+
+def test_unit_read_through_cache_skips_fill_invalidated_during_load(backend):
+    cache = ReadThroughCache(backend, ttl=60, negative_ttl=60)
+    rows = {"a": "old"}
+
+    def stale_loader():
+        value = rows["a"]
+        # a write commits and invalidates while this load is in flight
+        rows["a"] = "new"
+        cache.invalidate("a")
+        return value
+
+    assert cache.get_or_load("a", stale_loader) == "old"
+    assert backend.get("a") is MISSING
+    assert cache.get_or_load("a", lambda: rows["a"]) == "new"
+    assert cache.get_or_load("a", lambda: "unused") == "new"
+
+
+def test_unit_read_through_cache_skips_negative_fill_invalidated_during_load(
+    backend,
+):
+    cache = ReadThroughCache(backend, ttl=60, negative_ttl=60)
+
+    def loader():
+        cache.clear()
+        return None
+
+    assert cache.get_or_load("a", loader) is None
+    assert backend.get("a") is MISSING
+
+
+def test_unit_read_through_cache_failed_load_is_not_tracked(backend):
+    cache = ReadThroughCache(backend, ttl=60, negative_ttl=60)
+
+    def loader():
+        raise ValueError("database unavailable")
+
+    with pytest.raises(ValueError, match="database unavailable"):
+        cache.get_or_load("a", loader)
+    assert cache.get_or_load("a", lambda: 1) == 1
+    assert backend.get("a") == 1
+
+
+def test_unit_read_through_cache_counts_concurrent_lookups():
+    cache = ReadThroughCache(LRUCache(), ttl=60, negative_ttl=60)
+    cache.get_or_load("a", lambda: 1)
+
+    def lookup():
+        for _ in range(2000):
+            cache.get_or_load("a", lambda: 1)
+
+    threads = [threading.Thread(target=lookup) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    stats = cache.stats()
+    assert (stats["hits"], stats["misses"]) == (8 * 2000, 1)
+
+
+def test_unit_get_category_by_slug_is_cached(client, monkeypatch):
+    category = get_random_category_dict()
+    monkeypatch.setattr("sqlalchemy.orm.Query.first", mock_output(category))
+
+    response = client.get(f"api/category/slug/{category['slug']}")
+    assert response.status_code == 200
+
+    def mock_first_exception(*args, **kwargs):
+        raise Exception("should be served from cache")
+
+    monkeypatch.setattr("sqlalchemy.orm.Query.first", mock_first_exception)
+
+    response = client.get(f"api/category/slug/{category['slug']}")
+    assert response.status_code == 200
+    assert response.json() == category
+    assert category_cache.stats()["hits"] >= 1
+
+
+def test_unit_get_category_by_id_not_found_is_cached(client, monkeypatch):
+    monkeypatch.setattr("sqlalchemy.orm.Query.first", mock_output())
+
+    assert client.get("api/category/1").status_code == 404
+
+    monkeypatch.setattr(
+        "sqlalchemy.orm.Query.first", mock_output(get_random_category_dict())
+    )
+    assert client.get("api/category/1").status_code == 404
+
+
+def test_unit_delete_category_invalidates_cache(client, monkeypatch):
+    category = get_random_category_dict()
+    monkeypatch.setattr("sqlalchemy.orm.Query.first", mock_output(category))
+    assert client.get(f"api/category/slug/{category['slug']}").status_code == 200
+
+    monkeypatch.setattr("sqlalchemy.orm.Query.first", mock_output(Category(**category)))
+    monkeypatch.setattr("sqlalchemy.orm.Session.delete", mock_output())
+    monkeypatch.setattr("sqlalchemy.orm.Session.commit", mock_output())
+    assert client.delete(f"api/category/{category['id']}").status_code == 200
+
+    monkeypatch.setattr("sqlalchemy.orm.Query.first", mock_output())
+    assert client.get(f"api/category/slug/{category['slug']}").status_code == 404
@@ -0,0 +1,87 @@
+import json
+import pytest
+from collections import namedtuple
+from app.main import app
+from app.db_connection import get_read_db_session_factory
+from tests.factories.models_factory import get_random_category_dict
+
+CategoryRow = namedtuple(
+    "CategoryRow", ["id", "name", "slug", "is_active", "level", "parent_id"]
+)
+
+
+class MockResult:
+    def __init__(self, partitions):
+        self._partitions = partitions
+
+    def partitions(self):
+        return iter(self._partitions)
+
+
+class MockSession:
+    closed = False
+
+    def __init__(self, partitions):
+        self._partitions = partitions
+
+    def execute(self, statement):
+        self.statement = statement
+        return MockResult(self._partitions)
+
+    def close(self):
+        MockSession.closed = True
+
+
+@pytest.fixture()
+def categories(monkeypatch):
+    rows = []
+    for i in range(5):
+        category = get_random_category_dict()
+        category["id"] = i + 1
+        rows.append(CategoryRow(**category))
+
+    partitions = [rows[:2], rows[2:4], rows[4:]]
+    MockSession.closed = False
+    monkeypatch.setitem(
+        app.dependency_overrides,
+        get_read_db_session_factory,
+        lambda: lambda: MockSession(partitions),
+    )
+    return [row._asdict() for row in rows]
+
+
+def test_unit_export_categories_ndjson(client, categories):
+    response = client.get("api/category/export")
+
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/x-ndjson"
+    lines = response.text.splitlines()
+    assert [json.loads(line) for line in lines] == categories
+    assert MockSession.closed
+
+
+def test_unit_export_categories_json_array(client, categories):
+    response = client.get("api/category/export?format=json")
+
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/json"
+    assert response.json() == categories
+    assert MockSession.closed
+
+
+def test_unit_export_categories_empty_json_array(client, monkeypatch):
+    monkeypatch.setitem(
+        app.dependency_overrides,
+        get_read_db_session_factory,
+        lambda: lambda: MockSession([]),
+    )
+
+    response = client.get("api/category/export?format=json")
+
+    assert response.status_code == 200
+    assert response.json() == []
+
+
+def test_unit_export_categories_invalid_format(client):
+    response = client.get("api/category/export?format=csv")
+    assert response.status_code == 422
@@ -0,0 +1,78 @@
+import pytest
+from tests.factories.models_factory import get_random_category_dict
+
+
+def mock_output(return_value=None):
+    return lambda *args, **kwargs: return_value
+
+
+def mock_exception(*args, **kwargs):
+    raise Exception("should not reach the database")
+
+
+def test_unit_get_all_categories_sets_validators(client, monkeypatch):
+    monkeypatch.setattr("sqlalchemy.orm.Query.all", mock_output([]))
+
+    response = client.get("api/category")
+
+    assert response.status_code == 200
+    assert response.headers["ETag"] == '"category-0"'
+    assert response.headers["Last-Modified"] == "Mon, 01 Jan 2024 00:00:00 GMT"
+    assert response.headers["Cache-Control"] == "no-cache"
+
+
+@pytest.mark.parametrize(
+    "headers",
+    [
+        {"If-None-Match": '"category-0"'},
+        {"If-None-Match": 'W/"category-0", "other"'},
+        {"If-None-Match": "*"},
+        {"If-Modified-Since": "Mon, 01 Jan 2024 00:00:00 GMT"},
+    ],
+)
+def test_unit_get_all_categories_not_modified(client, monkeypatch, headers):
+    monkeypatch.setattr("sqlalchemy.orm.Query.all", mock_exception)
+
+    response = client.get("api/category", headers=headers)
+
+    assert response.status_code == 304
+    assert response.headers["ETag"] == '"category-0"'
+    assert response.content == b""
+
+
+@pytest.mark.parametrize(
+    "headers",
+    [
+        {"If-None-Match": '"category-1"'},
+        {"If-Modified-Since": "Sun, 31 Dec 2023 23:59:59 GMT"},
+        {
+            "If-None-Match": '"category-1"',
+            "If-Modified-Since": "Mon, 01 Jan 2024 00:00:00 GMT",
+        },
+    ],
+)
+def test_unit_get_all_categories_modified(client, monkeypatch, headers):
+    monkeypatch.setattr("sqlalchemy.orm.Query.all", mock_output([]))
+
+    response = client.get("api/category", headers=headers)
+
+    assert response.status_code == 200
+
+
+def test_unit_get_single_category_not_modified(client, monkeypatch):
+    category = get_random_category_dict()
+    monkeypatch.setattr("sqlalchemy.orm.Query.first", mock_output(category))
+
+    response = client.get(f"api/category/slug/{category['slug']}")
+    etag = response.headers["ETag"]
+
+    response = client.get(
+        f"api/category/slug/{category['slug']}", headers={"If-None-Match": etag}
+    )
+    assert response.status_code == 304
+
+    response = client.get(
+        f"api/category/slug/{category['slug']}", headers={"If-None-Match": '"stale"'}
+    )
+    assert response.status_code == 200
+    assert response.json() == category
@@ -0,0 +1,104 @@
+import pytest
+from app.utils.category_tree import build_tree
+
+
+def make_row(id_, parent_id, depth):
+    return {
+        "id": id_,
+        "name": f"category-{id_}",
+        "slug": f"category-{id_}",
+        "is_active": True,
+        "level": depth + 1,
+        "parent_id": parent_id,
+        "depth": depth,
+    }
+
+
+ROWS = [
+    make_row(1, None, 0),
+    make_row(2, 1, 1),
+    make_row(3, 1, 1),
+    make_row(4, 2, 2),
+]
+
+
+class MockResult:
+    def __init__(self, rows):
+        self._rows = rows
+
+    def mappings(self):
+        return self
+
+    def all(self):
+        return self._rows
+
+
+def mock_execute(rows):
+    return lambda *args, **kwargs: MockResult(rows)
+
+
+@pytest.fixture(params=[True, False], ids=["cache", "cte"])
+def tree_cache_enabled(request, monkeypatch):
+    monkeypatch.setattr(
+        "app.routers.category_routes.CATEGORY_TREE_CACHE_ENABLED", request.param
+    )
+    return request.param
+
+
+def test_unit_build_tree_nests_children():
+    tree = build_tree(ROWS)
+
+    assert tree["id"] == 1
+    assert [child["id"] for child in tree["children"]] == [2, 3]
+    assert [child["id"] for child in tree["children"][0]["children"]] == [4]
+    assert tree["children"][1]["children"] == []
+
+
+def test_unit_build_tree_empty():
+    assert build_tree([]) is None
+
+
+def test_unit_get_category_tree_succesfully(client, monkeypatch, tree_cache_enabled):
+    monkeypatch.setattr("sqlalchemy.orm.Session.execute", mock_execute(ROWS))
+
+    response = client.get("api/category/1/tree")
+
+    assert response.status_code == 200
+    assert response.json()["children"][0]["children"][0]["slug"] == "category-4"
+
+
+def test_unit_get_category_tree_not_found(client, monkeypatch, tree_cache_enabled):
+    monkeypatch.setattr("sqlalchemy.orm.Session.execute", mock_execute([]))
+
+    response = client.get("api/category/1/tree")
+
+    assert response.status_code == 404
+    assert response.json() == {"detail": "Category not found"}
+
+
+def test_unit_get_category_descendants_excludes_self(
+    client, monkeypatch, tree_cache_enabled
+):
+    monkeypatch.setattr("sqlalchemy.orm.Session.execute", mock_execute(ROWS))
+
+    response = client.get("api/category/1/descendants")
+
+    assert response.status_code == 200
+    assert [(c["id"], c["depth"]) for c in response.json()] == [(2, 1), (3, 1), (4, 2)]
+
+
+def test_unit_get_category_ancestors_root_first(
+    client, monkeypatch, tree_cache_enabled
+):
+    rows = [make_row(1, None, 2), make_row(2, 1, 1), make_row(4, 2, 0)]
+    monkeypatch.setattr("sqlalchemy.orm.Session.execute", mock_execute(rows))
+
+    response = client.get("api/category/4/ancestors")
+
+    assert response.status_code == 200
+    assert [c["id"] for c in response.json()] == [1, 2]
+
+
+def test_unit_get_category_tree_depth_limit(client):
+    response = client.get("api/category/1/tree?max_depth=1000")
+    assert response.status_code == 422
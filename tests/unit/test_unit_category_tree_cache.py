@@ -0,0 +1,99 @@
+from app.utils.catalog_version import CatalogState, VersionTracker
+from app.utils.category_tree import build_tree
+from app.utils.category_tree_cache import CategoryTreeCache
+
+
+class MockResult:
+    def __init__(self, rows):
+        self._rows = rows
+
+    def mappings(self):
+        return self
+
+    def all(self):
+        return self._rows
+
+
+class MockSession:
+    def __init__(self, rows):
+        self.rows = rows
+        self.loads = 0
+
+    def execute(self, statement):
+        self.loads += 1
+        return MockResult(self.rows)
+
+
+def make_node(id_, parent_id, slug=None):
+    return {
+        "id": id_,
+        "name": f"category-{id_}",
+        "slug": slug or f"category-{id_}",
+        "is_active": True,
+        "level": 100,
+        "parent_id": parent_id,
+    }
+
+
+def make_cache(monkeypatch, versions):
+    versions = iter(versions)
+    monkeypatch.setattr(
+        "app.utils.catalog_version.read_catalog_state",
+        lambda db, name: CatalogState(next(versions), None),
+    )
+    return CategoryTreeCache(VersionTracker("category", check_interval=0))
+
+
+def test_unit_tree_cache_serves_hierarchy_from_memory(monkeypatch):
+    db = MockSession([make_node(1, None), make_node(2, 1), make_node(3, 2)])
+    cache = make_cache(monkeypatch, [1, 1, 1])
+
+    cache.ensure_fresh(db)
+    assert [row["id"] for row in cache.descendants(1, 5)] == [1, 2, 3]
+    assert [row["id"] for row in cache.descendants(1, 1)] == [1, 2]
+    assert [row["id"] for row in cache.ancestors(3, 5)] == [1, 2, 3]
+    assert cache.get_by_slug("category-2")["id"] == 2
+    assert build_tree(cache.descendants(1, 5))["children"][0]["id"] == 2
+
+    cache.ensure_fresh(db)
+    assert db.loads == 1
+
+
+def test_unit_tree_cache_reloads_on_new_version(monkeypatch):
+    db = MockSession([make_node(1, None)])
+    cache = make_cache(monkeypatch, [1, 2])
+
+    cache.ensure_fresh(db)
+    db.rows = [make_node(1, None), make_node(2, 1)]
+    cache.ensure_fresh(db)
+
+    assert db.loads == 2
+    assert cache.version == 2
+    assert [row["id"] for row in cache.descendants(1, 5)] == [1, 2]
+
+
+def test_unit_tree_cache_patches_own_write(monkeypatch):
+    db = MockSession([make_node(1, None), make_node(2, 1)])
+    cache = make_cache(monkeypatch, [1, 2, 3])
+
+    cache.ensure_fresh(db)
+    cache.apply_write(db, upserted=make_node(2, 1, slug="renamed"))
+    assert cache.version == 2
+    assert cache.get_by_slug("category-2") is None
+    assert cache.get_by_slug("renamed")["id"] == 2
+
+    cache.apply_write(db, deleted_id=2)
+    assert cache.version == 3
+    assert cache.descendants(2, 5) == []
+    assert [row["id"] for row in cache.descendants(1, 5)] == [1]
+    assert db.loads == 1
+
+
+def test_unit_tree_cache_drops_when_other_writers_interleave(monkeypatch):
+    db = MockSession([make_node(1, None)])
+    cache = make_cache(monkeypatch, [1, 3])
+
+    cache.ensure_fresh(db)
+    cache.apply_write(db, upserted=make_node(2, 1))
+
+    assert cache.version is None
@@ -0,0 +1,40 @@
+import pytest
+from app.db_connection import get_db_session
+
+
+class MockSession:
+    def __init__(self):
+        self.calls = []
+
+    def rollback(self):
+        self.calls.append("rollback")
+
+    def close(self):
+        self.calls.append("close")
+
+
+def test_unit_get_db_session_closes_after_request(monkeypatch):
+    session = MockSession()
+    monkeypatch.setattr("app.db_connection.SessionLocal", lambda: session)
+
+    dependency = get_db_session()
+    assert next(dependency) is session
+    assert session.calls == []
+
+    with pytest.raises(StopIteration):
+        next(dependency)
+
+    assert session.calls == ["close"]
+
+
+def test_unit_get_db_session_rolls_back_on_error(monkeypatch):
+    session = MockSession()
+    monkeypatch.setattr("app.db_connection.SessionLocal", lambda: session)
+
+    dependency = get_db_session()
+    next(dependency)
+
+    with pytest.raises(ValueError):
+        dependency.throw(ValueError("route failed"))
+
+    assert session.calls == ["rollback", "close"]
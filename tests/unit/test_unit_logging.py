@@ -0,0 +1,127 @@
+import json
+import logging
+import sys
+from logging.handlers import QueueHandler
+import pytest
+from app.utils.logging_utils import (
+    JsonFormatter,
+    SamplingFilter,
+    parse_sampling,
+    start_queued_logging,
+    stop_queued_logging,
+)
+
+
+class ListHandler(logging.Handler):
+    def __init__(self):
+        super().__init__()
+        self.records = []
+
+    def emit(self, record):
+        self.records.append(record)
+
+
+def make_record(name="app", level=logging.ERROR, msg="boom %s", args=("now",)):
+    return logging.LogRecord(name, level, __file__, 1, msg, args, None)
+
+
+@pytest.fixture()
+def isolated_logger():
+    logger = logging.getLogger("test_unit_logging")
+    logger.propagate = False
+    handler = ListHandler()
+    logger.addHandler(handler)
+    yield logger, handler
+    logger.handlers.clear()
+
+
+def test_unit_parse_sampling():
+    assert parse_sampling("") == {}
+    assert parse_sampling("app=1, sqlalchemy.pool=10,noisy=0") == {
+        "app": 1,
+        "sqlalchemy.pool": 10,
+        "noisy": 1,
+    }
+
+
+def test_unit_json_formatter_includes_extra_fields():
+    record = make_record()
+    record.db_statements = 3
+
+    entry = json.loads(JsonFormatter().format(record))
+
+    assert entry["level"] == "ERROR"
+    assert entry["logger"] == "app"
+    assert entry["message"] == "boom now"
+    assert entry["db_statements"] == 3
+    assert entry["timestamp"].endswith("+00:00")
+    assert "args" not in entry
+
+
+def test_unit_json_formatter_includes_exception():
+    try:
+        raise ValueError("bad value")
+    except ValueError:
+        record = logging.LogRecord(
+            "app", logging.ERROR, __file__, 1, "failed", None, sys.exc_info()
+        )
+
+    entry = json.loads(JsonFormatter().format(record))
+    assert "ValueError: bad value" in entry["exc_info"]
+
+
+def test_unit_sampling_filter_keeps_one_in_n():
+    sampling_filter = SamplingFilter({"app": 3})
+
+    kept = [sampling_filter.filter(make_record()) for _ in range(9)]
+    assert kept == [True, False, False] * 3
+
+    # children share the parent's budget; unlisted loggers are never sampled
+    assert sampling_filter.filter(make_record(name="app.child")) is True
+    assert all(sampling_filter.filter(make_record(name="other")) for _ in range(5))
+
+
+def test_unit_sampling_filter_never_drops_critical_and_is_stable():
+    sampling_filter = SamplingFilter({"app": 100})
+    sampling_filter.filter(make_record())
+
+    assert sampling_filter.filter(make_record(level=logging.CRITICAL)) is True
+
+    record = make_record()
+    assert sampling_filter.filter(record) is False
+    # a second handler on the propagation path gets the same answer
+    assert SamplingFilter({"app": 1}).filter(record) is False
+
+
+def test_unit_start_queued_logging_moves_handlers(isolated_logger):
+    logger, handler = isolated_logger
+
+    (listener,) = start_queued_logging(("test_unit_logging",))
+    assert len(logger.handlers) == 1
+    assert isinstance(logger.handlers[0], QueueHandler)
+
+    try:
+        raise RuntimeError("queued")
+    except RuntimeError:
+        logger.exception("failed %s", "once", extra={"path": "/api"})
+    stop_queued_logging([listener])
+
+    (record,) = handler.records
+    assert record.getMessage() == "failed once"
+    assert record.path == "/api"
+    assert record.exc_info is None
+    assert "RuntimeError: queued" in record.exc_text
+
+
+def test_unit_start_queued_logging_samples(isolated_logger):
+    logger, handler = isolated_logger
+
+    (listener,) = start_queued_logging(("test_unit_logging",), {"test_unit_logging": 2})
+    for i in range(4):
+        logger.error("noisy %s", i)
+    stop_queued_logging([listener])
+
+    assert [record.getMessage() for record in handler.records] == [
+        "noisy 0",
+        "noisy 2",
+    ]
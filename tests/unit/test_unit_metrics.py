@@ -0,0 +1,109 @@
+import subprocess
+import pytest
+from app.utils import metrics
+from app.utils.metrics import RequestMetrics, aggregate, collect, render_metrics
+from tests.factories.models_factory import get_random_category_dict
+
+
+def mock_output(return_value=None):
+    return lambda *args, **kwargs: return_value
+
+
+@pytest.fixture()
+def request_metrics(monkeypatch):
+    fresh = RequestMetrics()
+    monkeypatch.setattr("app.utils.metrics.request_metrics", fresh)
+    return fresh
+
+
+def exited_pid():
+    process = subprocess.Popen(["true"])
+    process.wait()
+    return process.pid
+
+
+def test_unit_metrics_records_route_template(client, monkeypatch, request_metrics):
+    category = get_random_category_dict()
+    monkeypatch.setattr("sqlalchemy.orm.Query.first", mock_output(category))
+
+    client.get(f"api/category/slug/{category['slug']}")
+    client.get("api/category/slug/missing-too")
+
+    route = "/api/category/slug/{category_slug}"
+    assert request_metrics.latency[("GET", route)].count == 2
+    assert request_metrics.responses[("GET", route, "200")] == 2
+    assert request_metrics.in_flight == 0
+
+
+def test_unit_metrics_unmatched_route(client, request_metrics):
+    client.get("does/not/exist")
+
+    assert request_metrics.responses[("GET", "<unmatched>", "404")] == 1
+
+
+def test_unit_metrics_endpoint_exposition(client, monkeypatch, request_metrics):
+    category = get_random_category_dict()
+    monkeypatch.setattr("sqlalchemy.orm.Query.first", mock_output(category))
+    client.get(f"api/category/slug/{category['slug']}")
+
+    response = client.get("metrics")
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain; version=0.0.4")
+
+    body = response.text
+    labels = 'method="GET",route="/api/category/slug/{category_slug}"'
+    assert "# TYPE http_request_duration_seconds histogram" in body
+    assert f"http_request_duration_seconds_count{{{labels}}} 1" in body
+    assert f'http_request_duration_seconds_bucket{{{labels},le="+Inf"}} 1' in body
+    assert f'http_responses_total{{{labels},status="200"}} 1' in body
+    # the /metrics request itself is in flight while rendering
+    assert "http_requests_in_flight 1" in body
+    assert 'db_pool_size{engine="sync"}' in body
+    assert 'cache_misses_total{cache="category"}' in body
+    assert 'cache_hit_ratio{cache="category"}' in body
+
+
+def test_unit_metrics_aggregate_sums_workers(request_metrics):
+    request_metrics.observe("GET", "/api/category/", 200, 0.002)
+    request_metrics.in_flight = 2
+    current = collect()
+
+    other = collect()
+    other["pid"] = exited_pid()
+    other["requests"]["responses"] = [["GET", "/api/category/", "200", 3]]
+    other["caches"]["category"].update(hits=3, negative_hits=0, misses=1)
+
+    merged = aggregate([current, other])
+
+    assert merged["responses"][("GET", "/api/category/", "200")] == 4
+    assert merged["latency"][("GET", "/api/category/")]["count"] == 2
+    # gauges from exited workers are dropped, counters are kept
+    assert merged["in_flight"] == 2
+    assert merged["pool_gauges"][("size", "sync")] == current["pools"]["sync"]["size"]
+    assert (
+        merged["caches"]["category"]["hits"]
+        == 3 + current["caches"]["category"]["hits"]
+    )
+
+    body = render_metrics(merged)
+    assert (
+        'http_responses_total{method="GET",route="/api/category/",status="200"} 4'
+        in body
+    )
+
+
+def test_unit_metrics_multiprocess_mode(client, monkeypatch, tmp_path, request_metrics):
+    monkeypatch.setattr("app.utils.metrics.METRICS_MULTIPROCESS_DIR", str(tmp_path))
+
+    other = collect()
+    other["pid"] = exited_pid()
+    other["requests"]["responses"] = [["GET", "/api/category/", "200", 5]]
+    (tmp_path / f"{other['pid']}.json").write_bytes(metrics.orjson.dumps(other))
+
+    response = client.get("metrics")
+
+    assert (tmp_path / f"{collect()['pid']}.json").exists()
+    assert (
+        'http_responses_total{method="GET",route="/api/category/",status="200"} 5'
+        in response.text
+    )
@@ -0,0 +1,81 @@
+import logging
+import pytest
+from alembic.migration import MigrationContext
+from alembic.operations import Operations
+from sqlalchemy import create_engine, text
+from migrations.online import batched_backfill, create_index_concurrently
+
+
+@pytest.fixture()
+def migration_connection():
+    engine = create_engine("sqlite://")
+    with engine.connect() as connection:
+        connection.execute(
+            text("CREATE TABLE item (id INTEGER PRIMARY KEY, name TEXT, slug TEXT)")
+        )
+        connection.execute(
+            text("INSERT INTO item (id, name) VALUES (:id, :name)"),
+            [{"id": i, "name": f"Item {i}"} for i in range(1, 26)],
+        )
+        connection.commit()
+        with Operations.context(MigrationContext.configure(connection)):
+            yield connection
+    engine.dispose()
+
+
+def test_unit_batched_backfill_updates_every_row(migration_connection, caplog):
+    with caplog.at_level(logging.INFO, logger="alembic.online"):
+        updated = batched_backfill(
+            "item",
+            "slug = lower(replace(name, ' ', '-'))",
+            where="slug IS NULL",
+            batch_size=10,
+            sleep=0,
+        )
+
+    assert updated == 25
+    assert migration_connection.execute(
+        text("SELECT slug FROM item WHERE id = 7")
+    ).scalar() == ("item-7")
+    assert "Backfilling 25 rows of item in batches of 10" in caplog.text
+    assert "Backfilled 25 rows of item" in caplog.text
+
+
+def test_unit_batched_backfill_commits_each_batch(migration_connection, monkeypatch):
+    batches = []
+    monkeypatch.setattr(
+        "migrations.online.time.sleep", lambda seconds: batches.append(seconds)
+    )
+
+    batched_backfill(
+        "item",
+        "slug = 'done'",
+        where="slug IS NULL AND id <= :last_id",
+        batch_size=4,
+        sleep=0.5,
+        params={"last_id": 10},
+    )
+
+    # 10 rows in batches of 4, throttled after each one
+    assert batches == [0.5, 0.5, 0.5]
+    migration_connection.rollback()
+    assert migration_connection.execute(
+        text("SELECT count(*) FROM item WHERE slug = 'done'")
+    ).scalar() == (10)
+
+
+def test_unit_batched_backfill_resumes(migration_connection):
+    batched_backfill("item", "slug = 'done'", where="slug IS NULL AND id <= 5")
+
+    assert batched_backfill("item", "slug = 'done'", where="slug IS NULL") == 20
+
+
+def test_unit_create_index_concurrently_runs_outside_transaction(
+    migration_connection,
+):
+    create_index_concurrently("ix_item_slug", "item", ["slug"])
+
+    migration_connection.rollback()
+    assert migration_connection.execute(
+        text("SELECT name FROM sqlite_master WHERE type = 'index'")
+    ).scalars().all() == ["ix_item_slug"]
@@ -0,0 +1,69 @@
+from tests.factories.models_factory import get_random_product_dict
+from app.utils.pagination import decode_cursor, encode_cursor
+from app.routers.product_routes import PRODUCT_ORDERING
+
+
+def mock_output(return_value=None):
+    return lambda *args, **kwargs: return_value
+
+
+def test_unit_get_product_by_slug_succesfully(client, monkeypatch):
+    product = get_random_product_dict(lines=2, images=3)
+    monkeypatch.setattr("sqlalchemy.orm.Query.first", mock_output(product))
+
+    response = client.get(f"api/product/{product['slug']}")
+    assert response.status_code == 200
+    assert response.json() == product
+
+
+def test_unit_get_product_by_slug_not_found(client, monkeypatch):
+    monkeypatch.setattr("sqlalchemy.orm.Query.first", mock_output())
+
+    response = client.get("api/product/missing")
+    assert response.status_code == 404
+    assert response.json() == {"detail": "Product does not exist"}
+
+
+def test_unit_get_product_by_slug_internal_error(client, monkeypatch):
+    def mock_query_exception(*args, **kwargs):
+        raise Exception("Internal server error")
+
+    monkeypatch.setattr("sqlalchemy.orm.Query.first", mock_query_exception)
+
+    response = client.get("api/product/any")
+    assert response.status_code == 500
+    assert response.json() == {"detail": "Internal server error"}
+
+
+def test_unit_get_products_by_category_succesfully(client, monkeypatch):
+    products = [get_random_product_dict(i) for i in range(1, 3)]
+    monkeypatch.setattr("sqlalchemy.orm.Query.all", mock_output(products))
+
+    response = client.get("api/product/category/1")
+    assert response.status_code == 200
+    assert response.json() == products
+    assert "X-Next-Cursor" not in response.headers
+
+
+def test_unit_get_products_by_category_next_cursor(client, monkeypatch):
+    class MockProduct:
+        def __init__(self, product):
+            self.__dict__.update(product)
+
+    products = [MockProduct(get_random_product_dict(i)) for i in range(1, 4)]
+    monkeypatch.setattr("sqlalchemy.orm.Query.all", mock_output(products))
+
+    response = client.get("api/product/category/1?limit=2")
+    assert response.status_code == 200
+    assert len(response.json()) == 2
+    assert decode_cursor(response.headers["X-Next-Cursor"], "id", PRODUCT_ORDERING) == [
+        2
+    ]
+
+
+def test_unit_get_products_by_category_invalid_cursor(client):
+    response = client.get(
+        f"api/product/category/1?cursor={encode_cursor('level_name', [1, 'a'])}"
+    )
+    assert response.status_code == 400
+    assert response.json() == {"detail": "Invalid cursor"}
@@ -0,0 +1,101 @@
+import logging
+import pytest
+from sqlalchemy import create_engine, text
+from app.utils import query_stats
+from app.utils.query_stats import QueryStats, current_query_stats, redact_parameters
+from tests.factories.models_factory import get_random_category_dict
+
+
+def mock_output(return_value=None):
+    return lambda *args, **kwargs: return_value
+
+
+@pytest.fixture()
+def engine():
+    engine = create_engine("sqlite://")
+    query_stats.attach(engine)
+    yield engine
+    engine.dispose()
+
+
+@pytest.mark.parametrize(
+    "parameters, redacted",
+    [
+        ({"slug": "secret", "id": 1}, {"slug": "<redacted>", "id": "<redacted>"}),
+        (("secret", 1), ["<redacted>", "<redacted>"]),
+        ([{"slug": "a"}, {"slug": "b"}], "<2 parameter sets>"),
+        (None, None),
+    ],
+)
+def test_unit_redact_parameters(parameters, redacted):
+    assert redact_parameters(parameters) == redacted
+
+
+def test_unit_query_stats_counts_statements(engine):
+    stats = QueryStats()
+    token = current_query_stats.set(stats)
+    try:
+        with engine.connect() as connection:
+            connection.execute(text("SELECT 1"))
+            connection.execute(text("SELECT 2"))
+    finally:
+        current_query_stats.reset(token)
+
+    assert stats.count == 2
+    assert stats.total_seconds >= stats.slowest_seconds > 0
+    assert stats.slowest_statement in ("SELECT 1", "SELECT 2")
+
+
+def test_unit_query_stats_failed_statement_leaves_no_state(engine):
+    stats = QueryStats()
+    token = current_query_stats.set(stats)
+    try:
+        with engine.connect() as connection:
+            with pytest.raises(Exception, match="no such table"):
+                connection.execute(text("SELECT * FROM missing"))
+            connection.execute(text("SELECT 1"))
+            info = dict(connection.info)
+    finally:
+        current_query_stats.reset(token)
+
+    assert info == {}
+    assert (stats.count, stats.slowest_statement) == (1, "SELECT 1")
+
+
+def test_unit_query_stats_ignores_statements_outside_requests(engine):
+    with engine.connect() as connection:
+        connection.execute(text("SELECT 1"))
+
+    assert current_query_stats.get() is None
+
+
+def test_unit_slow_query_logged_with_redacted_parameters(engine, monkeypatch, caplog):
+    monkeypatch.setattr("app.utils.query_stats.SLOW_QUERY_THRESHOLD_MS", 0)
+
+    with caplog.at_level(logging.WARNING, logger="app"):
+        with engine.connect() as connection:
+            connection.execute(text("SELECT :secret"), {"secret": "hunter2"})
+
+    record = next(r for r in caplog.records if r.message.startswith("Slow query"))
+    assert record.db_statement == "SELECT ?"
+    assert record.db_parameters == ["<redacted>"]
+    assert "hunter2" not in record.getMessage()
+
+
+def test_unit_query_stats_server_timing_header(client, monkeypatch, caplog):
+    category = [get_random_category_dict()]
+    monkeypatch.setattr("sqlalchemy.orm.Query.all", mock_output(category))
+
+    with caplog.at_level(logging.INFO, logger="app"):
+        response = client.get("api/category/")
+
+    assert response.status_code == 200
+    server_timing = response.headers["Server-Timing"]
+    assert server_timing.startswith("db;dur=")
+    assert "db-slowest;dur=" in server_timing
+    assert "app;dur=" in server_timing
+
+    record = next(r for r in caplog.records if getattr(r, "path", None))
+    assert record.path == "/api/category/"
+    assert record.status_code == 200
+    assert record.db_statements == 0
@@ -0,0 +1,162 @@
+import time
+import pytest
+from fastapi import FastAPI, HTTPException
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from app.db_connection import SessionLocal, get_read_db_session_factory
+from app.utils.replicas import (
+    READ_YOUR_WRITES_COOKIE,
+    ReadYourWritesMiddleware,
+    ReplicaRouter,
+    parse_replica_urls,
+    wants_primary,
+)
+
+
+class MockEngine:
+    """Answers the replica status query with ``(in_recovery, lag)``."""
+
+    def __init__(self, in_recovery=True, lag=0):
+        self.status = (in_recovery, lag)
+        self.checks = 0
+
+    def connect(self):
+        return self
+
+    def __enter__(self):
+        self.checks += 1
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+    def execute(self, statement):
+        return self
+
+    def one(self):
+        return self.status
+
+
+class MockRequest:
+    def __init__(self, cookies=None):
+        self.cookies = cookies or {}
+
+
+def test_unit_parse_replica_urls():
+    assert parse_replica_urls(" postgresql://a/db, postgresql://b/db,") == {
+        "replica1": "postgresql://a/db",
+        "replica2": "postgresql://b/db",
+    }
+    assert parse_replica_urls("") == {}
+
+
+def test_unit_replica_router_without_replicas_reads_primary():
+    primary = object()
+    router = ReplicaRouter(primary, {}, max_lag=5, check_interval=5)
+
+    assert router.read_target() == (primary, None)
+
+
+def test_unit_replica_router_round_robin_over_healthy_replicas():
+    first, second = MockEngine(), MockEngine()
+    router = ReplicaRouter(
+        object(), {"replica1": first, "replica2": second}, 5, check_interval=60
+    )
+
+    targets = [router.read_target()[1] for _ in range(4)]
+
+    assert targets == ["replica1", "replica2", "replica1", "replica2"]
+    # checked once, then trusted until the interval passes
+    assert (first.checks, second.checks) == (1, 1)
+
+
+def test_unit_replica_router_skips_lagging_replica():
+    primary = object()
+    lagging = MockEngine(lag=12.5)
+    router = ReplicaRouter(
+        primary,
+        {"replica1": lagging, "replica2": MockEngine(lag=0.2)},
+        max_lag=5,
+        check_interval=60,
+    )
+
+    assert {router.read_target()[1] for _ in range(3)} == {"replica2"}
+    assert router.status()["replica1"] == {
+        "healthy": False,
+        "lag_seconds": 12.5,
+        "error": "lag 12.5s over 5s",
+    }
+
+
+def test_unit_replica_router_falls_back_to_primary(caplog):
+    primary = object()
+    # sqlite has no pg_is_in_recovery(), like an unreachable replica the
+    # check fails
+    router = ReplicaRouter(
+        primary, {"replica1": create_engine("sqlite://")}, 5, check_interval=60
+    )
+
+    assert router.read_target() == (primary, None)
+    assert router.status()["replica1"]["healthy"] is False
+    assert "Replica replica1 out of rotation" in caplog.text
+
+
+def test_unit_replica_router_rechecks_after_interval():
+    replica = MockEngine(lag=30)
+    router = ReplicaRouter(object(), {"replica1": replica}, 5, check_interval=0)
+
+    assert router.read_target()[1] is None
+    replica.status = (True, 1)
+    assert router.read_target()[1] == "replica1"
+
+
+@pytest.mark.parametrize(
+    "cookies, expected",
+    [
+        ({}, False),
+        ({READ_YOUR_WRITES_COOKIE: "1010"}, True),
+        ({READ_YOUR_WRITES_COOKIE: "990"}, False),
+        ({READ_YOUR_WRITES_COOKIE: "garbage"}, False),
+    ],
+)
+def test_unit_wants_primary(cookies, expected):
+    assert wants_primary(cookies, now=1000) is expected
+
+
+def test_unit_read_session_factory_routes_to_replica(monkeypatch):
+    replica = MockEngine()
+    monkeypatch.setattr(
+        "app.db_connection.replica_router",
+        ReplicaRouter(object(), {"replica1": replica}, 5, 60),
+    )
+
+    db = get_read_db_session_factory(MockRequest())()
+    assert db.get_bind() is replica
+    assert db.info["replica"] == "replica1"
+
+    cookies = {READ_YOUR_WRITES_COOKIE: str(time.time() + 5)}
+    assert get_read_db_session_factory(MockRequest(cookies)) is SessionLocal
+
+
+def test_unit_read_your_writes_middleware_sets_cookie():
+    app = FastAPI()
+    app.add_middleware(ReadYourWritesMiddleware, window=5)
+
+    @app.get("/item")
+    def read_item():
+        return {}
+
+    @app.post("/item")
+    def write_item(fail: bool = False):
+        if fail:
+            raise HTTPException(status_code=409)
+        return {}
+
+    with TestClient(app) as client:
+        assert READ_YOUR_WRITES_COOKIE not in client.get("/item").cookies
+        assert READ_YOUR_WRITES_COOKIE not in client.post("/item?fail=1").cookies
+
+        response = client.post("/item")
+        assert "max-age=6" in response.headers["set-cookie"].lower()
+        assert wants_primary(response.cookies)
+        assert wants_primary(response.cookies, now=time.time() + 6) is False
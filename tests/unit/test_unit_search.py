@@ -0,0 +1,92 @@
+from collections import namedtuple
+from sqlalchemy import select
+from sqlalchemy.dialects import postgresql
+from app.utils.pagination import apply_keyset, decode_cursor, encode_cursor
+from app.utils.search import search_ordering, search_results
+
+SearchRow = namedtuple("SearchRow", "kind id name slug score")
+
+
+def mock_execute(rows):
+    class MockResult:
+        def all(self):
+            return rows
+
+    statements = []
+
+    def execute(self, statement, *args, **kwargs):
+        statements.append(statement)
+        return MockResult()
+
+    execute.statements = statements
+    return execute
+
+
+def test_unit_search_query_uses_text_and_trigram_match():
+    results = search_results("lamp", is_active=True)
+    statement = apply_keyset(select(results), search_ordering(results), [-0.5, "a", 1])
+    sql = str(statement.compile(dialect=postgresql.dialect()))
+
+    assert sql.count("search_vector @@ websearch_to_tsquery") == 2
+    assert sql.count("<%% category.name") == 1
+    assert sql.count("<%% product.name") == 1
+    assert "ORDER BY -search_results.score, search_results.kind" in sql
+
+
+def test_unit_search_succesfully(client, monkeypatch):
+    rows = [
+        SearchRow("product", 3, "Desk lamp", "desk-lamp", 0.8),
+        SearchRow("category", 1, "Lamps", "lamps", 0.5),
+    ]
+    execute = mock_execute(rows)
+    monkeypatch.setattr("sqlalchemy.orm.Session.execute", execute)
+
+    response = client.get("api/search", params={"q": " lamp "})
+
+    assert response.status_code == 200
+    assert response.json() == [row._asdict() for row in rows]
+    assert "X-Next-Cursor" not in response.headers
+    # the similarity threshold is set before searching
+    assert len(execute.statements) == 2
+
+
+def test_unit_search_next_cursor(client, monkeypatch):
+    rows = [
+        SearchRow("product", id_, f"lamp {id_}", f"lamp-{id_}", 1 / id_)
+        for id_ in range(1, 4)
+    ]
+    monkeypatch.setattr("sqlalchemy.orm.Session.execute", mock_execute(rows))
+
+    response = client.get("api/search", params={"q": "lamp", "limit": 2})
+
+    assert len(response.json()) == 2
+    columns = search_ordering(search_results("lamp"))
+    assert decode_cursor(response.headers["X-Next-Cursor"], "rank", columns) == [
+        -0.5,
+        "product",
+        2,
+    ]
+
+
+def test_unit_search_invalid_cursor(client):
+    cursor = encode_cursor("id", [1])
+
+    response = client.get("api/search", params={"q": "lamp", "cursor": cursor})
+    assert response.status_code == 400
+    assert response.json() == {"detail": "Invalid cursor"}
+
+
+def test_unit_search_blank_query(client):
+    assert client.get("api/search", params={"q": "   "}).status_code == 422
+    assert client.get("api/search").status_code == 422
+
+
+def test_unit_search_internal_error(client, monkeypatch):
+    def mock_execute_exception(*args, **kwargs):
+        raise Exception("Internal server error")
+
+    monkeypatch.setattr("sqlalchemy.orm.Session.execute", mock_execute_exception)
+
+    response = client.get("api/search", params={"q": "lamp"})
+    assert response.status_code == 500
+    assert response.json() == {"detail": "Internal server error"}
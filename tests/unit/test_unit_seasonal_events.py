@@ -0,0 +1,139 @@
+from collections import namedtuple
+from datetime import datetime, timedelta
+from sqlalchemy.dialects import postgresql
+from tests.factories.models_factory import get_random_product_dict
+from app.utils.seasonal_events import ActiveEventCache, active_events_query
+
+EventState = namedtuple("EventState", "now event_ids next_boundary")
+
+NOW = datetime(2024, 12, 1, 9, 0)
+
+
+class MockTracker:
+    def __init__(self):
+        self.version = 0
+        self.expired = False
+
+    def current(self, db):
+        return self.version
+
+    def expire(self):
+        self.expired = True
+
+
+class MockSession:
+    """Answers the active events query with the queued states, in order."""
+
+    def __init__(self, *states):
+        self.states = list(states)
+        self.loads = 0
+
+    def execute(self, statement):
+        self.loads += 1
+        return self
+
+    def one(self):
+        return self.states.pop(0)
+
+
+class MockClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_unit_active_events_query_uses_range_containment():
+    sql = str(active_events_query().compile(dialect=postgresql.dialect()))
+
+    assert "seasonal_event.active_during @> LOCALTIMESTAMP" in sql
+    assert "seasonal_event.start_date > LOCALTIMESTAMP" in sql
+    assert "seasonal_event.end_date > LOCALTIMESTAMP" in sql
+
+
+def test_unit_active_event_cache_expires_at_next_boundary(monkeypatch):
+    clock = MockClock()
+    monkeypatch.setattr("app.utils.seasonal_events.time.monotonic", clock)
+    cache = ActiveEventCache(MockTracker())
+    db = MockSession(
+        EventState(NOW, [3, 1], NOW + timedelta(minutes=90)),
+        EventState(NOW + timedelta(minutes=90), [1], None),
+    )
+
+    assert cache.get(db) == (1, 3)
+    clock.now += 90 * 60 - 0.001
+    assert cache.get(db) == (1, 3)
+    assert db.loads == 1
+
+    # the boundary passed, event 3 ended
+    clock.now += 0.001
+    assert cache.get(db) == (1,)
+    assert db.loads == 2
+
+    # nothing ahead: kept until an event is written
+    clock.now += 10**9
+    assert cache.get(db) == (1,)
+    assert db.loads == 2
+
+
+def test_unit_active_event_cache_reloads_after_event_write(monkeypatch):
+    tracker = MockTracker()
+    cache = ActiveEventCache(tracker)
+    db = MockSession(
+        EventState(NOW, None, NOW + timedelta(days=1)),
+        EventState(NOW, [7], NOW + timedelta(days=1)),
+    )
+
+    assert cache.get(db) == ()
+    assert cache.get(db) == ()
+    tracker.version += 1
+    assert cache.get(db) == (7,)
+    assert db.loads == 2
+
+    cache.invalidate()
+    assert cache.version is None
+    assert tracker.expired
+
+
+def mock_output(return_value=None):
+    return lambda *args, **kwargs: return_value
+
+
+def test_unit_get_products_in_active_events_succesfully(client, monkeypatch):
+    products = [get_random_product_dict(i) for i in range(1, 3)]
+    monkeypatch.setattr(
+        "app.routers.product_routes.active_event_cache.get", mock_output((1, 2))
+    )
+    monkeypatch.setattr("sqlalchemy.orm.Query.all", mock_output(products))
+
+    response = client.get("api/product/seasonal/active")
+    assert response.status_code == 200
+    assert response.json() == products
+
+
+def test_unit_get_products_in_active_events_none_active(client, monkeypatch):
+    def mock_query_exception(*args, **kwargs):
+        raise AssertionError("products queried without active events")
+
+    monkeypatch.setattr(
+        "app.routers.product_routes.active_event_cache.get", mock_output(())
+    )
+    monkeypatch.setattr("sqlalchemy.orm.Query.all", mock_query_exception)
+
+    response = client.get("api/product/seasonal/active")
+    assert response.status_code == 200
+    assert response.json() == []
+
+
+def test_unit_get_products_in_active_events_internal_error(client, monkeypatch):
+    def mock_get_exception(*args, **kwargs):
+        raise Exception("Internal server error")
+
+    monkeypatch.setattr(
+        "app.routers.product_routes.active_event_cache.get", mock_get_exception
+    )
+
+    response = client.get("api/product/seasonal/active")
+    assert response.status_code == 500
+    assert response.json() == {"detail": "Internal server error"}
@@ -0,0 +1,235 @@
+import uuid
+from collections import namedtuple
+from datetime import datetime, timezone
+from sqlalchemy.dialects import postgresql
+from app.utils.stock import (
+    commit_statement,
+    expire_statement,
+    release_statement,
+    reserve_statement,
+)
+
+TakenRow = namedtuple("TakenRow", "id expires_at sku quantity")
+ReservationRow = namedtuple("ReservationRow", "id status expires_at")
+LineRow = namedtuple("LineRow", "sku quantity")
+
+RESERVATION_ID = uuid.UUID("8d1e3a3c-4b0c-4d43-9b9e-5f6a7c8d9e0f")
+EXPIRES_AT = datetime(2024, 1, 1, 12, 10, tzinfo=timezone.utc)
+LAMP = uuid.UUID("11111111-1111-4111-8111-111111111111")
+CHAIR = uuid.UUID("22222222-2222-4222-8222-222222222222")
+
+
+def compile_sql(statement):
+    return str(statement.compile(dialect=postgresql.dialect()))
+
+
+def mock_execute(*results):
+    """Answer each ``Session.execute`` with the next list of rows."""
+
+    class MockResult:
+        def __init__(self, rows):
+            self.rows = rows
+
+        def all(self):
+            return self.rows
+
+        def first(self):
+            return self.rows[0] if self.rows else None
+
+    statements = []
+    pending = list(results)
+
+    def execute(self, statement, *args, **kwargs):
+        statements.append(statement)
+        return MockResult(pending.pop(0))
+
+    execute.statements = statements
+    return execute
+
+
+def mock_calls(calls, name):
+    def record(self, *args, **kwargs):
+        calls.append(name)
+
+    return record
+
+
+def patch_transaction(monkeypatch):
+    calls = []
+    monkeypatch.setattr("sqlalchemy.orm.Session.commit", mock_calls(calls, "commit"))
+    monkeypatch.setattr(
+        "sqlalchemy.orm.Session.rollback", mock_calls(calls, "rollback")
+    )
+    return calls
+
+
+def test_unit_reserve_statement_locks_lines_in_id_order():
+    sql = compile_sql(reserve_statement({LAMP: 1, CHAIR: 2}, 600))
+
+    assert "ORDER BY product_line.id FOR UPDATE OF product_line" in sql
+    assert "product_line.stock_qty >= locked.quantity" in sql
+    assert "INSERT INTO stock_reservation_line" in sql
+
+
+def test_unit_release_and_expire_statements_restock_in_id_order():
+    release = compile_sql(release_statement(RESERVATION_ID))
+    expire = compile_sql(expire_statement(100))
+
+    for sql in (release, expire):
+        assert "ORDER BY product_line.id FOR UPDATE OF product_line" in sql
+        assert "SET stock_qty=(product_line.stock_qty + locked.quantity)" in sql
+    assert "FOR UPDATE SKIP LOCKED" in expire
+    assert "SKIP LOCKED" not in release
+
+
+def test_unit_commit_statement_only_commits_unexpired_holds():
+    sql = compile_sql(commit_statement(RESERVATION_ID))
+    assert "stock_reservation.expires_at > now()" in sql
+
+
+def test_unit_reserve_stock_succesfully(client, monkeypatch):
+    rows = [
+        TakenRow(RESERVATION_ID, EXPIRES_AT, LAMP, 3),
+        TakenRow(RESERVATION_ID, EXPIRES_AT, CHAIR, 1),
+    ]
+    execute = mock_execute(rows)
+    monkeypatch.setattr("sqlalchemy.orm.Session.execute", execute)
+    calls = patch_transaction(monkeypatch)
+
+    response = client.post(
+        "api/stock/reservations",
+        json={
+            "lines": [
+                {"sku": str(LAMP), "quantity": 1},
+                {"sku": str(CHAIR), "quantity": 1},
+                {"sku": str(LAMP), "quantity": 2},
+            ]
+        },
+    )
+
+    assert response.status_code == 201
+    assert response.json() == {
+        "id": str(RESERVATION_ID),
+        "status": "held",
+        "expires_at": "2024-01-01T12:10:00Z",
+        "lines": [
+            {"sku": str(LAMP), "quantity": 3},
+            {"sku": str(CHAIR), "quantity": 1},
+        ],
+    }
+    assert calls == ["commit"]
+    # duplicate SKUs are merged into one line
+    assert len(execute.statements) == 1
+    assert compile_sql(execute.statements[0]).count("(%(param_") == 2
+
+
+def test_unit_reserve_stock_insufficient(client, monkeypatch):
+    # only the lamp line could be taken, so no reservation was inserted
+    monkeypatch.setattr(
+        "sqlalchemy.orm.Session.execute",
+        mock_execute([TakenRow(None, None, LAMP, 1)]),
+    )
+    calls = patch_transaction(monkeypatch)
+
+    response = client.post(
+        "api/stock/reservations",
+        json={
+            "lines": [
+                {"sku": str(LAMP), "quantity": 1},
+                {"sku": str(CHAIR), "quantity": 5},
+            ]
+        },
+    )
+
+    assert response.status_code == 409
+    assert response.json() == {
+        "detail": {"message": "Insufficient stock", "skus": [str(CHAIR)]}
+    }
+    assert "rollback" in calls and "commit" not in calls
+
+
+def test_unit_reserve_stock_unexpected_error(client, monkeypatch):
+    def mock_execute_error(self, *args, **kwargs):
+        raise Exception("Mocked exception")
+
+    monkeypatch.setattr("sqlalchemy.orm.Session.execute", mock_execute_error)
+    calls = patch_transaction(monkeypatch)
+
+    response = client.post(
+        "api/stock/reservations", json={"lines": [{"sku": str(LAMP), "quantity": 1}]}
+    )
+
+    assert response.status_code == 500
+    assert response.json() == {"detail": "Internal server error"}
+    assert "rollback" in calls and "commit" not in calls
+
+
+def test_unit_reserve_stock_validation(client):
+    for body in (
+        {"lines": []},
+        {"lines": [{"sku": str(LAMP), "quantity": 0}]},
+        {"lines": [{"sku": str(LAMP), "quantity": 1}], "ttl_seconds": 0},
+    ):
+        assert client.post("api/stock/reservations", json=body).status_code == 422
+
+
+def test_unit_get_reservation_not_found(client, monkeypatch):
+    monkeypatch.setattr("sqlalchemy.orm.Session.execute", mock_execute([]))
+
+    response = client.get(f"api/stock/reservations/{RESERVATION_ID}")
+
+    assert response.status_code == 404
+    assert response.json() == {"detail": "Reservation does not exist"}
+
+
+def test_unit_commit_reservation_succesfully(client, monkeypatch):
+    monkeypatch.setattr(
+        "sqlalchemy.orm.Session.execute",
+        mock_execute(
+            [(RESERVATION_ID,)],
+            [ReservationRow(RESERVATION_ID, "committed", EXPIRES_AT)],
+            [LineRow(LAMP, 2)],
+        ),
+    )
+    calls = patch_transaction(monkeypatch)
+
+    response = client.post(f"api/stock/reservations/{RESERVATION_ID}/commit")
+
+    assert response.status_code == 200
+    assert response.json()["status"] == "committed"
+    assert calls == ["commit"]
+
+
+def test_unit_commit_reservation_expired(client, monkeypatch):
+    # past its expiry but not swept yet
+    monkeypatch.setattr(
+        "sqlalchemy.orm.Session.execute",
+        mock_execute(
+            [],
+            [ReservationRow(RESERVATION_ID, "held", EXPIRES_AT)],
+            [LineRow(LAMP, 2)],
+        ),
+    )
+    patch_transaction(monkeypatch)
+
+    response = client.post(f"api/stock/reservations/{RESERVATION_ID}/commit")
+
+    assert response.status_code == 409
+    assert response.json() == {"detail": "Reservation expired"}
+
+
+def test_unit_release_committed_reservation(client, monkeypatch):
+    monkeypatch.setattr(
+        "sqlalchemy.orm.Session.execute",
+        mock_execute(
+            [],
+            [ReservationRow(RESERVATION_ID, "committed", EXPIRES_AT)],
+            [LineRow(LAMP, 2)],
+        ),
+    )
+    patch_transaction(monkeypatch)
+
+    response = client.post(f"api/stock/reservations/{RESERVATION_ID}/release")
+
+    assert response.status_code == 409
+    assert response.json() == {"detail": "Reservation committed"}
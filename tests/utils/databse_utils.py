@@ -1,12 +1,103 @@
+import fcntl
+import os
+import tempfile
+from contextlib import contextmanager
+
 import alembic.config
 from alembic import command
+from sqlalchemy import create_engine, pool, text
+from sqlalchemy.engine import make_url
+
+DATABASE_LOCK_PATH = os.path.join(tempfile.gettempdir(), "fastpi-test-db.lock")
 
 
 def migrate_to_db(
-    script_location, alembic_ini_path="alembic.ini", connection=None, revision="head"
+    script_location,
+    alembic_ini_path="alembic.ini",
+    connection=None,
+    revision="head",
+    database_url=None,
 ):
     config = alembic.config.Config(alembic_ini_path)
 
-    if connection is not None:
+    if database_url is not None:
+        url = make_url(database_url).render_as_string(hide_password=False)
+        # the ini parser interpolates "%"
+        config.set_section_option("testdb", "sqlalchemy.url", url.replace("%", "%%"))
+
+    if connection is not None or database_url is not None:
         config.config_ini_section = "testdb"
         command.upgrade(config, revision=revision)
+
+
+@contextmanager
+def database_lock():
+    """Serialise database setup across pytest-xdist workers."""
+    with open(DATABASE_LOCK_PATH, "w") as lock_file:
+        fcntl.flock(lock_file, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+
+@contextmanager
+def server_connection(url):
+    # CREATE/DROP DATABASE cannot run in a transaction, nor while connected
+    # to the database in question
+    engine = create_engine(
+        make_url(url).set(database="postgres"),
+        isolation_level="AUTOCOMMIT",
+        poolclass=pool.NullPool,
+    )
+    try:
+        with engine.connect() as connection:
+            yield connection
+    finally:
+        engine.dispose()
+
+
+def database_exists(connection, name):
+    return bool(
+        connection.execute(
+            text("SELECT 1 FROM pg_database WHERE datname = :name"), {"name": name}
+        ).scalar()
+    )
+
+
+def create_template_database(url, script_location, alembic_ini_path="alembic.ini"):
+    """Copy the database at ``url`` to ``<name>_template`` and migrate it.
+
+    The copy keeps whatever the init scripts set up (extensions). A template
+    left by an earlier run is only brought up to the latest revision, which is
+    a no-op when nothing changed. Returns the template's URL.
+    """
+    url = make_url(url)
+    template = f"{url.database}_template"
+
+    with server_connection(url) as connection:
+        if not database_exists(connection, template):
+            connection.execute(
+                text(f'CREATE DATABASE "{template}" TEMPLATE "{url.database}"')
+            )
+
+    template_url = url.set(database=template)
+    migrate_to_db(script_location, alembic_ini_path, database_url=template_url)
+    return template_url
+
+
+def clone_database(template_url, name):
+    """(Re)create database ``name`` as a copy of ``template_url``.
+
+    Copying files is much faster than running the migrations again, but
+    Postgres refuses while anyone is connected to the template.
+    """
+    template_url = make_url(template_url)
+
+    with server_connection(template_url) as connection:
+        connection.execute(text(f'DROP DATABASE IF EXISTS "{name}" WITH (FORCE)'))
+        connection.execute(
+            text(f'CREATE DATABASE "{name}" TEMPLATE "{template_url.database}"')
+        )
+
+    return template_url.set(database=name)
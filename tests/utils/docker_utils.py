@@ -67,33 +67,65 @@ import os
 import time
 
 import docker
+from sqlalchemy import create_engine, exc, pool, text
 
+TEST_DB_CONTAINER_NAME = "test-db"
+TEST_DB_READY_TIMEOUT = float(os.getenv("TEST_DB_READY_TIMEOUT", "60"))
 
-def is_container_ready(container):
-    container.reload()
-    return container.status == "running"
 
+def database_accepts_connections(url):
+    engine = create_engine(url, poolclass=pool.NullPool)
+    try:
+        with engine.connect() as connection:
+            connection.execute(text("SELECT 1"))
+        return True
+    except exc.OperationalError:
+        return False
+    finally:
+        engine.dispose()
+
+
+def wait_for_database(container, url, timeout=TEST_DB_READY_TIMEOUT, interval=0.2):
+    """Block until Postgres in ``container`` serves ``url``.
+
+    The image runs the init scripts against a temporary server that only
+    listens on the unix socket, so ``pg_isready`` over TCP passing means the
+    scripts are done. Connecting from here then covers the published port.
+    """
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        container.reload()
+        if container.status == "exited":
+            raise RuntimeError(
+                f"Container '{container.name}' exited:\n"
+                f"{container.logs(tail=20).decode()}"
+            )
+        if container.status == "running":
+            exit_code, _ = container.exec_run(
+                ["pg_isready", "-h", "127.0.0.1", "-U", "postgres"]
+            )
+            if exit_code == 0 and database_accepts_connections(url):
+                return
+        time.sleep(interval)
+    raise RuntimeError(
+        f"Database in container '{container.name}' not ready after {timeout}s"
+    )
 
-def wait_for_stable_status(container, stable_duration=3, interval=1):
-    start_time = time.time()
-    stable_count = 0
-    while time.time() - start_time < stable_duration:
-        if is_container_ready(container):
-            stable_count += 1
-        else:
-            stable_count = 0
-
-        if stable_count >= stable_duration / interval:
-            return True
 
-        time.sleep(interval)
-    return False
+def stop_database_container():
+    client = docker.from_env()
+    try:
+        container = client.containers.get(TEST_DB_CONTAINER_NAME)
+    except docker.errors.NotFound:
+        return
+    container.stop()
+    container.remove()
 
 
-def start_database_container():
+def start_database_container(url=None):
     client = docker.from_env()
     scripts_dir = os.path.abspath("./scripts")
-    container_name = "test-db"
+    container_name = TEST_DB_CONTAINER_NAME
 
     try:
         existing_container = client.containers.get(container_name)
@@ -121,11 +153,6 @@ def start_database_container():
     # Start Container
     container = client.containers.run(**container_config)
 
-    while not is_container_ready(container):
-        time.sleep(1)
-
-    if not wait_for_stable_status(container):
-        # raise RuntimeError("Container did not stabilize within the specified time")
-        pass
+    wait_for_database(container, url or os.getenv("TEST_DATABASE_URL"))
 
     return container
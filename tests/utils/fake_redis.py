@@ -0,0 +1,26 @@
+import fnmatch
+import time
+
+
+class FakeRedis:
+    """In-memory stand-in for the subset of the redis-py client the app uses."""
+
+    def __init__(self):
+        self.data = {}
+
+    def get(self, name):
+        value, expires_at = self.data.get(name, (None, None))
+        if expires_at is not None and expires_at <= time.monotonic():
+            del self.data[name]
+            return None
+        return value
+
+    def set(self, name, value, px=None):
+        expires_at = time.monotonic() + px / 1000 if px is not None else None
+        self.data[name] = (value, expires_at)
+
+    def delete(self, *names):
+        return sum(self.data.pop(name, None) is not None for name in names)
+
+    def scan_iter(self, match="*"):
+        return [name for name in list(self.data) if fnmatch.fnmatch(name, match)]
@@ -1,5 +1,13 @@
+import os
+import tempfile
+
 import pytest
 
+from tests.utils.docker_utils import stop_database_container
+
+DATABASE_STARTED_PATH = os.path.join(tempfile.gettempdir(), "fastpi-test-db.started")
+KEEP_TEST_DATABASE = os.getenv("KEEP_TEST_DATABASE", "false").lower() == "true"
+
 
 def pytest_collection_modifyitems(items):
     for item in items:
@@ -13,3 +21,18 @@ def pytest_collection_modifyitems(items):
             item.add_marker(pytest.mark.unit_schema)
         if "integrate" in item.name:
             item.add_marker(pytest.mark.integrate)
+
+
+def mark_database_container_started():
+    open(DATABASE_STARTED_PATH, "w").close()
+
+
+def pytest_sessionfinish(session):
+    # the container is shared by all xdist workers, so only the controlling
+    # process (or a plain run) removes it, once everything has finished
+    if hasattr(session.config, "workerinput"):
+        return
+    if KEEP_TEST_DATABASE or not os.path.exists(DATABASE_STARTED_PATH):
+        return
+    os.remove(DATABASE_STARTED_PATH)
+    stop_database_container()